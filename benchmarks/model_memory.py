@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Замер памяти, занимаемой моделями Task, Project и User
+Сравнивает модели на __slots__ с эквивалентными классами, у которых есть __dict__
+
+Запуск: python benchmarks/model_memory.py [количество экземпляров]
+"""
+
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.task import Task
+from models.project import Project
+from models.user import User
+
+
+def dict_model(model_class: type) -> type:
+    """Класс с __dict__ и той же загрузкой из строки, что у model_class (прежнее устройство моделей)"""
+    # Подкласс модели не подходит: атрибуты попали бы в слоты родителя, а __dict__ остался бы пустым
+    return type(f"Dict{model_class.__name__}", (), {'from_row': classmethod(model_class.from_row.__func__)})
+
+
+def make_rows(count: int) -> dict:
+    """Подготовить строки для создания экземпляров (одинаковые для обоих вариантов)"""
+    now = datetime.now()
+    due_date = (now + timedelta(days=7)).isoformat()
+    start_date = (now - timedelta(days=7)).isoformat()
+    return {
+        'task': {
+            'id': 1, 'title': "Задача", 'description': "Описание", 'priority': 2,
+            'status': 'pending', 'due_date': due_date, 'project_id': 1, 'assignee_id': 1
+        },
+        'project': {
+            'id': 1, 'name': "Проект", 'description': "Описание",
+            'start_date': start_date, 'end_date': due_date, 'status': 'active'
+        },
+        'user': {
+            'id': 1, 'username': "user", 'email': "user@example.com",
+            'role': 'developer', 'registration_date': start_date
+        },
+    }
+
+
+def measure(model_class, row: dict, count: int) -> int:
+    """Вернуть объем памяти в байтах, занятой count экземплярами model_class"""
+    tracemalloc.start()
+    instances = [model_class.from_row(row) for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = make_rows(count)
+
+    print(f"Экземпляров: {count:,}")
+    print(f"{'Модель':<10}{'__dict__, МБ':>15}{'__slots__, МБ':>15}{'Экономия':>12}")
+
+    pairs = [
+        ('Task', dict_model(Task), Task, rows['task']),
+        ('Project', dict_model(Project), Project, rows['project']),
+        ('User', dict_model(User), User, rows['user']),
+    ]
+    for name, dict_class, slots_class, row in pairs:
+        dict_size = measure(dict_class, row, count)
+        slots_size = measure(slots_class, row, count)
+        saving = 1 - slots_size / dict_size
+        print(f"{name:<10}{dict_size / 2**20:>15.1f}{slots_size / 2**20:>15.1f}{saving:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import functools
+from typing import Any
+
+from database.async_database_manager import AsyncDatabaseManager
+from controllers.task_controller import TaskController
+from controllers.project_controller import ProjectController
+from controllers.user_controller import UserController
+
+
+class AsyncController:
+    """Асинхронная обертка контроллера: каждый публичный метод выполняется в потоке базы данных"""
+    
+    controller_class = None
+    
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self.db = db_manager
+        # Проверки и сообщения остаются в синхронном контроллере, обертка только переносит вызов в поток
+        self.controller = self.controller_class(db_manager.sync)
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        
+        method = getattr(self.controller, name)
+        if not callable(method):
+            return method
+        
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.db.run(method, *args, **kwargs)
+        
+        return call
+
+
+class AsyncTaskController(AsyncController):
+    """Асинхронный вариант TaskController: await controller.get_all_tasks()"""
+    
+    controller_class = TaskController
+
+
+class AsyncProjectController(AsyncController):
+    """Асинхронный вариант ProjectController"""
+    
+    controller_class = ProjectController
+
+
+class AsyncUserController(AsyncController):
+    """Асинхронный вариант UserController"""
+    
+    controller_class = UserController
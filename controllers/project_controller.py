@@ -1,9 +1,10 @@
 
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime
 
 from models.project import Project
 from database.database_manager import DatabaseManager
+from models.clock import current_time, frozen_time
 
 
 class ProjectController:
@@ -44,13 +45,19 @@ class ProjectController:
         print(f"Найдено {len(projects)} проектов")
         return projects
     
+    def get_project_task_counts(self) -> Dict[int, Tuple[int, int, int, int, int]]:
+        # (всего, завершено, в работе, ожидание, просрочено) для каждого проекта с задачами
+        return self.db.get_project_task_counts()
+    
+    def get_projects_page(self, after: Optional[Tuple[datetime, int]] = None,
+                          page_size: int = DatabaseManager.DEFAULT_PAGE_SIZE
+                          ) -> Tuple[List[Project], Optional[Tuple[datetime, int]]]:
+        """Получить страницу проектов и курсор следующей страницы (None если страниц больше нет)"""
+        projects = self.db.get_projects_page(after, page_size)
+        next_cursor = (projects[-1].end_date, projects[-1].id) if len(projects) == page_size else None
+        return projects, next_cursor
+    
     def update_project(self, project_id: int, **kwargs) -> bool:
-        # Проверяем существование проекта
-        project = self.db.get_project_by_id(project_id)
-        if not project:
-            print(f"Проект с ID {project_id} не найден")
-            return False
-        
         # Проверяем валидность новых значений
         try:
             if 'status' in kwargs:
@@ -63,21 +70,24 @@ class ProjectController:
                 end_date = kwargs['end_date']
                 if end_date <= start_date:
                     raise ValueError("Дата окончания должна быть позже даты начала")
-            elif 'start_date' in kwargs:
-                start_date = kwargs['start_date']
-                if start_date > project.end_date:
+            elif 'start_date' in kwargs or 'end_date' in kwargs:
+                # Для проверки одной даты нужна вторая дата из базы
+                project = self.db.get_project_by_id(project_id)
+                if not project:
+                    print(f"Проект с ID {project_id} не найден")
+                    return False
+                
+                if 'start_date' in kwargs and kwargs['start_date'] > project.end_date:
                     raise ValueError("Дата начала не может быть позже даты окончания")
-            elif 'end_date' in kwargs:
-                end_date = kwargs['end_date']
-                if end_date <= project.start_date:
+                if 'end_date' in kwargs and kwargs['end_date'] <= project.start_date:
                     raise ValueError("Дата окончания должна быть позже даты начала")
             
-            # Обновляем проект в базе данных
+            # Обновляем проект одним запросом; отсутствие проекта видно по числу измененных строк
             success = self.db.update_project(project_id, **kwargs)
             if success:
                 print(f"Проект с ID {project_id} успешно обновлен")
             else:
-                print(f"Ошибка при обновлении проекта с ID {project_id}")
+                print(f"Проект с ID {project_id} не найден")
             
             return success
             
@@ -89,24 +99,12 @@ class ProjectController:
             return False
     
     def delete_project(self, project_id: int) -> bool:
-        # Проверяем существование проекта
-        project = self.db.get_project_by_id(project_id)
-        if not project:
-            print(f"Проект с ID {project_id} не найдена")
-            return False
-        
-        # Проверяем есть ли задачи в проекте
-        tasks = self.db.get_tasks_by_project(project_id)
-        if tasks:
-            print(f"Внимание: проект '{project.name}' содержит {len(tasks)} задач")
-            print("Задачи будут удалены вместе с проектом")
-        
-        # Удаляем проект
+        # Задачи проекта удаляет каскад внешнего ключа в том же запросе
         success = self.db.delete_project(project_id)
         if success:
-            print(f"Проект '{project.name}' (ID: {project_id}) успешно удален")
+            print(f"Проект с ID {project_id} и его задачи успешно удалены")
         else:
-            print(f"Ошибка при удалении проекта с ID {project_id}")
+            print(f"Проект с ID {project_id} не найден")
         
         return success
     
@@ -150,40 +148,15 @@ class ProjectController:
         
         return progress
     
+    @frozen_time()
     def get_project_statistics(self, project_id: int) -> dict:
         # Получаем проект
         project = self.db.get_project_by_id(project_id)
         if not project:
             return {}
         
-        # Получаем статистику из базы данных
-        db_stats = self.db.get_project_statistics(project_id)
-        
-        # Получаем все задачи проекта
-        tasks = self.db.get_tasks_by_project(project_id)
-        
-        if not tasks:
-            return {
-                'project_name': project.name,
-                'status': project.status,
-                'progress': project.get_progress(),
-                'total_tasks': 0,
-                'completed_tasks': 0,
-                'in_progress_tasks': 0,
-                'pending_tasks': 0,
-                'overdue_tasks': 0,
-                'days_remaining': project.get_days_remaining() if hasattr(project, 'get_days_remaining') else 0,
-                'is_overdue': project.is_overdue() if hasattr(project, 'is_overdue') else False
-            }
-        
-        # Рассчитываем статистику
-        task_stats = {
-            'total_tasks': len(tasks),
-            'completed_tasks': sum(1 for task in tasks if task.status == 'completed'),
-            'in_progress_tasks': sum(1 for task in tasks if task.status == 'in_progress'),
-            'pending_tasks': sum(1 for task in tasks if task.status == 'pending'),
-            'overdue_tasks': sum(1 for task in tasks if task.is_overdue()),
-        }
+        # Статистика задач считается по колоночной таблице без создания объектов Task
+        task_stats = self.db.get_project_statistics(project_id)
         
         return {
             'project_name': project.name,
@@ -211,6 +184,7 @@ class ProjectController:
                 print(f"  Ожидание: {stats.get('pending_tasks', 0)}")
                 print(f"  Просрочено: {stats.get('overdue_tasks', 0)}")
     
+    @frozen_time()
     def print_projects_list(self, projects: List[Project], title: str = "Список проектов") -> None:
         if not projects:
             print(f"\n{title}: нет проектов")
@@ -221,11 +195,11 @@ class ProjectController:
         print(f"{'ID':<5} {'Название':<25} {'Статус':<12} {'Начало':<12} {'Окончание':<12} {'Прогресс':<10} {'Дней':<6} {'Задачи':<8}")
         print("-" * 120)
         
+        # Получаем количество задач сразу для всех проектов
+        task_counts = self.db.get_project_task_counts()
+        
         for project in projects:
-            # Получаем статистику для каждого проекта
-            tasks = self.db.get_tasks_by_project(project.id)
-            total_tasks = len(tasks)
-            completed_tasks = sum(1 for task in tasks if task.status == 'completed')
+            total_tasks, completed_tasks = task_counts.get(project.id, (0, 0, 0, 0, 0))[:2]
             
             # Форматируем данные
             status_names = {
@@ -240,7 +214,7 @@ class ProjectController:
             progress = project.get_progress() * 100
             
             # Расчет дней до окончания
-            now = datetime.now()
+            now = current_time()
             if project.end_date > now:
                 days_remaining = (project.end_date - now).days
                 days_str = f"+{days_remaining}"
@@ -271,12 +245,6 @@ class ProjectController:
         return completed_projects
     
     def get_overdue_projects(self) -> List[Project]:
-        all_projects = self.db.get_all_projects()
-        overdue_projects = []
-        
-        for project in all_projects:
-            if hasattr(project, 'is_overdue') and project.is_overdue() and project.status != 'completed':
-                overdue_projects.append(project)
-        
+        overdue_projects = self.db.get_overdue_projects()
         print(f"Найдено {len(overdue_projects)} просроченных проектов")
         return overdue_projects
\ No newline at end of file
@@ -1,9 +1,11 @@
 
-from typing import List, Optional
+import sqlite3
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from models.task import Task
 from database.database_manager import DatabaseManager
+from models.clock import frozen_time
 
 
 class TaskController:
@@ -13,15 +15,6 @@ class TaskController:
     def add_task(self, title: str, description: str, priority: int, 
                  due_date: datetime, project_id: int, assignee_id: int) -> int:
         try:
-            # Проверяем существование проекта и пользователя
-            project = self.db.get_project_by_id(project_id)
-            if not project:
-                raise ValueError(f"Проект с ID {project_id} не найден")
-            
-            user = self.db.get_user_by_id(assignee_id)
-            if not user:
-                raise ValueError(f"Пользователь с ID {assignee_id} не найден")
-            
             # Создаем объект задачи
             task = Task(
                 title=title,
@@ -32,7 +25,7 @@ class TaskController:
                 assignee_id=assignee_id
             )
             
-            # Сохраняем в базу данных
+            # Сохраняем в базу данных; существование проекта и исполнителя проверяет внешний ключ
             task_id = self.db.add_task(task)
             print(f"Задача '{title}' успешно создана с ID {task_id}")
             return task_id
@@ -40,6 +33,9 @@ class TaskController:
         except ValueError as e:
             print(f"Ошибка создания задачи: {e}")
             return -1
+        except sqlite3.IntegrityError:
+            print(f"Ошибка создания задачи: проект с ID {project_id} или пользователь с ID {assignee_id} не найден")
+            return -1
         except Exception as e:
             print(f"Неожиданная ошибка при создании задачи: {e}")
             return -1
@@ -55,13 +51,20 @@ class TaskController:
         print(f"Найдено {len(tasks)} задач")
         return tasks
     
+    def get_all_tasks_with_names(self) -> List[Tuple[Task, Optional[str], Optional[str]]]:
+        rows = self.db.get_all_tasks_with_names()
+        print(f"Найдено {len(rows)} задач")
+        return rows
+    
+    def get_tasks_page(self, after: Optional[Tuple[datetime, int]] = None,
+                       page_size: int = DatabaseManager.DEFAULT_PAGE_SIZE
+                       ) -> Tuple[List[Task], Optional[Tuple[datetime, int]]]:
+        """Получить страницу задач и курсор следующей страницы (None если страниц больше нет)"""
+        tasks = self.db.get_tasks_page(after, page_size)
+        next_cursor = (tasks[-1].due_date, tasks[-1].id) if len(tasks) == page_size else None
+        return tasks, next_cursor
+    
     def update_task(self, task_id: int, **kwargs) -> bool:
-        # Проверяем существование задачи
-        task = self.db.get_task_by_id(task_id)
-        if not task:
-            print(f"Задача с ID {task_id} не найдена")
-            return False
-        
         # Проверяем валидность новых значений
         try:
             if 'priority' in kwargs:
@@ -74,59 +77,62 @@ class TaskController:
                 if status not in ['pending', 'in_progress', 'completed']:
                     raise ValueError("Статус должен быть 'pending', 'in_progress' или 'completed'")
             
-            if 'project_id' in kwargs:
-                project_id = kwargs['project_id']
-                project = self.db.get_project_by_id(project_id)
-                if not project:
-                    raise ValueError(f"Проект с ID {project_id} не найден")
-            
-            if 'assignee_id' in kwargs:
-                assignee_id = kwargs['assignee_id']
-                user = self.db.get_user_by_id(assignee_id)
-                if not user:
-                    raise ValueError(f"Пользователь с ID {assignee_id} не найден")
-            
-            # Обновляем задачу в базе данных
+            # Обновляем задачу одним запросом: отсутствие задачи видно по числу измененных строк,
+            # а ссылки на проект и исполнителя проверяет внешний ключ
             success = self.db.update_task(task_id, **kwargs)
             if success:
                 print(f"Задача с ID {task_id} успешно обновлена")
             else:
-                print(f"Ошибка при обновлении задачи с ID {task_id}")
+                print(f"Задача с ID {task_id} не найдена")
             
             return success
             
         except ValueError as e:
             print(f"Ошибка обновления задачи: {e}")
             return False
+        except sqlite3.IntegrityError:
+            print("Ошибка обновления задачи: указанный проект или исполнитель не найден")
+            return False
         except Exception as e:
             print(f"Неожиданная ошибка при обновлении задачи: {e}")
             return False
     
     def delete_task(self, task_id: int) -> bool:
-        # Проверяем существование задачи
-        task = self.db.get_task_by_id(task_id)
-        if not task:
-            print(f"Задача с ID {task_id} не найдена")
-            return False
-        
-        # Удаляем задачу
+        # Удаляем задачу; отсутствие задачи видно по числу удаленных строк
         success = self.db.delete_task(task_id)
         if success:
-            print(f"Задача '{task.title}' (ID: {task_id}) успешно удалена")
+            print(f"Задача с ID {task_id} успешно удалена")
         else:
-            print(f"Ошибка при удалении задачи с ID {task_id}")
+            print(f"Задача с ID {task_id} не найдена")
         
         return success
     
-    def search_tasks(self, query: str) -> List[Task]:
+    def search_tasks(self, query: str, limit: Optional[int] = None) -> List[Task]:
         if not query or not query.strip():
             print("Поисковый запрос не может быть пустым")
             return []
         
-        tasks = self.db.search_tasks(query)
+        tasks = self.db.search_tasks(query, limit)
         print(f"Найдено {len(tasks)} задач по запросу '{query}'")
         return tasks
     
+    def iter_search_batches(self, query: str, batch_size: int = 100,
+                            first_batch_size: int = 20) -> Iterator[List[Task]]:
+        """Результаты search_tasks пачками по мере чтения из базы; первая пачка меньше, чтобы показать ее сразу"""
+        if not query or not query.strip():
+            return
+        
+        batch: List[Task] = []
+        size = first_batch_size
+        for task in self.db.iter_search_tasks(query):
+            batch.append(task)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+                size = batch_size
+        if batch:
+            yield batch
+    
     def update_task_status(self, task_id: int, new_status: str) -> bool:
         # Получаем задачу
         task = self.db.get_task_by_id(task_id)
@@ -143,8 +149,7 @@ class TaskController:
         return self.db.update_task(task_id, status=new_status)
     
     def get_overdue_tasks(self) -> List[Task]:
-        all_tasks = self.db.get_all_tasks()
-        overdue_tasks = [task for task in all_tasks if task.is_overdue()]
+        overdue_tasks = self.db.get_overdue_tasks()
         
         print(f"Найдено {len(overdue_tasks)} просроченных задач")
         return overdue_tasks
@@ -172,37 +177,7 @@ class TaskController:
         return tasks
     
     def get_task_statistics(self) -> dict:
-        all_tasks = self.db.get_all_tasks()
-        
-        if not all_tasks:
-            return {
-                'total': 0,
-                'by_status': {},
-                'by_priority': {},
-                'overdue': 0
-            }
-        
-        # Статистика по статусам
-        status_stats = {}
-        for task in all_tasks:
-            status_stats[task.status] = status_stats.get(task.status, 0) + 1
-        
-        # Статистика по приоритетам
-        priority_stats = {}
-        for task in all_tasks:
-            priority_names = {1: 'high', 2: 'medium', 3: 'low'}
-            priority_name = priority_names.get(task.priority, 'unknown')
-            priority_stats[priority_name] = priority_stats.get(priority_name, 0) + 1
-        
-        # Количество просроченных задач
-        overdue_count = sum(1 for task in all_tasks if task.is_overdue())
-        
-        return {
-            'total': len(all_tasks),
-            'by_status': status_stats,
-            'by_priority': priority_stats,
-            'overdue': overdue_count
-        }
+        return self.db.get_task_statistics()
     
     def print_task_info(self, task_id: int) -> None:
         task = self.get_task(task_id)
@@ -211,6 +186,7 @@ class TaskController:
             print(str(task))
             print("="*50)
     
+    @frozen_time()
     def print_tasks_list(self, tasks: List[Task], title: str = "Список задач") -> None:
         if not tasks:
             print(f"\n{title}: нет задач")
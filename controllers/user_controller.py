@@ -1,9 +1,11 @@
 
-from typing import List, Optional
+import sqlite3
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from models.user import User
 from database.database_manager import DatabaseManager
+from models.clock import frozen_time
 
 
 class UserController:
@@ -12,15 +14,6 @@ class UserController:
     
     def add_user(self, username: str, email: str, role: str) -> int:
         try:
-            # Проверяем уникальность username и email
-            existing_user_by_username = self.db.get_user_by_username(username)
-            if existing_user_by_username:
-                raise ValueError(f"Пользователь с именем '{username}' уже существует")
-            
-            existing_user_by_email = self.db.get_user_by_email(email)
-            if existing_user_by_email:
-                raise ValueError(f"Пользователь с email '{email}' уже существует")
-            
             # Создаем объект пользователя
             user = User(
                 username=username,
@@ -28,7 +21,7 @@ class UserController:
                 role=role
             )
             
-            # Сохраняем в базу данных
+            # Сохраняем в базу данных; уникальность username и email проверяют ограничения UNIQUE
             user_id = self.db.add_user(user)
             print(f"Пользователь '{username}' успешно создан с ID {user_id}")
             return user_id
@@ -36,6 +29,9 @@ class UserController:
         except ValueError as e:
             print(f"Ошибка создания пользователя: {e}")
             return -1
+        except sqlite3.IntegrityError as e:
+            print(f"Ошибка создания пользователя: {self._unique_error_message(e, username, email)}")
+            return -1
         except Exception as e:
             print(f"Неожиданная ошибка при создании пользователя: {e}")
             return -1
@@ -51,80 +47,77 @@ class UserController:
         print(f"Найдено {len(users)} пользователей")
         return users
     
+    def get_users_page(self, after: Optional[Tuple[str, int]] = None,
+                       page_size: int = DatabaseManager.DEFAULT_PAGE_SIZE
+                       ) -> Tuple[List[User], Optional[Tuple[str, int]]]:
+        """Получить страницу пользователей и курсор следующей страницы (None если страниц больше нет)"""
+        users = self.db.get_users_page(after, page_size)
+        next_cursor = (users[-1].username, users[-1].id) if len(users) == page_size else None
+        return users, next_cursor
+    
     def update_user(self, user_id: int, **kwargs) -> bool:
-        # Проверяем существование пользователя
-        user = self.db.get_user_by_id(user_id)
-        if not user:
-            print(f"Пользователь с ID {user_id} не найден")
-            return False
-        
         # Проверяем валидность новых значений
         try:
-            if 'username' in kwargs:
-                new_username = kwargs['username']
-                if new_username != user.username:
-                    # Проверяем уникальность нового имени
-                    existing_user = self.db.get_user_by_username(new_username)
-                    if existing_user and existing_user.id != user_id:
-                        raise ValueError(f"Пользователь с именем '{new_username}' уже существует")
-            
             if 'email' in kwargs:
                 new_email = kwargs['email']
-                if new_email != user.email:
-                    # Проверяем уникальность нового email
-                    existing_user = self.db.get_user_by_email(new_email)
-                    if existing_user and existing_user.id != user_id:
-                        raise ValueError(f"Пользователь с email '{new_email}' уже существует")
-                    
-                    # Валидируем email
-                    temp_user = User.__new__(User)
-                    if not temp_user._is_valid_email(new_email):
-                        raise ValueError(f"Некорректный email адрес: {new_email}")
+                
+                # Валидируем email
+                temp_user = User.__new__(User)
+                if not temp_user._is_valid_email(new_email):
+                    raise ValueError(f"Некорректный email адрес: {new_email}")
             
             if 'role' in kwargs:
                 new_role = kwargs['role']
                 if new_role not in ['admin', 'manager', 'developer']:
                     raise ValueError("Роль должна быть 'admin', 'manager' или 'developer'")
             
-            # Обновляем пользователя в базе данных
+            # Обновляем пользователя одним запросом: отсутствие пользователя видно по числу
+            # измененных строк, а уникальность username и email проверяют ограничения UNIQUE
             success = self.db.update_user(user_id, **kwargs)
             if success:
                 print(f"Пользователь с ID {user_id} успешно обновлен")
             else:
-                print(f"Ошибка при обновлении пользователя с ID {user_id}")
+                print(f"Пользователь с ID {user_id} не найден")
             
             return success
             
         except ValueError as e:
             print(f"Ошибка обновления пользователя: {e}")
             return False
+        except sqlite3.IntegrityError as e:
+            message = self._unique_error_message(e, kwargs.get('username'), kwargs.get('email'))
+            print(f"Ошибка обновления пользователя: {message}")
+            return False
         except Exception as e:
             print(f"Неожиданная ошибка при обновлении пользователя: {e}")
             return False
     
     def delete_user(self, user_id: int) -> bool:
-        # Проверяем существование пользователя
-        user = self.db.get_user_by_id(user_id)
-        if not user:
-            print(f"Пользователь с ID {user_id} не найден")
-            return False
-        
-        # Проверяем есть ли задачи у пользователя
-        tasks = self.db.get_tasks_by_user(user_id)
-        if tasks:
-            print(f"Внимание: пользователь '{user.username}' имеет {len(tasks)} задач")
-            print("Для удаления пользователя необходимо переназначить или удалить его задачи")
-            return False
+        # Проверка и удаление в одной транзакции, чтобы каскад не удалил задачи, добавленные между ними
+        with self.db.transaction():
+            if self.db.user_has_tasks(user_id):
+                print(f"Внимание: у пользователя с ID {user_id} есть задачи")
+                print("Для удаления пользователя необходимо переназначить или удалить его задачи")
+                return False
+            
+            success = self.db.delete_user(user_id)
         
-        # Удаляем пользователя
-        success = self.db.delete_user(user_id)
         if success:
-            print(f"Пользователь '{user.username}' (ID: {user_id}) успешно удален")
+            print(f"Пользователь с ID {user_id} успешно удален")
         else:
-            print(f"Ошибка при удалении пользователя с ID {user_id}")
+            print(f"Пользователь с ID {user_id} не найден")
         
         return success
     
+    def _unique_error_message(self, error: sqlite3.IntegrityError, username: Optional[str],
+                              email: Optional[str]) -> str:
+        """Сообщение о нарушении уникальности по тексту ошибки SQLite"""
+        if 'users.username' in str(error):
+            return f"Пользователь с именем '{username}' уже существует"
+        if 'users.email' in str(error):
+            return f"Пользователь с email '{email}' уже существует"
+        return str(error)
+    
     def get_user_tasks(self, user_id: int) -> list:
         # Проверяем существование пользователя
         user = self.db.get_user_by_id(user_id)
@@ -137,6 +130,10 @@ class UserController:
         print(f"Найдено {len(tasks)} задач для пользователя '{user.username}'")
         return tasks
     
+    def get_user_task_counts(self) -> Dict[int, int]:
+        # Количество задач для каждого пользователя, у которого они есть
+        return self.db.get_user_task_counts()
+    
     def get_user_by_username(self, username: str) -> Optional[User]:
         user = self.db.get_user_by_username(username)
         if not user:
@@ -149,39 +146,15 @@ class UserController:
             print(f"Пользователь с email '{email}' не найден")
         return user
     
+    @frozen_time()
     def get_user_statistics(self, user_id: int) -> dict:
         # Получаем пользователя
         user = self.db.get_user_by_id(user_id)
         if not user:
             return {}
         
-        # Получаем статистику из базы данных
-        db_stats = self.db.get_user_statistics(user_id)
-        
-        # Получаем все задачи пользователя
-        tasks = self.db.get_tasks_by_user(user_id)
-        
-        if not tasks:
-            return {
-                'username': user.username,
-                'role': user.role,
-                'registration_date': user.registration_date,
-                'days_since_registration': user.get_days_since_registration() if hasattr(user, 'get_days_since_registration') else 0,
-                'total_tasks': 0,
-                'completed_tasks': 0,
-                'in_progress_tasks': 0,
-                'pending_tasks': 0,
-                'overdue_tasks': 0
-            }
-        
-        # Рассчитываем статистику
-        task_stats = {
-            'total_tasks': len(tasks),
-            'completed_tasks': sum(1 for task in tasks if task.status == 'completed'),
-            'in_progress_tasks': sum(1 for task in tasks if task.status == 'in_progress'),
-            'pending_tasks': sum(1 for task in tasks if task.status == 'pending'),
-            'overdue_tasks': sum(1 for task in tasks if task.is_overdue()),
-        }
+        # Статистика задач считается по колоночной таблице без создания объектов Task
+        task_stats = self.db.get_user_statistics(user_id)
         
         return {
             'username': user.username,
@@ -208,6 +181,7 @@ class UserController:
                 print(f"  Ожидание: {stats.get('pending_tasks', 0)}")
                 print(f"  Просрочено: {stats.get('overdue_tasks', 0)}")
     
+    @frozen_time()
     def print_users_list(self, users: List[User], title: str = "Список пользователей") -> None:
         if not users:
             print(f"\n{title}: нет пользователей")
@@ -272,20 +246,15 @@ class UserController:
             print(f"Пользователь с ID {new_user_id} не найден")
             return False
         
-        # Получаем задачи текущего пользователя
-        tasks = self.db.get_tasks_by_user(old_user_id)
-        if not tasks:
-            print(f"У пользователя '{old_user.username}' нет задач для переназначения")
-            return True
-        
-        print(f"Переназначение {len(tasks)} задач от '{old_user.username}' к '{new_user.username}'...")
-        
-        # Переназначаем каждую задачу
-        success_count = 0
-        for task in tasks:
-            success = self.db.update_task(task.id, assignee_id=new_user_id)
-            if success:
-                success_count += 1
+        # Переназначаем все задачи одним запросом
+        try:
+            reassigned_count = self.db.reassign_tasks(old_user_id, new_user_id)
+        except Exception as e:
+            print(f"Ошибка при переназначении задач: {e}")
+            return False
         
-        print(f"Успешно переназначено {success_count} из {len(tasks)} задач")
-        return success_count == len(tasks)
\ No newline at end of file
+        if reassigned_count == 0:
+            print(f"У пользователя '{old_user.username}' нет задач для переназначения")
+        else:
+            print(f"Переназначено {reassigned_count} задач от '{old_user.username}' к '{new_user.username}'")
+        return True
\ No newline at end of file
@@ -0,0 +1,82 @@
+import asyncio
+import contextvars
+import functools
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from database.database_manager import DatabaseManager
+
+
+class AsyncDatabaseManager:
+    """Асинхронный фасад DatabaseManager: запросы выполняются в отдельных потоках, не блокируя цикл событий"""
+    
+    # Методы DatabaseManager, доступные как корутины: await db.get_all_tasks().
+    # execute_query сюда не входит: курсор привязан к потоку базы данных (см. execute_fetchall)
+    ASYNC_METHODS = (
+        'add_task', 'add_tasks_bulk', 'get_task_by_id', 'get_all_tasks', 'get_tasks_page',
+        'get_overdue_tasks', 'update_task', 'delete_task', 'search_tasks', 'get_tasks_by_project',
+        'get_tasks_by_user', 'reassign_tasks', 'get_all_tasks_with_names', 'get_task_statistics',
+        'get_task_table',
+        'add_project', 'add_projects_bulk', 'get_project_by_id', 'get_all_projects', 'get_projects_page',
+        'get_overdue_projects', 'update_project', 'delete_project', 'get_project_task_counts',
+        'get_project_statistics',
+        'add_user', 'add_users_bulk', 'get_user_by_id', 'get_all_users', 'get_users_page',
+        'update_user', 'delete_user', 'user_has_tasks', 'get_user_task_counts', 'get_user_statistics',
+        'commit', 'rollback', 'get_pragmas', 'clear_cache', 'cache_info',
+    )
+    
+    def __init__(self, db_path: str = "tasks.db", max_workers: int = 1, **options: Any) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db')
+        
+        if max_workers == 1:
+            # Единственный поток владеет обычным соединением, поэтому создаем менеджер в нем
+            self.sync = self._executor.submit(DatabaseManager, db_path, **options).result()
+        else:
+            # Несколько потоков работают через пул: чтение параллельно, запись по одной
+            self.sync = DatabaseManager(db_path, pool_size=max_workers, **options)
+            self.sync.release_connection()
+    
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Выполнить функцию в потоке базы данных и дождаться результата"""
+        loop = asyncio.get_running_loop()
+        # Контекст копируется, чтобы frozen_time() действовал и внутри потока
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+    
+    async def run_in_transaction(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Выполнить func(db, ...) в одной транзакции: между await транзакция не держится открытой"""
+        def call() -> Any:
+            with self.sync.transaction():
+                return func(self.sync, *args, **kwargs)
+        
+        return await self.run(call)
+    
+    async def execute_fetchall(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Выполнить запрос и прочитать все строки в потоке базы данных"""
+        return await self.run(lambda: self.sync.execute_query(query, params).fetchall())
+    
+    def __getattr__(self, name: str) -> Any:
+        if name not in self.ASYNC_METHODS:
+            raise AttributeError(f"'{type(self).__name__}' не поддерживает '{name}'")
+        
+        method = getattr(self.sync, name)
+        
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(method, *args, **kwargs)
+        
+        return call
+    
+    async def close(self) -> None:
+        """Закрыть соединения и остановить потоки"""
+        await self.run(self.sync.close)
+        self._executor.shutdown(wait=True)
+    
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List
+
+
+class ConnectionPool:
+    """Ограниченный пул соединений SQLite, которые можно передавать между потоками"""
+    
+    # Период проверки завершившихся владельцев соединений при ожидании свободного соединения, с
+    RECLAIM_INTERVAL = 0.05
+    
+    def __init__(self, factory: Callable[[], sqlite3.Connection], size: int, timeout: float = 5.0) -> None:
+        if size < 1:
+            raise ValueError("Размер пула должен быть положительным")
+        
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        # Номер поколения меняется при закрытии пула: выданные ранее соединения считаются устаревшими
+        self.generation = 0
+        self._idle: List[sqlite3.Connection] = []
+        self._all: List[sqlite3.Connection] = []
+        # Поток, которому выдано соединение: соединения завершившихся потоков возвращаются в пул
+        self._owners: Dict[sqlite3.Connection, threading.Thread] = {}
+        self._condition = threading.Condition()
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Выдать свободное соединение, создав новое, пока не достигнут размер пула"""
+        with self._condition:
+            self._wait_for_slot()
+            if self._idle:
+                connection = self._idle.pop()
+                self._owners[connection] = threading.current_thread()
+                return connection
+            
+            # Место под соединение занимаем до его создания, чтобы не превысить размер пула
+            self._all.append(None)
+        
+        try:
+            connection = self.factory()
+        except BaseException:
+            with self._condition:
+                self._all.remove(None)
+                self._condition.notify()
+            raise
+        
+        with self._condition:
+            self._all[self._all.index(None)] = connection
+            self._owners[connection] = threading.current_thread()
+        return connection
+    
+    def _reclaim_abandoned(self) -> bool:
+        """Вернуть в пул соединения потоков, завершившихся без release(); вызывается под блокировкой"""
+        abandoned = [connection for connection, owner in self._owners.items() if not owner.is_alive()]
+        for connection in abandoned:
+            del self._owners[connection]
+            if connection.in_transaction:
+                connection.rollback()
+            self._idle.append(connection)
+        return bool(abandoned)
+    
+    def _wait_for_slot(self) -> None:
+        """Ждать свободного соединения или места под новое (вызывается под self._condition)"""
+        deadline = time.monotonic() + self.timeout
+        while not self._idle and len(self._all) >= self.size:
+            if self._reclaim_abandoned():
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise sqlite3.OperationalError(
+                    f"Нет свободных соединений в пуле (размер {self.size}) за {self.timeout} с"
+                )
+            # Поток-владелец может завершиться без release(), поэтому ожидание прерывается периодически
+            self._condition.wait(min(remaining, self.RECLAIM_INTERVAL))
+    
+    def release(self, connection: sqlite3.Connection) -> None:
+        """Вернуть соединение в пул"""
+        with self._condition:
+            if connection not in self._all:
+                # Соединение выдано до закрытия пула
+                connection.close()
+                return
+            
+            self._owners.pop(connection, None)
+            # Незавершенная транзакция не должна достаться следующему потоку
+            if connection.in_transaction:
+                connection.rollback()
+            self._idle.append(connection)
+            self._condition.notify()
+    
+    def close(self) -> None:
+        """Закрыть все соединения пула, включая выданные"""
+        with self._condition:
+            for connection in self._all:
+                if connection is not None:
+                    connection.close()
+            self._all = [connection for connection in self._all if connection is None]
+            self._idle = []
+            self._owners = {}
+            self.generation += 1
+            self._condition.notify_all()
+    
+    def stats(self) -> dict:
+        """Количество созданных и свободных соединений"""
+        with self._condition:
+            return {'size': self.size, 'open': len(self._all), 'idle': len(self._idle)}
@@ -1,30 +1,239 @@
 
+import copy
+import re
 import sqlite3
-from typing import List, Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Iterable
 from datetime import datetime
 
 from models.task import Task
 from models.project import Project
 from models.user import User
+from models.task_table import TaskTable
+from models.clock import current_time
+from database.connection_pool import ConnectionPool
 
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "tasks.db") -> None:
+    # Размер страницы по умолчанию для постраничной выборки
+    DEFAULT_PAGE_SIZE = 100
+    # Количество строк, читаемых из курсора за один fetchmany при потоковом обходе
+    DEFAULT_FETCH_SIZE = 500
+    
+    # Наборы настроек соединения для pragma_profile
+    PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+        # Журнал отката и полная синхронизация: максимальная надежность, как у SQLite по умолчанию
+        'durable': {
+            'journal_mode': 'DELETE',
+            'synchronous': 'FULL',
+        },
+        # WAL: читатели не блокируют писателя; NORMAL безопасен для WAL и заметно быстрее FULL
+        'balanced': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -64000,  # Отрицательное значение - размер в КиБ (около 64 МБ)
+            'mmap_size': 268435456,
+            'temp_store': 'MEMORY',
+        },
+        # Массовая загрузка: без fsync и с журналом в памяти, сбой во время загрузки может испортить базу
+        'bulk_load': {
+            'journal_mode': 'MEMORY',
+            'synchronous': 'OFF',
+            'cache_size': -256000,
+            'mmap_size': 268435456,
+            'temp_store': 'MEMORY',
+        },
+    }
+    
+    # Настройки, которые можно задать в профиле
+    PROFILE_PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store')
+    # Настройки, которые возвращает get_pragmas(). foreign_keys всегда включен: на нем держатся
+    # проверки ссылок задач и каскадное удаление, поэтому профиль не может его изменить
+    PRAGMA_NAMES = PROFILE_PRAGMAS + ('foreign_keys',)
+    
+    # Запросы, которые в режиме пула выполняются под блокировкой писателя
+    WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'CREATE', 'DROP', 'ALTER')
+    
+    def __init__(self, db_path: str = "tasks.db", autocommit: bool = True, cache_size: int = 0,
+                 pragma_profile: Optional[Any] = None, pool_size: int = 0,
+                 pool_timeout: float = 5.0) -> None:
+        # Каждое соединение с ':memory:' или '' открывает свою отдельную базу, и потоки пула не видели бы
+        # таблиц, созданных первым соединением
+        if pool_size and db_path in (':memory:', ''):
+            raise ValueError("Пул соединений работает только с файлом базы данных, а не с ':memory:'")
+        
         self.db_path = db_path
-        self.connection: Optional[sqlite3.Connection] = None
+        # pool_size > 0 - режим пула: у каждого потока свое соединение, записи выполняются по одной
+        self.pool_size = pool_size
+        self._pool = ConnectionPool(self._open_connection, pool_size, pool_timeout) if pool_size else None
+        self._local = threading.local()
+        self._write_lock = threading.RLock() if pool_size else nullcontext()
+        self._schema_ready = False
+        self._connection: Optional[sqlite3.Connection] = None
+        # При autocommit=False изменения фиксируются только через commit() или transaction()
+        self.autocommit = autocommit
+        self._transaction_depth = 0
+        # Полнотекстовый индекс задач; False если SQLite собран без FTS5
+        self.fts_enabled = False
+        # Кэш сущностей по ключу (таблица, id) с вытеснением давно не использованных; 0 - кэш выключен
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+        self._cache_lock = threading.RLock()
+        # Увеличивается при каждой инвалидации: чтение, начатое до нее, не кладет результат в кэш
+        self._cache_version = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Имя профиля из PRAGMA_PROFILES или словарь настроек; None - настройки SQLite по умолчанию.
+        # Пул по умолчанию работает в WAL: читатели не ждут единственного писателя
+        if pool_size and pragma_profile is None:
+            pragma_profile = 'balanced'
+        self.pragmas = self._resolve_pragma_profile(pragma_profile)
+        self.pragma_profile = pragma_profile
         self.connect()
     
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """Соединение текущего потока (в режиме пула) или единственное соединение"""
+        if not self._pool:
+            return self._connection
+        
+        # Соединение, выданное до закрытия пула, считается отсутствующим
+        if getattr(self._local, 'generation', None) != self._pool.generation:
+            return None
+        return getattr(self._local, 'connection', None)
+    
+    @connection.setter
+    def connection(self, value: Optional[sqlite3.Connection]) -> None:
+        if not self._pool:
+            self._connection = value
+            return
+        
+        self._local.connection = value
+        self._local.generation = self._pool.generation
+        self._local.transaction_depth = 0
+    
+    @property
+    def _transaction_depth(self) -> int:
+        """Глубина вложенности transaction() для соединения текущего потока"""
+        if not self._pool:
+            return self._depth
+        return getattr(self._local, 'transaction_depth', 0)
+    
+    @_transaction_depth.setter
+    def _transaction_depth(self, value: int) -> None:
+        if not self._pool:
+            self._depth = value
+        else:
+            self._local.transaction_depth = value
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Открыть новое соединение и применить к нему настройки"""
+        # Соединения пула переходят между потоками, поэтому проверка потока отключается
+        connection = sqlite3.connect(self.db_path, check_same_thread=not self._pool)
+        connection.row_factory = sqlite3.Row  # Возвращать строки как словари
+        # Ссылки задач на проекты и пользователей проверяет сама SQLite
+        connection.execute("PRAGMA foreign_keys = ON")
+        # Профиль применяется до первой транзакции: journal_mode нельзя менять внутри нее
+        for name, value in self.pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+    
     def connect(self) -> None:
-        """Установить соединение с базой данных"""
-        self.connection = sqlite3.connect(self.db_path)
-        self.connection.row_factory = sqlite3.Row  # Возвращать строки как словари
-        self.create_tables()
+        """Установить соединение с базой данных (в режиме пула - получить соединение для текущего потока)"""
+        if not self._pool:
+            self.connection = self._open_connection()
+            self.create_tables()
+            return
+        
+        if self.connection is None:
+            self.connection = self._pool.acquire()
+        # Схему достаточно проверить один раз на пул, а не на каждое соединение
+        if not self._schema_ready:
+            self.create_tables()
+            self._schema_ready = True
+    
+    def release_connection(self) -> None:
+        """Вернуть соединение текущего потока в пул"""
+        if not self._pool:
+            return
+        
+        connection = self.connection
+        if connection is not None:
+            self.connection = None
+            self._pool.release(connection)
+    
+    @contextmanager
+    def checkout(self) -> Iterator["DatabaseManager"]:
+        """Закрепить соединение пула за текущим потоком на время блока"""
+        pinned = self.connection is not None
+        if not pinned:
+            self.connect()
+        try:
+            yield self
+        finally:
+            if not pinned:
+                self.release_connection()
+    
+    def pool_info(self) -> Dict[str, int]:
+        """Размер пула, число открытых и свободных соединений"""
+        if not self._pool:
+            return {'size': 0, 'open': 1 if self.connection else 0, 'idle': 0}
+        return self._pool.stats()
+    
+    def _resolve_pragma_profile(self, profile: Optional[Any]) -> Dict[str, Any]:
+        """Получить настройки профиля по имени или проверить переданный словарь"""
+        if profile is None:
+            return {}
+        
+        if isinstance(profile, str):
+            if profile not in self.PRAGMA_PROFILES:
+                raise ValueError(f"Неизвестный профиль '{profile}'. Допустимые значения: {list(self.PRAGMA_PROFILES)}")
+            return dict(self.PRAGMA_PROFILES[profile])
+        
+        pragmas = dict(profile)
+        for name, value in pragmas.items():
+            self._check_pragma(name, value)
+        return pragmas
+    
+    def _check_pragma(self, name: str, value: Any) -> None:
+        """Проверить имя и значение настройки из пользовательского профиля"""
+        # Имена и значения подставляются в текст PRAGMA, поэтому допускаются только известные настройки
+        if name not in self.PROFILE_PRAGMAS:
+            raise ValueError(f"Недопустимая настройка '{name}'. Допустимые значения: {list(self.PROFILE_PRAGMAS)}")
+        if not isinstance(value, int) and not str(value).isalnum():
+            raise ValueError(f"Недопустимое значение настройки {name}: {value!r}")
+    
+    def get_pragmas(self) -> Dict[str, Any]:
+        """Текущие значения настроек соединения"""
+        if not self.connection:
+            self.connect()
+        
+        synchronous_names = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+        temp_store_names = {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'}
+        
+        pragmas = {}
+        for name in self.PRAGMA_NAMES:
+            row = self.connection.execute(f"PRAGMA {name}").fetchone()
+            pragmas[name] = row[0] if row else None
+        
+        pragmas['journal_mode'] = pragmas['journal_mode'].upper()
+        pragmas['synchronous'] = synchronous_names.get(pragmas['synchronous'], pragmas['synchronous'])
+        pragmas['temp_store'] = temp_store_names.get(pragmas['temp_store'], pragmas['temp_store'])
+        pragmas['foreign_keys'] = bool(pragmas['foreign_keys'])
+        return pragmas
     
     def close(self) -> None:
-        """Закрыть соединение с базой данных"""
-        if self.connection:
+        """Закрыть соединение с базой данных (в режиме пула - все соединения пула)"""
+        if self._pool:
+            self._pool.close()
+            self._schema_ready = False
+        elif self.connection:
             self.connection.close()
             self.connection = None
+            self._transaction_depth = 0
+        self.clear_cache()
     
     def __enter__(self):
         """Контекстный менеджер для использования with"""
@@ -38,11 +247,203 @@ class DatabaseManager:
         if not self.connection:
             self.connect()
         
-        cursor = self.connection.cursor()
-        cursor.execute(query, params)
-        self.connection.commit()
+        # В режиме пула запись вне transaction() выполняется под блокировкой писателя,
+        # чтобы потоки не получали "database is locked"; чтение идет без блокировки
+        lock = nullcontext()
+        if self._pool and self._transaction_depth == 0 and self._is_write_query(query):
+            lock = self._write_lock
+        
+        with lock:
+            cursor = self.connection.cursor()
+            cursor.execute(query, params)
+            
+            # Внутри transaction() фиксация выполняется один раз при выходе из блока
+            if self.autocommit and self._transaction_depth == 0 and self.connection.in_transaction:
+                self.connection.commit()
+                self._flush_invalidations()
         return cursor
     
+    def _is_write_query(self, query: str) -> bool:
+        """Изменяет ли запрос базу данных"""
+        return query.lstrip()[:7].upper().startswith(self.WRITE_STATEMENTS)
+    
+    def commit(self) -> None:
+        """Зафиксировать текущую транзакцию"""
+        if self.connection and self.connection.in_transaction:
+            self.connection.commit()
+        self._flush_invalidations()
+    
+    def rollback(self) -> None:
+        """Откатить текущую транзакцию"""
+        if self.connection and self.connection.in_transaction:
+            self.connection.rollback()
+        # Объекты, прочитанные внутри откатанной транзакции, больше не соответствуют базе
+        self.clear_cache()
+    
+    @contextmanager
+    def transaction(self) -> Iterator["DatabaseManager"]:
+        """Выполнить несколько запросов в одной транзакции с одним commit при выходе из блока"""
+        if not self.connection:
+            self.connect()
+        
+        # В режиме пула транзакции потоков выполняются по одной; RLock допускает вложенные блоки
+        with self._write_lock:
+            with self._transaction_block():
+                yield self
+    
+    @contextmanager
+    def _transaction_block(self) -> Iterator["DatabaseManager"]:
+        """Открыть транзакцию или SAVEPOINT и завершить его по результату блока"""
+        savepoint = self._begin_block()
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            self._rollback_block(savepoint)
+            raise
+        else:
+            self._transaction_depth -= 1
+            self._commit_block(savepoint)
+    
+    def _begin_block(self) -> Optional[str]:
+        """Начать транзакцию или SAVEPOINT, вернуть имя SAVEPOINT для вложенного блока"""
+        # Вложенные блоки используют SAVEPOINT: ошибка откатывает только изменения вложенного блока
+        if self._transaction_depth > 0:
+            savepoint = f"sp_{self._transaction_depth}"
+            self.connection.execute(f"SAVEPOINT {savepoint}")
+            return savepoint
+        
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+        return None
+    
+    def _rollback_block(self, savepoint: Optional[str]) -> None:
+        if savepoint:
+            self.connection.execute(f"ROLLBACK TO {savepoint}")
+            self.connection.execute(f"RELEASE {savepoint}")
+        else:
+            self.connection.rollback()
+        self.clear_cache()
+    
+    def _commit_block(self, savepoint: Optional[str]) -> None:
+        if savepoint:
+            self.connection.execute(f"RELEASE {savepoint}")
+        else:
+            self.connection.commit()
+            self._flush_invalidations()
+    
+    def _cache_get(self, table: str, entity_id: int) -> Any:
+        """Получить сущность из кэша или None"""
+        # Внутри транзакции читается база: в кэше может быть строка без собственных незафиксированных изменений
+        if not self.cache_size or self._in_transaction():
+            return None
+        
+        key = (table, entity_id)
+        with self._cache_lock:
+            entity = self._cache.get(key)
+            if entity is None:
+                self.cache_misses += 1
+                return None
+            
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            # Вызывающий получает свою копию: изменение модели до записи в базу не должно попасть в кэш
+            return copy.copy(entity)
+    
+    def _cache_put(self, table: str, entity_id: int, entity: Any, version: int) -> None:
+        """Положить сущность, прочитанную при версии кэша version, вытеснив самую давно использованную"""
+        # Внутри транзакции прочитаны незафиксированные данные, которые не должны увидеть другие потоки
+        if not self.cache_size or self._in_transaction():
+            return
+        
+        key = (table, entity_id)
+        with self._cache_lock:
+            # После инвалидации прочитанная строка может быть уже устаревшей
+            if version != self._cache_version:
+                return
+            self._cache[key] = copy.copy(entity)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def _cache_invalidate(self, table: str, entity_id: Optional[int] = None) -> None:
+        """Удалить из кэша сущность, а без entity_id - все сущности таблицы"""
+        # Изменение в транзакции станет видно другим потокам только после фиксации: тогда инвалидация
+        # повторяется, чтобы убрать старую строку, прочитанную ими до фиксации
+        if self._in_transaction():
+            pending = getattr(self._local, 'pending_invalidations', None)
+            if pending is None:
+                pending = self._local.pending_invalidations = []
+            pending.append((table, entity_id))
+        
+        with self._cache_lock:
+            self._cache_version += 1
+            if entity_id is not None:
+                self._cache.pop((table, entity_id), None)
+                return
+            
+            for key in [key for key in self._cache if key[0] == table]:
+                del self._cache[key]
+    
+    def _in_transaction(self) -> bool:
+        """Открыта ли транзакция у соединения текущего потока"""
+        return self._transaction_depth > 0 or (self.connection is not None and self.connection.in_transaction)
+    
+    def _flush_invalidations(self) -> None:
+        """Повторить инвалидации, сделанные внутри зафиксированной транзакции"""
+        pending = getattr(self._local, 'pending_invalidations', None)
+        self._local.pending_invalidations = None
+        for table, entity_id in pending or ():
+            self._cache_invalidate(table, entity_id)
+    
+    def clear_cache(self) -> None:
+        """Очистить кэш сущностей (например после изменений через execute_query)"""
+        with self._cache_lock:
+            self._cache_version += 1
+            self._cache.clear()
+        self._local.pending_invalidations = None
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Статистика кэша сущностей: попадания, промахи, текущий и максимальный размер"""
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._cache),
+            'max_size': self.cache_size
+        }
+    
+    def _executemany_insert(self, table: str, query: str, params: Iterable[tuple], models: list) -> List[int]:
+        """Вставить строки одним executemany и проставить моделям назначенные ID"""
+        if not models:
+            return []
+        
+        with self.transaction():
+            self.connection.cursor().executemany(query, params)
+            # Внутри транзакции AUTOINCREMENT выдает пакету непрерывный диапазон ID
+            row = self.execute_query("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+        
+        first_id = row['seq'] - len(models) + 1
+        ids = list(range(first_id, row['seq'] + 1))
+        for model, model_id in zip(models, ids):
+            model.id = model_id
+            self._cache_invalidate(table, model_id)
+        
+        return ids
+    
+    def _iter_rows(self, query: str, params: tuple = (),
+                   batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[sqlite3.Row]:
+        """Лениво читать строки результата запроса пачками через fetchmany"""
+        cursor = self.execute_query(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
     def create_tables(self) -> None:
         """Создать все необходимые таблицы в базе данных"""
         # Таблица пользователей
@@ -85,11 +486,6 @@ class DatabaseManager:
         )
         """
         
-        # Создаем таблицы
-        self.execute_query(users_table)
-        self.execute_query(projects_table)
-        self.execute_query(tasks_table)
-        
         # Создаем индексы для ускорения поиска
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project_id)",
@@ -98,14 +494,81 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date)",
             "CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status)",
+            "CREATE INDEX IF NOT EXISTS idx_projects_end_date ON projects(end_date)",
+            # Частичные индексы по незавершенным записям для поиска просроченных
+            "CREATE INDEX IF NOT EXISTS idx_tasks_open_due_date ON tasks(due_date) WHERE status != 'completed'",
+            "CREATE INDEX IF NOT EXISTS idx_projects_open_end_date ON projects(end_date) WHERE status != 'completed'",
             "CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)"
         ]
         
-        for index in indexes:
-            try:
-                self.execute_query(index)
-            except:
-                pass  # Игнорируем ошибки создания индексов
+        # Создаем таблицы и индексы в одной транзакции
+        with self.transaction():
+            self.execute_query(users_table)
+            self.execute_query(projects_table)
+            self.execute_query(tasks_table)
+            
+            for index in indexes:
+                try:
+                    self.execute_query(index)
+                except:
+                    pass  # Игнорируем ошибки создания индексов
+            
+            self._create_fts_index()
+    
+    def _create_fts_index(self) -> None:
+        """Создать полнотекстовый индекс FTS5 по названию и описанию задач"""
+        existing = self.execute_query(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        ).fetchone()
+        exists = existing is not None
+        
+        # Индекс без префиксных термов (старые базы) пересоздается: поиск по мере ввода ищет по префиксам
+        if exists and 'prefix' not in existing['sql']:
+            self.execute_query("DROP TABLE tasks_fts")
+            exists = False
+        
+        try:
+            # prefix='2 3' - отдельные индексы для префиксов из 2 и 3 символов, запрос "ab"* не перебирает все термы
+            self.execute_query("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+            USING fts5(title, description, content='tasks', content_rowid='id', prefix='2 3')
+            """)
+        except sqlite3.OperationalError:
+            # FTS5 не собран в SQLite - поиск работает через LIKE
+            self.fts_enabled = False
+            return
+        
+        # Триггеры поддерживают индекс в актуальном состоянии
+        triggers = [
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO tasks_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+            """
+        ]
+        for trigger in triggers:
+            self.execute_query(trigger)
+        
+        # Индексируем задачи, созданные до появления индекса
+        if not exists:
+            self.execute_query("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+        
+        self.fts_enabled = True
     
     # ========== Методы для работы с задачами ==========
     
@@ -129,9 +592,74 @@ class DatabaseManager:
         )
         
         task.id = cursor.lastrowid
+        self._cache_invalidate('tasks', task.id)
         return task.id
     
+    def add_tasks_bulk(self, tasks: Iterable[Task]) -> Tuple[List[int], List[Tuple[int, str]]]:
+        """Добавить задачи пакетом в одной транзакции.
+        
+        Возвращает ID добавленных задач и список ошибок (индекс задачи во входных данных, причина).
+        Задачи с ошибками пропускаются, остальные добавляются.
+        """
+        tasks = list(tasks)
+        project_ids = {row['id'] for row in self.execute_query("SELECT id FROM projects").fetchall()}
+        user_ids = {row['id'] for row in self.execute_query("SELECT id FROM users").fetchall()}
+        
+        valid_tasks = []
+        errors = []
+        for index, task in enumerate(tasks):
+            error = self._validate_task_row(task, project_ids, user_ids)
+            if error:
+                errors.append((index, error))
+            else:
+                valid_tasks.append(task)
+        
+        query = """
+        INSERT INTO tasks (title, description, priority, status, due_date, project_id, assignee_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        params = (
+            (
+                task.title,
+                task.description,
+                task.priority,
+                task.status,
+                task.due_date.isoformat(),
+                task.project_id,
+                task.assignee_id
+            )
+            for task in valid_tasks
+        )
+        
+        ids = self._executemany_insert('tasks', query, params, valid_tasks)
+        return ids, errors
+    
+    @staticmethod
+    def _model_error(entity) -> Optional[str]:
+        """Проверить поля сущности правилами ее модели, вернуть текст ошибки или None"""
+        try:
+            entity.validate()
+        except (ValueError, TypeError) as e:
+            return str(e)
+        return None
+    
+    def _validate_task_row(self, task: Task, project_ids: set, user_ids: set) -> Optional[str]:
+        """Проверить задачу перед пакетной вставкой, вернуть текст ошибки или None"""
+        error = self._model_error(task)
+        if error is not None:
+            return error
+        if task.project_id not in project_ids:
+            return f"Проект с ID {task.project_id} не найден"
+        if task.assignee_id not in user_ids:
+            return f"Пользователь с ID {task.assignee_id} не найден"
+        return None
+    
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        task = self._cache_get('tasks', task_id)
+        if task is not None:
+            return task
+        version = self._cache_version
+        
         query = "SELECT * FROM tasks WHERE id = ?"
         cursor = self.execute_query(query, (task_id,))
         row = cursor.fetchone()
@@ -139,28 +667,65 @@ class DatabaseManager:
         if not row:
             return None
         
-        return self._row_to_task(dict(row))
+        task = self._row_to_task(row)
+        self._cache_put('tasks', task_id, task, version)
+        return task
     
     def get_all_tasks(self) -> List[Task]:
-        query = "SELECT * FROM tasks ORDER BY due_date"
-        cursor = self.execute_query(query)
-        rows = cursor.fetchall()
+        return list(self.iter_tasks())
+    
+    def iter_tasks(self, project_id: Optional[int] = None, assignee_id: Optional[int] = None,
+                   batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Task]:
+        """Лениво перебрать задачи, при необходимости отфильтрованные по проекту или исполнителю"""
+        filters = {'project_id': project_id, 'assignee_id': assignee_id}
+        conditions = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = tuple(value for value in filters.values() if value is not None)
         
-        tasks = []
-        for row in rows:
-            tasks.append(self._row_to_task(dict(row)))
+        # Порядок совпадает с get_tasks_by_project / get_tasks_by_user / get_all_tasks
+        orders = {(True, False): "priority, due_date", (False, True): "due_date, priority"}
+        order_by = orders.get((project_id is not None, assignee_id is not None), "due_date")
+        
+        query = "SELECT * FROM tasks"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {order_by}"
+        
+        for row in self._iter_rows(query, params, batch_size):
+            yield self._row_to_task(row)
+    
+    def get_tasks_page(self, after: Optional[Tuple[datetime, int]] = None,
+                       page_size: int = DEFAULT_PAGE_SIZE) -> List[Task]:
+        """Получить страницу задач, упорядоченных по (due_date, id), после курсора after"""
+        if after is None:
+            query = "SELECT * FROM tasks ORDER BY due_date, id LIMIT ?"
+            params = (page_size,)
+        else:
+            query = "SELECT * FROM tasks WHERE (due_date, id) > (?, ?) ORDER BY due_date, id LIMIT ?"
+            params = (after[0].isoformat(), after[1], page_size)
+        
+        cursor = self.execute_query(query, params)
+        return [self._row_to_task(row) for row in cursor.fetchall()]
+    
+    def get_overdue_tasks(self, now: Optional[datetime] = None) -> List[Task]:
+        """Получить незавершенные задачи со сроком раньше now"""
+        if now is None:
+            now = current_time()
+        
+        # Условие по статусу должно совпадать с условием частичного индекса idx_tasks_open_due_date
+        query = """
+        SELECT * FROM tasks
+        WHERE status != 'completed' AND due_date < ?
+        ORDER BY due_date
+        """
         
-        return tasks
+        cursor = self.execute_query(query, (now.isoformat(),))
+        return [self._row_to_task(row) for row in cursor.fetchall()]
     
     def update_task(self, task_id: int, **kwargs) -> bool:
+        """Обновить поля; False если запись не найдена, нарушение ограничений вызывает sqlite3.IntegrityError"""
         if not kwargs:
             return False
         
-        # Проверяем существование задачи
-        task = self.get_task_by_id(task_id)
-        if not task:
-            return False
-        
         # Формируем запрос обновления
         set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
         values = list(kwargs.values())
@@ -173,9 +738,14 @@ class DatabaseManager:
         query = f"UPDATE tasks SET {set_clause} WHERE id = ?"
         values.append(task_id)
         
+        # Существование записи определяется по количеству обновленных строк, без предварительного SELECT.
+        # Кэш очищается после записи: иначе параллельный читатель успел бы снова закэшировать старую строку
         try:
-            self.execute_query(query, tuple(values))
-            return True
+            cursor = self.execute_query(query, tuple(values))
+            self._cache_invalidate('tasks', task_id)
+            return cursor.rowcount > 0
+        except sqlite3.IntegrityError:
+            raise
         except sqlite3.Error:
             return False
     
@@ -184,71 +754,131 @@ class DatabaseManager:
         
         try:
             cursor = self.execute_query(query, (task_id,))
+            self._cache_invalidate('tasks', task_id)
             return cursor.rowcount > 0
         except sqlite3.Error:
             return False
     
-    def search_tasks(self, query_text: str) -> List[Task]:
-        search_pattern = f"%{query_text}%"
+    def search_tasks(self, query_text: str, limit: Optional[int] = None) -> List[Task]:
+        """Поиск задач по названию и описанию: FTS5 с ранжированием bm25, без FTS5 - подстрока через LIKE"""
+        return list(self.iter_search_tasks(query_text, limit))
+    
+    def iter_search_tasks(self, query_text: str, limit: Optional[int] = None,
+                          batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Task]:
+        """Лениво перебрать результаты search_tasks в том же порядке"""
+        # Каждое слово запроса - префиксный терм, термы объединяются через AND
+        terms = re.findall(r"\w+", query_text)
+        
+        if self.fts_enabled and terms:
+            match_expression = " ".join(f'"{term}"*' for term in terms)
+            query = """
+            SELECT t.* FROM tasks_fts
+            JOIN tasks t ON t.id = tasks_fts.rowid
+            WHERE tasks_fts MATCH ?
+            ORDER BY bm25(tasks_fts), t.due_date
+            LIMIT ?
+            """
+            params = (match_expression, limit if limit is not None else -1)
+        else:
+            search_pattern = f"%{query_text}%"
+            query = """
+            SELECT * FROM tasks 
+            WHERE title LIKE ? OR description LIKE ?
+            ORDER BY due_date
+            LIMIT ?
+            """
+            params = (search_pattern, search_pattern, limit if limit is not None else -1)
+        
+        for row in self._iter_rows(query, params, batch_size):
+            yield self._row_to_task(row)
+    
+    def get_tasks_by_project(self, project_id: int) -> List[Task]:
+        return list(self.iter_tasks(project_id=project_id))
+    
+    def get_tasks_by_user(self, user_id: int) -> List[Task]:
+        return list(self.iter_tasks(assignee_id=user_id))
+    
+    def reassign_tasks(self, old_user_id: int, new_user_id: int) -> int:
+        """Переназначить все задачи одного пользователя другому, вернуть количество задач"""
+        query = "UPDATE tasks SET assignee_id = ? WHERE assignee_id = ?"
+        
+        with self.transaction():
+            cursor = self.execute_query(query, (new_user_id, old_user_id))
+        
+        self._cache_invalidate('tasks')
+        return cursor.rowcount
+    
+    def get_all_tasks_with_names(self) -> List[Tuple[Task, Optional[str], Optional[str]]]:
+        """Получить все задачи вместе с названием проекта и именем исполнителя одним запросом"""
         query = """
-        SELECT * FROM tasks 
-        WHERE title LIKE ? OR description LIKE ?
-        ORDER BY due_date
+        SELECT t.*, p.name AS project_name, u.username AS assignee_name
+        FROM tasks t
+        LEFT JOIN projects p ON p.id = t.project_id
+        LEFT JOIN users u ON u.id = t.assignee_id
+        ORDER BY t.due_date
         """
         
-        cursor = self.execute_query(query, (search_pattern, search_pattern))
+        cursor = self.execute_query(query)
         rows = cursor.fetchall()
         
-        tasks = []
+        result = []
         for row in rows:
-            tasks.append(self._row_to_task(dict(row)))
+            result.append((self._row_to_task(row), row['project_name'], row['assignee_name']))
         
-        return tasks
+        return result
     
-    def get_tasks_by_project(self, project_id: int) -> List[Task]:
+    def get_task_statistics(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Получить статистику задач по статусам, приоритетам и просрочке одним агрегирующим запросом"""
+        if now is None:
+            now = current_time()
+        
         query = """
-        SELECT * FROM tasks 
-        WHERE project_id = ?
-        ORDER BY priority, due_date
+        SELECT status, priority,
+               COUNT(*) AS total,
+               SUM(status != 'completed' AND due_date < ?) AS overdue
+        FROM tasks
+        GROUP BY status, priority
         """
         
-        cursor = self.execute_query(query, (project_id,))
-        rows = cursor.fetchall()
+        cursor = self.execute_query(query, (now.isoformat(),))
         
-        tasks = []
-        for row in rows:
-            tasks.append(self._row_to_task(dict(row)))
+        # Групп не больше чем статусов * приоритетов, поэтому свертка не зависит от числа задач
+        priority_names = {1: 'high', 2: 'medium', 3: 'low'}
+        stats = {'total': 0, 'by_status': {}, 'by_priority': {}, 'overdue': 0}
+        for row in cursor.fetchall():
+            priority_name = priority_names.get(row['priority'], 'unknown')
+            stats['total'] += row['total']
+            stats['by_status'][row['status']] = stats['by_status'].get(row['status'], 0) + row['total']
+            stats['by_priority'][priority_name] = stats['by_priority'].get(priority_name, 0) + row['total']
+            stats['overdue'] += row['overdue']
         
-        return tasks
+        return stats
     
-    def get_tasks_by_user(self, user_id: int) -> List[Task]:
+    def get_task_table(self, project_id: Optional[int] = None,
+                       assignee_id: Optional[int] = None) -> TaskTable:
+        """Загрузить задачи в колоночную таблицу TaskTable, при необходимости по проекту или исполнителю"""
+        conditions = []
+        params = []
+        if project_id is not None:
+            conditions.append("project_id = ?")
+            params.append(project_id)
+        if assignee_id is not None:
+            conditions.append("assignee_id = ?")
+            params.append(assignee_id)
+        
+        # Срок переводится в секунды средствами SQLite, без разбора дат в Python
         query = """
-        SELECT * FROM tasks 
-        WHERE assignee_id = ?
-        ORDER BY due_date, priority
+        SELECT id, priority, status, CAST(strftime('%s', due_date) AS INTEGER),
+               project_id, assignee_id
+        FROM tasks
         """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
         
-        cursor = self.execute_query(query, (user_id,))
-        rows = cursor.fetchall()
-        
-        tasks = []
-        for row in rows:
-            tasks.append(self._row_to_task(dict(row)))
-        
-        return tasks
-    
-    def _row_to_task(self, row: Dict[str, Any]) -> Task:
-        task = Task(
-            title=row['title'],
-            description=row['description'],
-            priority=row['priority'],
-            due_date=datetime.fromisoformat(row['due_date']),
-            project_id=row['project_id'],
-            assignee_id=row['assignee_id']
-        )
-        task.id = row['id']
-        task.status = row['status']
-        return task
+        return TaskTable.from_rows(self._iter_rows(query, tuple(params)))
+    
+    def _row_to_task(self, row: sqlite3.Row) -> Task:
+        return Task.from_row(row)
     
     # ========== Методы для работы с проектами ==========
     
@@ -270,9 +900,53 @@ class DatabaseManager:
         )
         
         project.id = cursor.lastrowid
+        self._cache_invalidate('projects', project.id)
         return project.id
     
+    def add_projects_bulk(self, projects: Iterable[Project]) -> Tuple[List[int], List[Tuple[int, str]]]:
+        """Добавить проекты пакетом в одной транзакции.
+        
+        Возвращает ID добавленных проектов и список ошибок (индекс проекта во входных данных, причина).
+        """
+        projects = list(projects)
+        
+        valid_projects = []
+        errors = []
+        for index, project in enumerate(projects):
+            error = self._validate_project_row(project)
+            if error:
+                errors.append((index, error))
+            else:
+                valid_projects.append(project)
+        
+        query = """
+        INSERT INTO projects (name, description, start_date, end_date, status)
+        VALUES (?, ?, ?, ?, ?)
+        """
+        params = (
+            (
+                project.name,
+                project.description,
+                project.start_date.isoformat(),
+                project.end_date.isoformat(),
+                project.status
+            )
+            for project in valid_projects
+        )
+        
+        ids = self._executemany_insert('projects', query, params, valid_projects)
+        return ids, errors
+    
+    def _validate_project_row(self, project: Project) -> Optional[str]:
+        """Проверить проект перед пакетной вставкой, вернуть текст ошибки или None"""
+        return self._model_error(project)
+    
     def get_project_by_id(self, project_id: int) -> Optional[Project]:
+        project = self._cache_get('projects', project_id)
+        if project is not None:
+            return project
+        version = self._cache_version
+        
         query = "SELECT * FROM projects WHERE id = ?"
         cursor = self.execute_query(query, (project_id,))
         row = cursor.fetchone()
@@ -280,28 +954,52 @@ class DatabaseManager:
         if not row:
             return None
         
-        return self._row_to_project(dict(row))
+        project = self._row_to_project(row)
+        self._cache_put('projects', project_id, project, version)
+        return project
     
     def get_all_projects(self) -> List[Project]:
+        return list(self.iter_projects())
+    
+    def iter_projects(self, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Project]:
+        """Лениво перебрать проекты в порядке даты окончания"""
         query = "SELECT * FROM projects ORDER BY end_date"
-        cursor = self.execute_query(query)
-        rows = cursor.fetchall()
+        for row in self._iter_rows(query, batch_size=batch_size):
+            yield self._row_to_project(row)
+    
+    def get_projects_page(self, after: Optional[Tuple[datetime, int]] = None,
+                          page_size: int = DEFAULT_PAGE_SIZE) -> List[Project]:
+        """Получить страницу проектов, упорядоченных по (end_date, id), после курсора after"""
+        if after is None:
+            query = "SELECT * FROM projects ORDER BY end_date, id LIMIT ?"
+            params = (page_size,)
+        else:
+            query = "SELECT * FROM projects WHERE (end_date, id) > (?, ?) ORDER BY end_date, id LIMIT ?"
+            params = (after[0].isoformat(), after[1], page_size)
         
-        projects = []
-        for row in rows:
-            projects.append(self._row_to_project(dict(row)))
+        cursor = self.execute_query(query, params)
+        return [self._row_to_project(row) for row in cursor.fetchall()]
+    
+    def get_overdue_projects(self, now: Optional[datetime] = None) -> List[Project]:
+        """Получить незавершенные проекты с датой окончания раньше now"""
+        if now is None:
+            now = current_time()
         
-        return projects
+        # Условие по статусу должно совпадать с условием частичного индекса idx_projects_open_end_date
+        query = """
+        SELECT * FROM projects
+        WHERE status != 'completed' AND end_date < ?
+        ORDER BY end_date
+        """
+        
+        cursor = self.execute_query(query, (now.isoformat(),))
+        return [self._row_to_project(row) for row in cursor.fetchall()]
     
     def update_project(self, project_id: int, **kwargs) -> bool:
+        """Обновить поля; False если запись не найдена, нарушение ограничений вызывает sqlite3.IntegrityError"""
         if not kwargs:
             return False
         
-        # Проверяем существование проекта
-        project = self.get_project_by_id(project_id)
-        if not project:
-            return False
-        
         # Формируем запрос обновления
         set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
         values = list(kwargs.values())
@@ -314,9 +1012,14 @@ class DatabaseManager:
         query = f"UPDATE projects SET {set_clause} WHERE id = ?"
         values.append(project_id)
         
+        # Существование записи определяется по количеству обновленных строк, без предварительного SELECT.
+        # Кэш очищается после записи: иначе параллельный читатель успел бы снова закэшировать старую строку
         try:
-            self.execute_query(query, tuple(values))
-            return True
+            cursor = self.execute_query(query, tuple(values))
+            self._cache_invalidate('projects', project_id)
+            return cursor.rowcount > 0
+        except sqlite3.IntegrityError:
+            raise
         except sqlite3.Error:
             return False
     
@@ -325,20 +1028,52 @@ class DatabaseManager:
         
         try:
             cursor = self.execute_query(query, (project_id,))
+            self._cache_invalidate('projects', project_id)
+            # Задачи проекта удаляются каскадно
+            self._cache_invalidate('tasks')
             return cursor.rowcount > 0
         except sqlite3.Error:
             return False
     
-    def _row_to_project(self, row: Dict[str, Any]) -> Project:
-        project = Project(
-            name=row['name'],
-            description=row['description'],
-            start_date=datetime.fromisoformat(row['start_date']),
-            end_date=datetime.fromisoformat(row['end_date'])
-        )
-        project.id = row['id']
-        project.status = row['status']
-        return project
+    def get_project_task_counts(self, now: Optional[datetime] = None) -> Dict[int, Tuple[int, int, int, int, int]]:
+        """Получить количество задач по проектам: (всего, завершено, в работе, ожидание, просрочено)"""
+        if now is None:
+            now = current_time()
+        
+        query = """
+        SELECT project_id,
+               COUNT(*) AS total,
+               SUM(status = 'completed') AS completed,
+               SUM(status = 'in_progress') AS in_progress,
+               SUM(status = 'pending') AS pending,
+               SUM(status != 'completed' AND due_date < ?) AS overdue
+        FROM tasks
+        GROUP BY project_id
+        """
+        
+        cursor = self.execute_query(query, (now.isoformat(),))
+        
+        counts = {}
+        for row in cursor.fetchall():
+            counts[row['project_id']] = (
+                row['total'],
+                row['completed'],
+                row['in_progress'],
+                row['pending'],
+                row['overdue']
+            )
+        
+        return counts
+    
+    def get_project_statistics(self, project_id: int, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Получить сводку по задачам проекта; пустой словарь если проект не найден"""
+        if self.execute_query("SELECT 1 FROM projects WHERE id = ?", (project_id,)).fetchone() is None:
+            return {}
+        
+        return self.get_task_table(project_id=project_id).summary(now or current_time())
+    
+    def _row_to_project(self, row: sqlite3.Row) -> Project:
+        return Project.from_row(row)
     
     # ========== Методы для работы с пользователями ==========
     
@@ -359,9 +1094,65 @@ class DatabaseManager:
         )
         
         user.id = cursor.lastrowid
+        self._cache_invalidate('users', user.id)
         return user.id
     
+    def add_users_bulk(self, users: Iterable[User]) -> Tuple[List[int], List[Tuple[int, str]]]:
+        """Добавить пользователей пакетом в одной транзакции.
+        
+        Возвращает ID добавленных пользователей и список ошибок (индекс во входных данных, причина).
+        """
+        users = list(users)
+        rows = self.execute_query("SELECT username, email FROM users").fetchall()
+        usernames = {row['username'] for row in rows}
+        emails = {row['email'] for row in rows}
+        
+        valid_users = []
+        errors = []
+        for index, user in enumerate(users):
+            error = self._validate_user_row(user, usernames, emails)
+            if error:
+                errors.append((index, error))
+            else:
+                # Дубликаты внутри пакета тоже считаются ошибкой
+                usernames.add(user.username)
+                emails.add(user.email)
+                valid_users.append(user)
+        
+        query = """
+        INSERT INTO users (username, email, role, registration_date)
+        VALUES (?, ?, ?, ?)
+        """
+        params = (
+            (
+                user.username,
+                user.email,
+                user.role,
+                user.registration_date.isoformat()
+            )
+            for user in valid_users
+        )
+        
+        ids = self._executemany_insert('users', query, params, valid_users)
+        return ids, errors
+    
+    def _validate_user_row(self, user: User, usernames: set, emails: set) -> Optional[str]:
+        """Проверить пользователя перед пакетной вставкой, вернуть текст ошибки или None"""
+        error = self._model_error(user)
+        if error is not None:
+            return error
+        if user.username in usernames:
+            return f"Пользователь с именем '{user.username}' уже существует"
+        if user.email in emails:
+            return f"Пользователь с email '{user.email}' уже существует"
+        return None
+    
     def get_user_by_id(self, user_id: int) -> Optional[User]:
+        user = self._cache_get('users', user_id)
+        if user is not None:
+            return user
+        version = self._cache_version
+        
         query = "SELECT * FROM users WHERE id = ?"
         cursor = self.execute_query(query, (user_id,))
         row = cursor.fetchone()
@@ -369,28 +1160,37 @@ class DatabaseManager:
         if not row:
             return None
         
-        return self._row_to_user(dict(row))
+        user = self._row_to_user(row)
+        self._cache_put('users', user_id, user, version)
+        return user
     
     def get_all_users(self) -> List[User]:
+        return list(self.iter_users())
+    
+    def iter_users(self, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[User]:
+        """Лениво перебрать пользователей в порядке имени"""
         query = "SELECT * FROM users ORDER BY username"
-        cursor = self.execute_query(query)
-        rows = cursor.fetchall()
-        
-        users = []
-        for row in rows:
-            users.append(self._row_to_user(dict(row)))
+        for row in self._iter_rows(query, batch_size=batch_size):
+            yield self._row_to_user(row)
+    
+    def get_users_page(self, after: Optional[Tuple[str, int]] = None,
+                       page_size: int = DEFAULT_PAGE_SIZE) -> List[User]:
+        """Получить страницу пользователей, упорядоченных по (username, id), после курсора after"""
+        if after is None:
+            query = "SELECT * FROM users ORDER BY username, id LIMIT ?"
+            params = (page_size,)
+        else:
+            query = "SELECT * FROM users WHERE (username, id) > (?, ?) ORDER BY username, id LIMIT ?"
+            params = (after[0], after[1], page_size)
         
-        return users
+        cursor = self.execute_query(query, params)
+        return [self._row_to_user(row) for row in cursor.fetchall()]
     
     def update_user(self, user_id: int, **kwargs) -> bool:
+        """Обновить поля; False если запись не найдена, нарушение ограничений вызывает sqlite3.IntegrityError"""
         if not kwargs:
             return False
         
-        # Проверяем существование пользователя
-        user = self.get_user_by_id(user_id)
-        if not user:
-            return False
-        
         # Формируем запрос обновления
         set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
         values = list(kwargs.values())
@@ -403,9 +1203,14 @@ class DatabaseManager:
         query = f"UPDATE users SET {set_clause} WHERE id = ?"
         values.append(user_id)
         
+        # Существование записи определяется по количеству обновленных строк, без предварительного SELECT.
+        # Кэш очищается после записи: иначе параллельный читатель успел бы снова закэшировать старую строку
         try:
-            self.execute_query(query, tuple(values))
-            return True
+            cursor = self.execute_query(query, tuple(values))
+            self._cache_invalidate('users', user_id)
+            return cursor.rowcount > 0
+        except sqlite3.IntegrityError:
+            raise
         except sqlite3.Error:
             return False
     
@@ -414,6 +1219,29 @@ class DatabaseManager:
         
         try:
             cursor = self.execute_query(query, (user_id,))
+            self._cache_invalidate('users', user_id)
+            # Задачи пользователя удаляются каскадно
+            self._cache_invalidate('tasks')
             return cursor.rowcount > 0
         except sqlite3.Error:
-            return False
\ No newline at end of file
+            return False
+    
+    def user_has_tasks(self, user_id: int) -> bool:
+        """Проверить наличие задач у пользователя без выборки самих задач"""
+        query = "SELECT EXISTS(SELECT 1 FROM tasks WHERE assignee_id = ?)"
+        return bool(self.execute_query(query, (user_id,)).fetchone()[0])
+    
+    def get_user_task_counts(self) -> Dict[int, int]:
+        """Получить количество задач каждого исполнителя одним запросом"""
+        query = "SELECT assignee_id, COUNT(*) AS total FROM tasks GROUP BY assignee_id"
+        return {row['assignee_id']: row['total'] for row in self.execute_query(query).fetchall()}
+    
+    def get_user_statistics(self, user_id: int, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Получить сводку по задачам пользователя; пустой словарь если пользователь не найден"""
+        if self.execute_query("SELECT 1 FROM users WHERE id = ?", (user_id,)).fetchone() is None:
+            return {}
+        
+        return self.get_task_table(assignee_id=user_id).summary(now or current_time())
+    
+    def _row_to_user(self, row: sqlite3.Row) -> User:
+        return User.from_row(row)
\ No newline at end of file
@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Iterator, Optional
+
+
+# Зафиксированное время текущего контекста; None - использовать системные часы
+_frozen: ContextVar[Optional[datetime]] = ContextVar('frozen_time', default=None)
+
+
+def current_time() -> datetime:
+    """Текущее время: зафиксированное через frozen_time() или системное"""
+    frozen = _frozen.get()
+    return frozen if frozen is not None else datetime.now()
+
+
+@contextmanager
+def frozen_time(moment: Optional[datetime] = None) -> Iterator[datetime]:
+    """Зафиксировать время внутри блока, чтобы все проверки использовали один момент"""
+    # Вложенный блок без явного момента продолжает использовать момент внешнего блока
+    if moment is None:
+        moment = current_time()
+    
+    token = _frozen.set(moment)
+    try:
+        yield moment
+    finally:
+        _frozen.reset(token)
@@ -0,0 +1,90 @@
+import bisect
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+
+class FilterIndex:
+    """Индекс загруженных сущностей для фильтрации и сортировки без обращения к базе данных"""
+    
+    __slots__ = ('items', 'fields', 'sort_keys', 'buckets', 'orders', 'ranks')
+    
+    def __init__(self, items: Iterable[Any], fields: Dict[str, Callable[[Any], Any]],
+                 sort_keys: Dict[str, Callable[[Any], Any]]) -> None:
+        """fields - функции значений для группировки, sort_keys - функции ключей сортировки"""
+        self.items: Dict[int, Any] = {item.id: item for item in items}
+        self.fields = fields
+        self.sort_keys = sort_keys
+        
+        # Группы id по значению каждого поля: {'status': {'pending': {1, 5}, ...}}
+        self.buckets: Dict[str, Dict[Any, Set[int]]] = {name: {} for name in fields}
+        for item_id, item in self.items.items():
+            for name, key in fields.items():
+                self.buckets[name].setdefault(key(item), set()).add(item_id)
+        
+        # Порядок id для каждой сортировки и позиция id в нем (позиции пересчитываются после изменений)
+        self.orders: Dict[str, List[int]] = {}
+        self.ranks: Dict[str, Dict[int, int]] = {}
+        for name, key in sort_keys.items():
+            self.orders[name] = sorted(self.items, key=lambda item_id: key(self.items[item_id]))
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def update(self, item: Any) -> None:
+        """Добавить сущность или заменить сущность с тем же id без перестроения индекса"""
+        if item.id in self.items:
+            self.remove(item.id)
+        
+        self.items[item.id] = item
+        for name, key in self.fields.items():
+            self.buckets[name].setdefault(key(item), set()).add(item.id)
+        for name, key in self.sort_keys.items():
+            bisect.insort(self.orders[name], item.id, key=lambda item_id: key(self.items[item_id]))
+        self.ranks.clear()
+    
+    def remove(self, item_id: int) -> None:
+        """Удалить сущность по id"""
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return
+        
+        for name, key in self.fields.items():
+            self.buckets[name].get(key(item), set()).discard(item_id)
+        for order in self.orders.values():
+            order.remove(item_id)
+        self.ranks.clear()
+    
+    def ids(self, **criteria: Any) -> Set[int]:
+        """Множество id, у которых все поля равны заданным значениям (None - без условия)"""
+        groups = []
+        for name, value in criteria.items():
+            if name not in self.buckets:
+                raise ValueError(f"Неизвестное поле '{name}'")
+            if value is not None:
+                groups.append(self.buckets[name].get(value, set()))
+        
+        if not groups:
+            return set(self.items)
+        
+        # Пересечение начинаем с самой маленькой группы
+        groups.sort(key=len)
+        return groups[0].intersection(*groups[1:])
+    
+    def filter(self, order: Optional[str] = None, **criteria: Any) -> List[Any]:
+        """Сущности, подходящие под условия, в порядке сортировки order"""
+        if order is None:
+            order = next(iter(self.orders))
+        
+        if all(value is None for value in criteria.values()):
+            ids = self.orders[order]
+        else:
+            if order not in self.ranks:
+                self.ranks[order] = {item_id: position for position, item_id in enumerate(self.orders[order])}
+            ranks = self.ranks[order]
+            ids = sorted(self.ids(**criteria), key=ranks.__getitem__)
+        return [self.items[item_id] for item_id in ids]
+    
+    def count(self, **criteria: Any) -> int:
+        """Количество сущностей, подходящих под условия"""
+        if all(value is None for value in criteria.values()):
+            return len(self.items)
+        return len(self.ids(**criteria))
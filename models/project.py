@@ -1,7 +1,12 @@
 from datetime import datetime
+from typing import Any, Mapping, Optional
+
+from models.clock import current_time
 
 
 class Project:
+    __slots__ = ('id', 'name', 'description', 'start_date', 'end_date', 'status')
+    
     def __init__(self, name: str, description: str, 
                  start_date: datetime, end_date: datetime) -> None:
         self.id = None  # Будет установлен при сохранении в БД
@@ -14,14 +19,41 @@ class Project:
         # Валидация входных данных
         self._validate_inputs()
     
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "Project":
+        """Создать проект из строки базы данных без повторной валидации"""
+        project = cls.__new__(cls)
+        project.id = row['id']
+        project.name = row['name']
+        project.description = row['description']
+        project.start_date = datetime.fromisoformat(row['start_date'])
+        project.end_date = datetime.fromisoformat(row['end_date'])
+        project.status = row['status']
+        return project
+    
     def _validate_inputs(self) -> None:
         """Проверка корректности входных данных"""
+        self.validate()
+        
+        # Начало в будущем запрещено только для новых проектов, пакетный импорт его допускает
+        if self.start_date > datetime.now():
+            raise ValueError("Дата начала не может быть в будущем")
+    
+    def validate(self) -> None:
+        """Проверить название, описание, статус и даты проекта"""
         if not self.name or not self.name.strip():
             raise ValueError("Название проекта не может быть пустым")
         
         if not self.description or not self.description.strip():
             raise ValueError("Описание проекта не может быть пустым")
         
+        if self.status not in ['active', 'completed', 'on_hold']:
+            raise ValueError(f"Недопустимый статус '{self.status}'")
+        
+        self._validate_dates()
+    
+    def _validate_dates(self) -> None:
+        """Проверить типы и порядок дат проекта"""
         if not isinstance(self.start_date, datetime):
             raise TypeError("start_date должен быть объектом datetime")
         
@@ -30,9 +62,6 @@ class Project:
         
         if self.end_date <= self.start_date:
             raise ValueError("Дата окончания должна быть позже даты начала")
-        
-        if self.start_date > datetime.now():
-            raise ValueError("Дата начала не может быть в будущем")
     
     def update_status(self, new_status: str) -> bool:
         valid_statuses = ['active', 'completed', 'on_hold']
@@ -51,8 +80,9 @@ class Project:
         print(f"Статус проекта '{self.name}' изменен: {old_status} -> {new_status}")
         return True
     
-    def get_progress(self) -> float:
-        now = datetime.now()
+    def get_progress(self, now: Optional[datetime] = None) -> float:
+        if now is None:
+            now = current_time()
         
         # Если проект завершен, прогресс = 100%
         if self.status == 'completed':
@@ -84,13 +114,16 @@ class Project:
         progress = elapsed_duration / total_duration
         return max(0.0, min(1.0, progress))  # Ограничиваем от 0 до 1
     
-    def is_overdue(self) -> bool:
-        now = datetime.now()
+    def is_overdue(self, now: Optional[datetime] = None) -> bool:
+        if now is None:
+            now = current_time()
         if self.status == 'completed':
             return False
         return now > self.end_date
     
-    def to_dict(self) -> dict:
+    def to_dict(self, now: Optional[datetime] = None) -> dict:
+        if now is None:
+            now = current_time()
         return {
             'id': self.id,
             'name': self.name,
@@ -98,8 +131,8 @@ class Project:
             'start_date': self.start_date,
             'end_date': self.end_date,
             'status': self.status,
-            'progress': self.get_progress(),
-            'is_overdue': self.is_overdue()
+            'progress': self.get_progress(now),
+            'is_overdue': self.is_overdue(now)
         }
     
     def __str__(self) -> str:
@@ -110,14 +143,15 @@ class Project:
             'on_hold': 'Приостановлен'
         }
         
-        overdue = " (ПРОСРОЧЕН)" if self.is_overdue() else ""
+        now = current_time()
+        overdue = " (ПРОСРОЧЕН)" if self.is_overdue(now) else ""
         
         return (
             f"Проект #{self.id}: {self.name}{overdue}\n"
             f"Описание: {self.description}\n"
             f"Статус: {status_names.get(self.status, 'Неизвестно')}\n"
             f"Период: {self.start_date.strftime('%d.%m.%Y')} - {self.end_date.strftime('%d.%m.%Y')}\n"
-            f"Прогресс: {self.get_progress() * 100:.1f}%"
+            f"Прогресс: {self.get_progress(now) * 100:.1f}%"
         )
     
     def __repr__(self) -> str:
@@ -1,8 +1,14 @@
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional
+
+from models.clock import current_time
 
 
 class Task:
+    # Без __dict__ у каждого экземпляра: задачи целиком держатся в памяти представлений
+    __slots__ = ('id', 'title', 'description', 'priority', 'status',
+                 'due_date', 'project_id', 'assignee_id')
+    
     def __init__(self, title: str, description: str, priority: int, 
                  due_date: datetime, project_id: int, assignee_id: int) -> None:
         self.id = None  # Будет установлен при сохранении в БД
@@ -17,8 +23,31 @@ class Task:
         # Валидация входных данных
         self._validate_inputs()
     
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "Task":
+        """Создать задачу из строки базы данных без повторной валидации"""
+        # Данные из БД уже проверены при сохранении, а срок исторических задач может быть в прошлом
+        task = cls.__new__(cls)
+        task.id = row['id']
+        task.title = row['title']
+        task.description = row['description']
+        task.priority = row['priority']
+        task.status = row['status']
+        task.due_date = datetime.fromisoformat(row['due_date'])
+        task.project_id = row['project_id']
+        task.assignee_id = row['assignee_id']
+        return task
+    
     def _validate_inputs(self) -> None:
         """Проверка корректности входных данных"""
+        self.validate()
+        
+        # Срок в прошлом запрещен только для новых задач: пакетный импорт переносит и исторические
+        if self.due_date < datetime.now():
+            raise ValueError("Срок выполнения не может быть в прошлом")
+    
+    def validate(self) -> None:
+        """Проверить поля задачи без правил, зависящих от текущей даты"""
         if not self.title or not self.title.strip():
             raise ValueError("Название задачи не может быть пустым")
         
@@ -28,11 +57,11 @@ class Task:
         if self.priority not in [1, 2, 3]:
             raise ValueError("Приоритет должен быть 1, 2 или 3")
         
+        if self.status not in ['pending', 'in_progress', 'completed']:
+            raise ValueError(f"Недопустимый статус '{self.status}'")
+        
         if not isinstance(self.due_date, datetime):
             raise TypeError("due_date должен быть объектом datetime")
-        
-        if self.due_date < datetime.now():
-            raise ValueError("Срок выполнения не может быть в прошлом")
     
     def update_status(self, new_status: str) -> bool:
 
@@ -51,8 +80,9 @@ class Task:
         print(f"Статус задачи '{self.title}' изменен: {old_status} -> {new_status}")
         return True
     
-    def is_overdue(self) -> bool:
-        now = datetime.now()
+    def is_overdue(self, now: Optional[datetime] = None) -> bool:
+        if now is None:
+            now = current_time()
         
         # Если задача уже завершена, она не считается просроченной
         if self.status == 'completed':
@@ -60,7 +90,7 @@ class Task:
         
         return self.due_date < now
     
-    def to_dict(self) -> dict:
+    def to_dict(self, now: Optional[datetime] = None) -> dict:
         return {
             'id': self.id,
             'title': self.title,
@@ -70,7 +100,7 @@ class Task:
             'due_date': self.due_date,
             'project_id': self.project_id,
             'assignee_id': self.assignee_id,
-            'is_overdue': self.is_overdue()
+            'is_overdue': self.is_overdue(now)
         }
     
     def __str__(self) -> str:
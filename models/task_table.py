@@ -0,0 +1,104 @@
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Коды статусов задач в колонке statuses
+STATUSES = ('pending', 'in_progress', 'completed')
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Начало отсчета для сроков; наивное время, как и в базе данных
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(value: datetime) -> int:
+    """Перевести время в целое число секунд от EPOCH"""
+    return int((value - EPOCH).total_seconds())
+
+
+class TaskTable:
+    """Колоночное представление задач для аналитики без создания объектов Task"""
+    
+    __slots__ = ('ids', 'priorities', 'statuses', 'due_dates', 'project_ids', 'assignee_ids')
+    
+    # Колонки, по которым допустимы фильтрация и группировка
+    COLUMNS = ('ids', 'priorities', 'statuses', 'due_dates', 'project_ids', 'assignee_ids')
+    
+    def __init__(self) -> None:
+        self.ids = array('i')
+        self.priorities = array('b')
+        self.statuses = array('b')
+        self.due_dates = array('q')  # Секунды от EPOCH
+        self.project_ids = array('i')
+        self.assignee_ids = array('i')
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, int, str, int, int, int]]) -> "TaskTable":
+        """Собрать таблицу из строк (id, priority, status, due_date в секундах, project_id, assignee_id)"""
+        table = cls()
+        for row in rows:
+            table.append(*row)
+        return table
+    
+    def append(self, task_id: int, priority: int, status: str, due_date: int,
+               project_id: int, assignee_id: int) -> None:
+        """Добавить задачу в конец таблицы"""
+        self.ids.append(task_id)
+        self.priorities.append(priority)
+        self.statuses.append(STATUS_CODES[status])
+        self.due_dates.append(due_date)
+        self.project_ids.append(project_id)
+        self.assignee_ids.append(assignee_id)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def filter(self, status: Optional[str] = None, **conditions: int) -> "TaskTable":
+        """Получить таблицу из задач, у которых колонки равны заданным значениям"""
+        if status is not None:
+            conditions['statuses'] = STATUS_CODES[status]
+        
+        mask: Optional[List[bool]] = None
+        for column, value in conditions.items():
+            if column not in self.COLUMNS:
+                raise ValueError(f"Неизвестная колонка '{column}'")
+            
+            column_mask = [item == value for item in getattr(self, column)]
+            mask = column_mask if mask is None else [a and b for a, b in zip(mask, column_mask)]
+        
+        result = TaskTable()
+        for column in self.COLUMNS:
+            values = getattr(self, column)
+            selected = values if mask is None else compress(values, mask)
+            getattr(result, column).extend(selected)
+        return result
+    
+    def count_by_status(self) -> Dict[str, int]:
+        """Количество задач по каждому статусу, включая нулевые"""
+        return {status: self.statuses.count(code) for code, status in enumerate(STATUSES)}
+    
+    def count_overdue(self, now: datetime) -> int:
+        """Количество незавершенных задач со сроком раньше now"""
+        deadline = to_epoch(now)
+        completed = STATUS_CODES['completed']
+        return sum(1 for status, due_date in zip(self.statuses, self.due_dates)
+                   if status != completed and due_date < deadline)
+    
+    def group_count(self, column: str) -> Dict[int, int]:
+        """Количество задач по значениям колонки"""
+        if column not in self.COLUMNS:
+            raise ValueError(f"Неизвестная колонка '{column}'")
+        return dict(Counter(getattr(self, column)))
+    
+    def summary(self, now: datetime) -> Dict[str, int]:
+        """Сводка по задачам в формате статистики проекта и пользователя"""
+        by_status = self.count_by_status()
+        return {
+            'total_tasks': len(self),
+            'completed_tasks': by_status['completed'],
+            'in_progress_tasks': by_status['in_progress'],
+            'pending_tasks': by_status['pending'],
+            'overdue_tasks': self.count_overdue(now)
+        }
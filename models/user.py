@@ -1,8 +1,13 @@
 from datetime import datetime
+from typing import Any, Mapping, Optional
 import re
 
+from models.clock import current_time
+
 
 class User:
+    __slots__ = ('id', 'username', 'email', 'role', 'registration_date')
+    
     def __init__(self, username: str, email: str, role: str) -> None:
         self.id = None  # Будет установлен при сохранении в БД
         self.username = username
@@ -11,10 +16,21 @@ class User:
         self.registration_date = datetime.now()
         
         # Валидация входных данных
-        self._validate_inputs()
+        self.validate()
+    
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "User":
+        """Создать пользователя из строки базы данных без повторной валидации"""
+        user = cls.__new__(cls)
+        user.id = row['id']
+        user.username = row['username']
+        user.email = row['email']
+        user.role = row['role']
+        user.registration_date = datetime.fromisoformat(row['registration_date'])
+        return user
     
-    def _validate_inputs(self) -> None:
-        """Проверка корректности входных данных"""
+    def validate(self) -> None:
+        """Проверить имя, email и роль пользователя"""
         if not self.username or not self.username.strip():
             raise ValueError("Имя пользователя не может быть пустым")
         
@@ -105,12 +121,13 @@ class User:
     def is_developer(self) -> bool:
         return self.role == 'developer'
     
-    def get_days_since_registration(self) -> int:
-        now = datetime.now()
+    def get_days_since_registration(self, now: Optional[datetime] = None) -> int:
+        if now is None:
+            now = current_time()
         delta = now - self.registration_date
         return delta.days
     
-    def to_dict(self) -> dict:
+    def to_dict(self, now: Optional[datetime] = None) -> dict:
         return {
             'id': self.id,
             'username': self.username,
@@ -120,7 +137,7 @@ class User:
             'is_admin': self.is_admin(),
             'is_manager': self.is_manager(),
             'is_developer': self.is_developer(),
-            'days_since_registration': self.get_days_since_registration()
+            'days_since_registration': self.get_days_since_registration(now)
         }
     
     def __str__(self) -> str:
@@ -2,12 +2,15 @@
 import pytest
 import tempfile
 import os
+import asyncio
 from datetime import datetime, timedelta
 
 from database.database_manager import DatabaseManager
 from controllers.task_controller import TaskController
 from controllers.project_controller import ProjectController
 from controllers.user_controller import UserController
+from controllers.async_controllers import AsyncTaskController, AsyncProjectController, AsyncUserController
+from database.async_database_manager import AsyncDatabaseManager
 
 
 class TestTaskControllerIntegration:
@@ -156,6 +159,29 @@ class TestTaskControllerIntegration:
         assert len(tasks) == 3
         assert all(task.title.startswith("Task") for task in tasks)
     
+    def test_get_tasks_page(self):
+        """Тест постраничного получения задач с курсором"""
+        due_date = datetime.now() + timedelta(days=7)
+        
+        for i in range(3):
+            self.task_controller.add_task(
+                title=f"Task {i}",
+                description=f"Description {i}",
+                priority=2,
+                due_date=due_date,
+                project_id=self.project.id,
+                assignee_id=self.user.id
+            )
+        
+        tasks, cursor = self.task_controller.get_tasks_page(page_size=2)
+        assert len(tasks) == 2
+        assert cursor == (tasks[-1].due_date, tasks[-1].id)
+        
+        # Последняя страница неполная, курсор следующей страницы отсутствует
+        tasks, cursor = self.task_controller.get_tasks_page(cursor, page_size=2)
+        assert [task.title for task in tasks] == ["Task 2"]
+        assert cursor is None
+    
     def test_update_task_success(self):
         """Тест успешного обновления задачи"""
         # Сначала добавляем задачу
@@ -296,6 +322,30 @@ class TestTaskControllerIntegration:
         assert len(tasks) == 1
         assert tasks[0].title == "Важная задача"
     
+    def test_iter_search_batches(self):
+        """Тест поиска задач пачками"""
+        due_date = datetime.now() + timedelta(days=7)
+        for i in range(5):
+            self.task_controller.add_task(
+                title=f"Отчет {i}",
+                description="Ежемесячный отчет",
+                priority=2,
+                due_date=due_date + timedelta(days=i),
+                project_id=self.project.id,
+                assignee_id=self.user.id
+            )
+        
+        # Первая пачка меньше остальных, чтобы результаты появлялись сразу
+        batches = list(self.task_controller.iter_search_batches("отч", batch_size=3, first_batch_size=1))
+        assert [len(batch) for batch in batches] == [1, 3, 1]
+        
+        # Порядок совпадает с search_tasks
+        found = [task.id for batch in batches for task in batch]
+        assert found == [task.id for task in self.task_controller.search_tasks("отч")]
+        
+        # Пустой запрос не выполняется
+        assert list(self.task_controller.iter_search_batches("  ")) == []
+    
     def test_update_task_status(self):
         """Тест обновления статуса задачи"""
         due_date = datetime.now() + timedelta(days=7)
@@ -1632,6 +1682,67 @@ class TestControllersEdgeCases:
         assert len(tasks_after) == 10 - deleted_count
 
 
+class TestAsyncControllers:
+    """Тесты асинхронных контроллеров"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+    
+    def test_crud_through_async_controllers(self):
+        """Создание и чтение сущностей через await"""
+        async def scenario():
+            async with AsyncDatabaseManager(self.temp_db.name) as db:
+                users = AsyncUserController(db)
+                projects = AsyncProjectController(db)
+                tasks = AsyncTaskController(db)
+                
+                user_id = await users.add_user("asyncuser", "async@example.com", "developer")
+                project_id = await projects.add_project(
+                    "Async Project", "Description",
+                    datetime.now() - timedelta(days=1), datetime.now() + timedelta(days=10)
+                )
+                task_id = await tasks.add_task(
+                    "Async Task", "Description", 1,
+                    datetime.now() + timedelta(days=2), project_id, user_id
+                )
+                
+                task = await tasks.get_task(task_id)
+                updated = await tasks.update_task_status(task_id, 'in_progress')
+                statistics = await tasks.get_task_statistics()
+                duplicate_id = await users.add_user("asyncuser", "other@example.com", "developer")
+                return task, updated, statistics, duplicate_id
+        
+        task, updated, statistics, duplicate_id = asyncio.run(scenario())
+        
+        assert task.title == "Async Task"
+        assert updated is True
+        assert statistics['total'] == 1
+        assert statistics['by_status'] == {'in_progress': 1}
+        assert duplicate_id == -1
+    
+    def test_concurrent_calls_with_workers(self):
+        """Параллельные вызовы через несколько потоков и пул соединений"""
+        async def scenario():
+            async with AsyncDatabaseManager(self.temp_db.name, max_workers=3) as db:
+                users = AsyncUserController(db)
+                await asyncio.gather(*[
+                    users.add_user(f"user{index}", f"user{index}@example.com", "developer")
+                    for index in range(10)
+                ])
+                results = await asyncio.gather(*[users.get_all_users() for _ in range(5)])
+                return [len(result) for result in results]
+        
+        assert asyncio.run(scenario()) == [10] * 5
+
+
 if __name__ == "__main__":
     # Запуск тестов
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -1,13 +1,19 @@
 import pytest
+import asyncio
 import tempfile
 import os
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from database.database_manager import DatabaseManager
+from database.async_database_manager import AsyncDatabaseManager
 from models.task import Task
 from models.project import Project
 from models.user import User
+from models.clock import current_time, frozen_time
 
 
 class TestDatabaseCreation:
@@ -501,6 +507,284 @@ class TestDatabaseCRUDOperations:
         assert len(tasks_user2) == 1
         assert tasks_user2[0].assignee_id == user2_id
 
+    def test_get_task_statistics_operation(self):
+        """Тест агрегированной статистики задач"""
+        assert self.db.get_task_statistics() == {
+            'total': 0, 'by_status': {}, 'by_priority': {}, 'overdue': 0
+        }
+        
+        user_id = self.db.add_user(User("statuser", "stat@example.com", "developer"))
+        project_id = self.db.add_project(Project(
+            "Stat Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        
+        due_date = datetime.now() + timedelta(days=2)
+        task_ids = [
+            self.db.add_task(Task(f"Task {priority}", "Desc", priority, due_date, project_id, user_id))
+            for priority in (1, 1, 2, 3)
+        ]
+        self.db.update_task(task_ids[1], status='completed')
+        self.db.update_task(task_ids[2], status='in_progress')
+        
+        # Относительно момента после срока все незавершенные задачи просрочены
+        stats = self.db.get_task_statistics(now=due_date + timedelta(days=1))
+        assert stats['total'] == 4
+        assert stats['by_status'] == {'pending': 2, 'completed': 1, 'in_progress': 1}
+        assert stats['by_priority'] == {'high': 2, 'medium': 1, 'low': 1}
+        assert stats['overdue'] == 3
+        
+        assert self.db.get_task_statistics()['overdue'] == 0
+    
+    def test_get_overdue_operations(self):
+        """Тест выборки просроченных задач и проектов"""
+        user_id = self.db.add_user(User("overdueuser", "overdue@example.com", "developer"))
+        project = Project("Overdue Project", "Description",
+                          datetime.now() - timedelta(days=10),
+                          datetime.now() + timedelta(days=5))
+        project_id = self.db.add_project(project)
+        done_project_id = self.db.add_project(Project(
+            "Done Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=1)
+        ))
+        self.db.update_project(done_project_id, status='completed')
+        
+        soon = datetime.now() + timedelta(days=1)
+        later = datetime.now() + timedelta(days=3)
+        soon_id = self.db.add_task(Task("Soon", "Desc", 1, soon, project_id, user_id))
+        later_id = self.db.add_task(Task("Later", "Desc", 2, later, project_id, user_id))
+        done_id = self.db.add_task(Task("Done", "Desc", 3, soon, project_id, user_id))
+        self.db.update_task(done_id, status='completed')
+        
+        assert self.db.get_overdue_tasks() == []
+        assert self.db.get_overdue_projects() == []
+        
+        now = datetime.now() + timedelta(days=4)
+        assert [task.id for task in self.db.get_overdue_tasks(now)] == [soon_id, later_id]
+        
+        now = datetime.now() + timedelta(days=10)
+        assert [p.id for p in self.db.get_overdue_projects(now)] == [project_id]
+    
+    def test_overdue_queries_use_partial_index(self):
+        """Тест использования частичных индексов запросами просроченных записей"""
+        plan = self.db.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE status != 'completed' AND due_date < ? ORDER BY due_date",
+            (datetime.now().isoformat(),)
+        ).fetchall()
+        assert 'idx_tasks_open_due_date' in ' '.join(row['detail'] for row in plan)
+        
+        plan = self.db.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM projects WHERE status != 'completed' AND end_date < ? ORDER BY end_date",
+            (datetime.now().isoformat(),)
+        ).fetchall()
+        assert 'idx_projects_open_end_date' in ' '.join(row['detail'] for row in plan)
+    
+    def test_get_task_table_operation(self):
+        """Тест загрузки задач в колоночную таблицу и статистики по ней"""
+        user_id = self.db.add_user(User("tableuser", "table@example.com", "developer"))
+        project_id = self.db.add_project(Project(
+            "Table Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        
+        due_date = datetime.now() + timedelta(days=2)
+        task_ids = [
+            self.db.add_task(Task(f"Task {i}", "Desc", i % 3 + 1, due_date, project_id, user_id))
+            for i in range(3)
+        ]
+        self.db.update_task(task_ids[0], status='completed')
+        
+        table = self.db.get_task_table()
+        assert list(table.ids) == task_ids
+        assert list(table.priorities) == [1, 2, 3]
+        assert len(self.db.get_task_table(project_id=project_id + 1)) == 0
+        
+        stats = self.db.get_project_statistics(project_id, now=due_date + timedelta(days=1))
+        assert stats == {
+            'total_tasks': 3,
+            'completed_tasks': 1,
+            'in_progress_tasks': 0,
+            'pending_tasks': 2,
+            'overdue_tasks': 2
+        }
+        assert self.db.get_user_statistics(user_id)['overdue_tasks'] == 0
+        assert self.db.get_project_statistics(999) == {}
+        assert self.db.get_user_statistics(999) == {}
+    
+    def test_reassign_tasks_operation(self):
+        """Тест переназначения всех задач пользователя одним запросом"""
+        user1_id = self.db.add_user(User("olduser", "old@example.com", "developer"))
+        user2_id = self.db.add_user(User("newuser", "new@example.com", "developer"))
+        user3_id = self.db.add_user(User("otheruser", "other@example.com", "developer"))
+        
+        project = Project("Reassign Project", "Project for reassign",
+                         datetime.now() - timedelta(days=10),
+                         datetime.now() + timedelta(days=30))
+        project_id = self.db.add_project(project)
+        
+        due_date = datetime.now() + timedelta(days=7)
+        for i in range(3):
+            self.db.add_task(Task(f"Old task {i}", "Description", 1, due_date, project_id, user1_id))
+        self.db.add_task(Task("Other task", "Description", 1, due_date, project_id, user3_id))
+        
+        count = self.db.reassign_tasks(user1_id, user2_id)
+        assert count == 3
+        
+        assert len(self.db.get_tasks_by_user(user1_id)) == 0
+        assert len(self.db.get_tasks_by_user(user2_id)) == 3
+        assert len(self.db.get_tasks_by_user(user3_id)) == 1
+        
+        # Повторное переназначение ничего не меняет
+        assert self.db.reassign_tasks(user1_id, user2_id) == 0
+
+    def test_write_without_existence_check_operation(self):
+        """Тест изменения без предварительного SELECT: отсутствие по rowcount, ссылки по внешним ключам"""
+        user_id = self.db.add_user(User("writeuser", "write@example.com", "developer"))
+        project_id = self.db.add_project(Project(
+            "Write Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        task_id = self.db.add_task(Task("Task", "Description", 1,
+                                        datetime.now() + timedelta(days=1), project_id, user_id))
+        
+        assert self.db.update_task(999, status='completed') is False
+        assert self.db.update_project(999, name="Missing") is False
+        assert self.db.update_user(999, role='admin') is False
+        
+        with pytest.raises(sqlite3.IntegrityError):
+            self.db.update_task(task_id, project_id=999)
+        with pytest.raises(sqlite3.IntegrityError):
+            self.db.add_task(Task("Orphan", "Description", 1,
+                                  datetime.now() + timedelta(days=1), project_id, 999))
+        
+        self.db.add_user(User("otheruser", "other@example.com", "developer"))
+        with pytest.raises(sqlite3.IntegrityError):
+            self.db.update_user(user_id, username="otheruser")
+        
+        assert self.db.get_task_by_id(task_id).project_id == project_id
+        assert self.db.update_task(task_id, status='completed') is True
+    
+    def test_read_historical_task_operation(self):
+        """Тест чтения задачи, срок которой уже прошел"""
+        user_id = self.db.add_user(User("histuser", "hist@example.com", "developer"))
+        project_id = self.db.add_project(Project(
+            "History Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        task_id = self.db.add_task(Task("Old task", "Description", 1,
+                                        datetime.now() + timedelta(days=1), project_id, user_id))
+        
+        past_date = datetime.now() - timedelta(days=5)
+        self.db.update_task(task_id, due_date=past_date)
+        
+        task = self.db.get_task_by_id(task_id)
+        assert task.due_date == past_date
+        assert task.is_overdue() is True
+        assert [t.id for t in self.db.get_all_tasks()] == [task_id]
+    
+    def test_get_all_tasks_with_names_operation(self):
+        """Тест получения задач вместе с названием проекта и именем исполнителя"""
+        user = User("joinuser", "join@example.com", "developer")
+        user_id = self.db.add_user(user)
+        
+        project = Project("Join Project", "Project for join",
+                         datetime.now() - timedelta(days=10),
+                         datetime.now() + timedelta(days=30))
+        project_id = self.db.add_project(project)
+        
+        task1 = Task("Later task", "Description", 1,
+                     datetime.now() + timedelta(days=7), project_id, user_id)
+        self.db.add_task(task1)
+        
+        task2 = Task("Earlier task", "Description", 2,
+                     datetime.now() + timedelta(days=3), project_id, user_id)
+        self.db.add_task(task2)
+        
+        rows = self.db.get_all_tasks_with_names()
+        assert len(rows) == 2
+        
+        # Порядок такой же, как у get_all_tasks (по сроку)
+        assert [task.id for task, _, _ in rows] == [task2.id, task1.id]
+        for task, project_name, assignee_name in rows:
+            assert project_name == "Join Project"
+            assert assignee_name == "joinuser"
+        
+        # Задача с несуществующими проектом и исполнителем возвращает None вместо имен
+        # (такие строки могли остаться в базах, созданных без проверки внешних ключей)
+        self.db.execute_query("PRAGMA foreign_keys = OFF")
+        self.db.execute_query("UPDATE tasks SET project_id = 999, assignee_id = 999 WHERE id = ?", (task1.id,))
+        rows = self.db.get_all_tasks_with_names()
+        orphan = [row for row in rows if row[0].id == task1.id][0]
+        assert orphan[1] is None
+        assert orphan[2] is None
+
+    def test_get_project_task_counts_operation(self):
+        """Тест подсчета задач по проектам одним запросом"""
+        user = User("countuser", "count@example.com", "developer")
+        user_id = self.db.add_user(user)
+        
+        project1 = Project("Count Project 1", "First project",
+                          datetime.now() - timedelta(days=10),
+                          datetime.now() + timedelta(days=30))
+        project1_id = self.db.add_project(project1)
+        
+        project2 = Project("Count Project 2", "Second project",
+                          datetime.now() - timedelta(days=10),
+                          datetime.now() + timedelta(days=30))
+        project2_id = self.db.add_project(project2)
+        
+        project3 = Project("Empty Project", "Project without tasks",
+                          datetime.now() - timedelta(days=10),
+                          datetime.now() + timedelta(days=30))
+        project3_id = self.db.add_project(project3)
+        
+        due_date = datetime.now() + timedelta(days=7)
+        ids = []
+        for i in range(4):
+            task = Task(f"Task {i}", "Description", 1, due_date, project1_id, user_id)
+            ids.append(self.db.add_task(task))
+        self.db.add_task(Task("Other task", "Description", 2, due_date, project2_id, user_id))
+        
+        self.db.update_task(ids[0], status='completed')
+        self.db.update_task(ids[1], status='in_progress')
+        # Просроченная задача и просроченная, но завершенная
+        past = datetime.now() - timedelta(days=1)
+        self.db.update_task(ids[2], due_date=past)
+        self.db.update_task(ids[0], due_date=past)
+        
+        counts = self.db.get_project_task_counts()
+        
+        assert counts[project1_id] == (4, 1, 1, 2, 1)
+        assert counts[project2_id] == (1, 0, 0, 1, 0)
+        assert project3_id not in counts
+    
+    def test_get_user_task_counts_operation(self):
+        """Тест подсчета задач по исполнителям одним запросом"""
+        user1_id = self.db.add_user(User("countuser1", "count1@example.com", "developer"))
+        user2_id = self.db.add_user(User("countuser2", "count2@example.com", "developer"))
+        user3_id = self.db.add_user(User("countuser3", "count3@example.com", "manager"))
+        project_id = self.db.add_project(Project(
+            "Count Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        
+        due_date = datetime.now() + timedelta(days=7)
+        for i in range(3):
+            self.db.add_task(Task(f"Task {i}", "Description", 1, due_date, project_id, user1_id))
+        self.db.add_task(Task("Other task", "Description", 2, due_date, project_id, user2_id))
+        
+        counts = self.db.get_user_task_counts()
+        
+        assert counts[user1_id] == 3
+        assert counts[user2_id] == 1
+        assert user3_id not in counts
+
 
 class TestDatabaseIntegrity:
     """Тесты целостности данных в базе данных"""
@@ -625,6 +909,33 @@ class TestDatabaseIntegrity:
         tasks_after = self.db.get_all_tasks()
         assert len(tasks_after) == 0
     
+    def test_foreign_keys_enabled_on_connect(self):
+        """Тест включения внешних ключей при подключении без ручного PRAGMA"""
+        db = DatabaseManager(self.db_path)
+        try:
+            assert db.execute_query("PRAGMA foreign_keys").fetchone()[0] == 1
+        finally:
+            db.close()
+    
+    def test_user_has_tasks_and_cascade(self):
+        """Тест проверки наличия задач у пользователя и каскадного удаления"""
+        user_id = self.db.add_user(User("existsuser", "exists@example.com", "developer"))
+        idle_id = self.db.add_user(User("idleuser", "idle@example.com", "developer"))
+        project_id = self.db.add_project(Project(
+            "Exists Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        self.db.add_task(Task("Task", "Description", 1,
+                              datetime.now() + timedelta(days=7), project_id, user_id))
+        
+        assert self.db.user_has_tasks(user_id) is True
+        assert self.db.user_has_tasks(idle_id) is False
+        
+        assert self.db.delete_user(user_id) is True
+        assert self.db.get_all_tasks() == []
+        assert self.db.user_has_tasks(user_id) is False
+    
     def test_check_constraints(self):
         """Тест проверочных ограничений (CHECK constraints)"""
         # Тест ограничения роли пользователя
@@ -749,6 +1060,906 @@ class TestDatabaseIntegrity:
         assert len(users) == 1
 
 
+class TestDatabaseTransactions:
+    """Тесты явных транзакций"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.db = DatabaseManager(self.db_path)
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        self.db.close()
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+    
+    def _count_users_from_other_connection(self):
+        """Количество пользователей, видимое из другого соединения"""
+        connection = sqlite3.connect(self.db_path)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        finally:
+            connection.close()
+    
+    def test_transaction_commit(self):
+        """Тест фиксации нескольких изменений одним commit"""
+        with self.db.transaction():
+            self.db.add_user(User("txuser1", "tx1@example.com", "developer"))
+            self.db.add_user(User("txuser2", "tx2@example.com", "developer"))
+            
+            # До выхода из блока изменения не видны другим соединениям
+            assert self.db.connection.in_transaction
+            assert self._count_users_from_other_connection() == 0
+        
+        assert not self.db.connection.in_transaction
+        assert self._count_users_from_other_connection() == 2
+    
+    def test_transaction_rollback(self):
+        """Тест отката транзакции при исключении"""
+        with pytest.raises(ValueError):
+            with self.db.transaction():
+                self.db.add_user(User("rollbackuser", "rollback@example.com", "developer"))
+                raise ValueError("Ошибка внутри транзакции")
+        
+        assert not self.db.connection.in_transaction
+        assert self._count_users_from_other_connection() == 0
+    
+    def test_nested_transaction_rollback(self):
+        """Тест отката только вложенного блока"""
+        with self.db.transaction():
+            self.db.add_user(User("outeruser", "outer@example.com", "developer"))
+            
+            try:
+                with self.db.transaction():
+                    self.db.add_user(User("inneruser", "inner@example.com", "developer"))
+                    raise ValueError("Ошибка во вложенном блоке")
+            except ValueError:
+                pass
+        
+        usernames = [row['username'] for row in
+                     self.db.execute_query("SELECT username FROM users").fetchall()]
+        assert usernames == ["outeruser"]
+    
+    def test_manual_commit_mode(self):
+        """Тест режима без автоматической фиксации"""
+        self.db.close()
+        self.db = DatabaseManager(self.db_path, autocommit=False)
+        
+        self.db.add_user(User("manualuser", "manual@example.com", "developer"))
+        assert self.db.connection.in_transaction
+        assert self._count_users_from_other_connection() == 0
+        
+        self.db.commit()
+        assert self._count_users_from_other_connection() == 1
+        
+        self.db.add_user(User("discarded", "discarded@example.com", "developer"))
+        self.db.rollback()
+        assert self._count_users_from_other_connection() == 1
+
+
+class TestDatabaseBulkInsert:
+    """Тесты пакетной вставки"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.db = DatabaseManager(self.db_path)
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        self.db.close()
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+    
+    def test_add_users_bulk(self):
+        """Тест пакетной вставки пользователей с ошибками в отдельных строках"""
+        self.db.add_user(User("existing", "existing@example.com", "developer"))
+        
+        users = [
+            User("bulk1", "bulk1@example.com", "developer"),
+            User("existing", "other@example.com", "developer"),   # Занятое имя
+            User("bulk2", "bulk2@example.com", "manager"),
+            User("bulk3", "bulk1@example.com", "admin"),           # Дубликат email внутри пакета
+        ]
+        
+        ids, errors = self.db.add_users_bulk(users)
+        
+        assert ids == [2, 3]
+        assert users[0].id == 2
+        assert users[2].id == 3
+        assert [index for index, _ in errors] == [1, 3]
+        
+        cursor = self.db.execute_query("SELECT username FROM users ORDER BY id")
+        assert [row['username'] for row in cursor.fetchall()] == ["existing", "bulk1", "bulk2"]
+    
+    def test_add_projects_bulk(self):
+        """Тест пакетной вставки проектов"""
+        projects = [
+            Project(f"Bulk Project {i}", "Description",
+                    datetime.now() - timedelta(days=10),
+                    datetime.now() + timedelta(days=30))
+            for i in range(3)
+        ]
+        projects[1].status = 'unknown'
+        
+        ids, errors = self.db.add_projects_bulk(projects)
+        
+        assert len(ids) == 2
+        assert ids == [projects[0].id, projects[2].id]
+        assert errors[0][0] == 1
+        assert len(self.db.get_all_projects()) == 2
+    
+    def test_add_tasks_bulk(self):
+        """Тест пакетной вставки задач с проверкой ссылок на проект и исполнителя"""
+        user_id = self.db.add_user(User("taskbulk", "taskbulk@example.com", "developer"))
+        project_id = self.db.add_project(Project(
+            "Task Bulk Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        
+        due_date = datetime.now() + timedelta(days=7)
+        tasks = [
+            Task(f"Bulk Task {i}", "Description", (i % 3) + 1, due_date, project_id, user_id)
+            for i in range(1000)
+        ]
+        tasks[10].project_id = 999
+        tasks[20].assignee_id = 999
+        tasks[30].priority = 5
+        
+        ids, errors = self.db.add_tasks_bulk(tasks)
+        
+        assert len(ids) == 997
+        assert [index for index, _ in errors] == [10, 20, 30]
+        assert tasks[10].id is None
+        assert tasks[999].id == ids[-1]
+        
+        stored = self.db.get_task_by_id(ids[-1])
+        assert stored.title == "Bulk Task 999"
+        
+        cursor = self.db.execute_query("SELECT COUNT(*) FROM tasks")
+        assert cursor.fetchone()[0] == 997
+    
+    def test_add_bulk_empty(self):
+        """Тест пакетной вставки пустого набора"""
+        assert self.db.add_tasks_bulk([]) == ([], [])
+        assert self.db.add_projects_bulk([]) == ([], [])
+        assert self.db.add_users_bulk([]) == ([], [])
+
+
+class TestDatabaseFullTextSearch:
+    """Тесты полнотекстового поиска задач"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.db = DatabaseManager(self.db_path)
+        
+        user_id = self.db.add_user(User("ftsuser", "fts@example.com", "developer"))
+        project_id = self.db.add_project(Project(
+            "FTS Project", "Project for search",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        
+        due_date = datetime.now() + timedelta(days=7)
+        self.task1 = Task("Отчет за квартал", "Подготовить отчет", 1, due_date, project_id, user_id)
+        self.task2 = Task("Созвон", "Обсудить отчетность", 2, due_date, project_id, user_id)
+        self.task3 = Task("Релиз", "Собрать сборку", 3, due_date, project_id, user_id)
+        for task in (self.task1, self.task2, self.task3):
+            self.db.add_task(task)
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        self.db.close()
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+    
+    def test_fts_index_created(self):
+        """Тест создания FTS индекса и триггеров"""
+        assert self.db.fts_enabled is True
+        
+        cursor = self.db.execute_query("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = {row['name'] for row in cursor.fetchall()}
+        assert {'tasks_fts_insert', 'tasks_fts_delete', 'tasks_fts_update'} <= triggers
+    
+    def test_prefix_search_and_ranking(self):
+        """Тест поиска по префиксу с ранжированием"""
+        tasks = self.db.search_tasks("отчет")
+        
+        # "отчетность" находится по префиксу, задача с двумя совпадениями идет первой
+        assert [task.id for task in tasks] == [self.task1.id, self.task2.id]
+        
+        # Несколько слов объединяются через AND
+        tasks = self.db.search_tasks("подготовить отч")
+        assert [task.id for task in tasks] == [self.task1.id]
+    
+    def test_search_limit(self):
+        """Тест ограничения количества результатов"""
+        assert len(self.db.search_tasks("отчет", limit=1)) == 1
+        assert len(self.db.search_tasks("отчет")) == 2
+    
+    def test_index_follows_updates_and_deletes(self):
+        """Тест синхронизации индекса при изменении и удалении задач"""
+        self.db.update_task(self.task3.id, title="Отчет о релизе")
+        assert self.task3.id in [task.id for task in self.db.search_tasks("релиз")]
+        assert len(self.db.search_tasks("отчет")) == 3
+        
+        self.db.delete_task(self.task1.id)
+        assert self.task1.id not in [task.id for task in self.db.search_tasks("отчет")]
+    
+    def test_existing_tasks_indexed_on_upgrade(self):
+        """Тест индексации задач, созданных до появления FTS индекса"""
+        self.db.execute_query("DROP TABLE tasks_fts")
+        self.db.close()
+        
+        self.db = DatabaseManager(self.db_path)
+        assert len(self.db.search_tasks("отчет")) == 2
+    
+    def test_prefix_index(self):
+        """Тест префиксного индекса для поиска по мере ввода"""
+        row = self.db.execute_query(
+            "SELECT sql FROM sqlite_master WHERE name = 'tasks_fts'"
+        ).fetchone()
+        assert "prefix='2 3'" in row['sql']
+        
+        # Двух- и трехсимвольные префиксы находят те же задачи, что и полное слово
+        assert [task.id for task in self.db.search_tasks("от")] == [self.task1.id, self.task2.id]
+        assert [task.id for task in self.db.search_tasks("рел")] == [self.task3.id]
+    
+    def test_index_without_prefix_rebuilt(self):
+        """Тест пересоздания индекса, созданного без префиксных термов"""
+        self.db.execute_query("DROP TABLE tasks_fts")
+        self.db.execute_query("""
+        CREATE VIRTUAL TABLE tasks_fts
+        USING fts5(title, description, content='tasks', content_rowid='id')
+        """)
+        self.db.close()
+        
+        self.db = DatabaseManager(self.db_path)
+        row = self.db.execute_query(
+            "SELECT sql FROM sqlite_master WHERE name = 'tasks_fts'"
+        ).fetchone()
+        assert "prefix" in row['sql']
+        assert len(self.db.search_tasks("отчет")) == 2
+    
+    def test_iter_search_tasks(self):
+        """Тест ленивого перебора результатов поиска"""
+        tasks = self.db.iter_search_tasks("отчет", batch_size=1)
+        assert next(tasks).id == self.task1.id
+        assert [task.id for task in tasks] == [self.task2.id]
+        
+        assert len(list(self.db.iter_search_tasks("отчет", limit=1))) == 1
+    
+    def test_like_fallback(self):
+        """Тест поиска подстроки без FTS5"""
+        self.db.fts_enabled = False
+        
+        # LIKE находит подстроку в середине слова
+        tasks = self.db.search_tasks("борк")
+        assert [task.id for task in tasks] == [self.task3.id]
+        assert len(self.db.search_tasks("Отчет", limit=1)) == 1
+
+
+class TestDatabasePagination:
+    """Тесты постраничной выборки по курсору"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.db = DatabaseManager(self.db_path)
+        
+        base = datetime.now() + timedelta(days=1)
+        self.users = [User(f"user{i}", f"user{i}@example.com", "developer") for i in (3, 1, 4, 2, 0)]
+        self.db.add_users_bulk(self.users)
+        self.projects = [
+            Project(f"Project {i}", "Description", base - timedelta(days=10), base + timedelta(days=i % 3))
+            for i in range(5)
+        ]
+        self.db.add_projects_bulk(self.projects)
+        
+        # Одинаковые сроки у нескольких задач проверяют разрешение по id
+        self.tasks = [
+            Task(f"Task {i}", "Description", 1, base + timedelta(days=i % 3),
+                 self.projects[0].id, self.users[0].id)
+            for i in range(7)
+        ]
+        self.db.add_tasks_bulk(self.tasks)
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        self.db.close()
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+    
+    def test_tasks_pages(self):
+        """Тест обхода задач по страницам"""
+        pages = []
+        after = None
+        while True:
+            page = self.db.get_tasks_page(after, page_size=3)
+            if not page:
+                break
+            pages.append(page)
+            after = (page[-1].due_date, page[-1].id)
+        
+        assert [len(page) for page in pages] == [3, 3, 1]
+        ids = [task.id for page in pages for task in page]
+        assert ids == [task.id for task in sorted(self.tasks, key=lambda t: (t.due_date, t.id))]
+    
+    def test_projects_pages(self):
+        """Тест обхода проектов по страницам"""
+        first = self.db.get_projects_page(page_size=2)
+        rest = self.db.get_projects_page((first[-1].end_date, first[-1].id), page_size=10)
+        
+        ids = [project.id for project in first + rest]
+        assert ids == [p.id for p in sorted(self.projects, key=lambda p: (p.end_date, p.id))]
+    
+    def test_users_pages(self):
+        """Тест обхода пользователей по страницам"""
+        first = self.db.get_users_page(page_size=2)
+        assert [user.username for user in first] == ["user0", "user1"]
+        
+        rest = self.db.get_users_page((first[-1].username, first[-1].id), page_size=10)
+        assert [user.username for user in rest] == ["user2", "user3", "user4"]
+    
+    def test_empty_page(self):
+        """Тест выборки после последней записи"""
+        last = self.db.get_users_page(page_size=10)[-1]
+        assert self.db.get_users_page((last.username, last.id)) == []
+
+
+class TestDatabaseStreaming:
+    """Тесты потокового обхода записей"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.db = DatabaseManager(self.db_path)
+        
+        self.users = [User(f"user{i}", f"user{i}@example.com", "developer") for i in range(2)]
+        self.db.add_users_bulk(self.users)
+        due_date = datetime.now() + timedelta(days=7)
+        self.project = Project("Stream Project", "Description",
+                               datetime.now() - timedelta(days=1), due_date)
+        self.db.add_project(self.project)
+        
+        self.tasks = [
+            Task(f"Task {i}", "Description", i % 3 + 1, due_date + timedelta(hours=i),
+                 self.project.id, self.users[i % 2].id)
+            for i in range(10)
+        ]
+        self.db.add_tasks_bulk(self.tasks)
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        self.db.close()
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+    
+    def test_iter_tasks_is_lazy(self):
+        """Тест ленивого чтения задач генератором"""
+        iterator = self.db.iter_tasks(batch_size=3)
+        assert next(iterator).title == "Task 0"
+        
+        remaining = list(iterator)
+        assert len(remaining) == 9
+    
+    def test_iter_tasks_matches_lists(self):
+        """Тест совпадения генератора со списочными методами"""
+        assert [t.id for t in self.db.iter_tasks(batch_size=4)] == [t.id for t in self.db.get_all_tasks()]
+        
+        by_project = self.db.iter_tasks(project_id=self.project.id, batch_size=4)
+        assert [t.id for t in by_project] == [t.id for t in self.db.get_tasks_by_project(self.project.id)]
+        
+        by_user = list(self.db.iter_tasks(assignee_id=self.users[1].id, batch_size=2))
+        assert len(by_user) == 5
+        assert all(task.assignee_id == self.users[1].id for task in by_user)
+        
+        both = list(self.db.iter_tasks(project_id=self.project.id, assignee_id=self.users[0].id))
+        assert len(both) == 5
+    
+    def test_iter_projects_and_users(self):
+        """Тест потокового обхода проектов и пользователей"""
+        assert [p.name for p in self.db.iter_projects(batch_size=1)] == ["Stream Project"]
+        assert [u.username for u in self.db.iter_users(batch_size=1)] == ["user0", "user1"]
+
+
+class TestDatabaseEntityCache:
+    """Тесты кэша сущностей"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.db = DatabaseManager(self.db_path, cache_size=2)
+        
+        self.user_id = self.db.add_user(User("cacheuser", "cache@example.com", "developer"))
+        self.project_id = self.db.add_project(Project(
+            "Cache Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+        self.task_id = self.db.add_task(Task(
+            "Cache Task", "Description", 1,
+            datetime.now() + timedelta(days=7), self.project_id, self.user_id
+        ))
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        self.db.close()
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+    
+    def test_repeated_lookup_hits_cache(self):
+        """Тест повторного получения сущности из кэша"""
+        project = self.db.get_project_by_id(self.project_id)
+        cached = self.db.get_project_by_id(self.project_id)
+        assert (cached.id, cached.name, cached.start_date) == (project.id, project.name, project.start_date)
+        assert self.db.cache_info() == {'hits': 1, 'misses': 1, 'size': 1, 'max_size': 2}
+        
+        # Несуществующие сущности не кэшируются
+        assert self.db.get_project_by_id(999) is None
+        assert self.db.cache_info()['size'] == 1
+    
+    def test_cached_entity_not_shared(self):
+        """Изменение полученной из кэша модели без записи в базу не видно следующим чтениям"""
+        task = self.db.get_task_by_id(self.task_id)
+        task.update_status("in_progress")
+        assert self.db.get_task_by_id(self.task_id).status == "pending"
+        
+        cached = self.db.get_task_by_id(self.task_id)
+        cached.update_status("completed")
+        assert self.db.get_task_by_id(self.task_id).status == "pending"
+        assert self.db.cache_info()['hits'] == 3
+    
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованной сущности"""
+        self.db.get_user_by_id(self.user_id)
+        self.db.get_project_by_id(self.project_id)
+        self.db.get_user_by_id(self.user_id)
+        self.db.get_task_by_id(self.task_id)
+        
+        assert self.db.cache_info()['size'] == 2
+        assert ('projects', self.project_id) not in self.db._cache
+        assert ('users', self.user_id) in self.db._cache
+    
+    def test_invalidation_on_writes(self):
+        """Тест сброса кэша при изменении и удалении"""
+        self.db.get_project_by_id(self.project_id)
+        self.db.update_project(self.project_id, name="Renamed")
+        assert self.db.get_project_by_id(self.project_id).name == "Renamed"
+        
+        self.db.get_task_by_id(self.task_id)
+        self.db.delete_task(self.task_id)
+        assert self.db.get_task_by_id(self.task_id) is None
+        
+        self.db.get_user_by_id(self.user_id)
+        self.db.delete_user(self.user_id)
+        assert self.db.get_user_by_id(self.user_id) is None
+    
+    def test_invalidation_on_rollback(self):
+        """Тест сброса кэша при откате транзакции"""
+        with pytest.raises(RuntimeError):
+            with self.db.transaction():
+                self.db.update_task(self.task_id, title="Temporary")
+                assert self.db.get_task_by_id(self.task_id).title == "Temporary"
+                raise RuntimeError("rollback")
+        
+        assert self.db.get_task_by_id(self.task_id).title == "Cache Task"
+    
+    def test_cache_disabled_by_default(self):
+        """Тест работы без кэша по умолчанию"""
+        db = DatabaseManager(self.db_path)
+        try:
+            assert db.get_user_by_id(self.user_id) is not db.get_user_by_id(self.user_id)
+            assert db.cache_info() == {'hits': 0, 'misses': 0, 'size': 0, 'max_size': 0}
+        finally:
+            db.close()
+
+
+class TestDatabasePragmaProfiles:
+    """Тесты профилей настроек соединения"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+    
+    def test_default_profile_keeps_sqlite_defaults(self):
+        """Без профиля настройки SQLite не меняются"""
+        db = DatabaseManager(self.db_path)
+        pragmas = db.get_pragmas()
+        db.close()
+        
+        assert db.pragmas == {}
+        assert pragmas['journal_mode'] == 'DELETE'
+        assert pragmas['foreign_keys'] is True
+    
+    def test_balanced_profile(self):
+        """Профиль balanced включает WAL и synchronous NORMAL"""
+        db = DatabaseManager(self.db_path, pragma_profile='balanced')
+        pragmas = db.get_pragmas()
+        db.add_user(User("walbalanced", "wal@example.com", "developer"))
+        db.close()
+        
+        assert pragmas['journal_mode'] == 'WAL'
+        assert pragmas['synchronous'] == 'NORMAL'
+        assert pragmas['temp_store'] == 'MEMORY'
+        assert pragmas['cache_size'] == DatabaseManager.PRAGMA_PROFILES['balanced']['cache_size']
+        assert pragmas['mmap_size'] == DatabaseManager.PRAGMA_PROFILES['balanced']['mmap_size']
+    
+    def test_profile_reapplied_on_reconnect(self):
+        """Профиль применяется при каждом подключении"""
+        db = DatabaseManager(self.db_path, pragma_profile='bulk_load')
+        db.close()
+        db.connect()
+        pragmas = db.get_pragmas()
+        db.close()
+        
+        assert pragmas['journal_mode'] == 'MEMORY'
+        assert pragmas['synchronous'] == 'OFF'
+    
+    def test_custom_profile(self):
+        """Профиль можно задать словарем настроек"""
+        db = DatabaseManager(self.db_path, pragma_profile={'synchronous': 'NORMAL', 'cache_size': -1000})
+        pragmas = db.get_pragmas()
+        db.close()
+        
+        assert pragmas['synchronous'] == 'NORMAL'
+        assert pragmas['cache_size'] == -1000
+    
+    def test_invalid_profile(self):
+        """Неизвестный профиль или настройка отклоняются"""
+        with pytest.raises(ValueError):
+            DatabaseManager(self.db_path, pragma_profile='unknown')
+        with pytest.raises(ValueError):
+            DatabaseManager(self.db_path, pragma_profile={'page_size': 4096})
+        with pytest.raises(ValueError):
+            DatabaseManager(self.db_path, pragma_profile={'synchronous': 'OFF; DROP TABLE tasks'})
+        # Проверку внешних ключей профиль отключить не может
+        with pytest.raises(ValueError, match="foreign_keys"):
+            DatabaseManager(self.db_path, pragma_profile={'foreign_keys': 0})
+
+
+class TestDatabaseConnectionPool:
+    """Тесты режима пула соединений"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+        self.db = DatabaseManager(self.db_path, pool_size=4, pool_timeout=0.2)
+        self.user_id = self.db.add_user(User("pooluser", "pool@example.com", "developer"))
+        self.project_id = self.db.add_project(Project(
+            "Pool Project", "Description",
+            datetime.now() - timedelta(days=10),
+            datetime.now() + timedelta(days=30)
+        ))
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        self.db.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+    
+    def _run_in_threads(self, target, count):
+        """Запустить target в count потоках и вернуть результаты"""
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            return list(executor.map(lambda index: target(index), range(count)))
+    
+    def test_pool_uses_wal_by_default(self):
+        """Пул по умолчанию работает с профилем balanced"""
+        assert self.db.pragma_profile == 'balanced'
+        assert self.db.get_pragmas()['journal_mode'] == 'WAL'
+    
+    def test_empty_profile_keeps_journal_mode(self):
+        """С пустым словарем настроек пул не переводит файл в WAL"""
+        path = self.db_path + '.plain'
+        try:
+            DatabaseManager(path).close()
+            plain_db = DatabaseManager(path, pragma_profile={}, pool_size=2)
+            assert plain_db.get_pragmas()['journal_mode'] == 'DELETE'
+            plain_db.close()
+        finally:
+            os.unlink(path)
+    
+    def test_threads_get_own_connections(self):
+        """Каждый поток получает свое соединение"""
+        def get_connection(index):
+            with self.db.checkout():
+                connection = self.db.connection
+                time.sleep(0.05)
+                return id(connection)
+        
+        connections = self._run_in_threads(get_connection, 3)
+        assert len(set(connections)) == 3
+        assert len(set(connections) | {id(self.db.connection)}) == 4
+    
+    def test_concurrent_writes(self):
+        """Записи из разных потоков выполняются по очереди без ошибок блокировки"""
+        def add_tasks(index):
+            with self.db.checkout():
+                for number in range(20):
+                    self.db.add_task(Task(
+                        f"Task {index}-{number}", "Description", 1,
+                        datetime.now() + timedelta(days=1), self.project_id, self.user_id
+                    ))
+                with self.db.transaction():
+                    self.db.update_task(1, priority=3)
+        
+        self._run_in_threads(add_tasks, 4)
+        assert len(self.db.get_all_tasks()) == 80
+    
+    def test_reader_not_blocked_by_writer(self):
+        """В WAL читатель видит зафиксированные данные, пока писатель держит транзакцию"""
+        writer_started = threading.Event()
+        reader_done = threading.Event()
+        
+        def write(index):
+            with self.db.checkout():
+                with self.db.transaction():
+                    self.db.add_user(User("pendinguser", "pending@example.com", "developer"))
+                    writer_started.set()
+                    reader_done.wait(2)
+        
+        def read(index):
+            writer_started.wait(2)
+            with self.db.checkout():
+                users = self.db.get_all_users()
+            reader_done.set()
+            return len(users)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            writer = executor.submit(write, 0)
+            reader = executor.submit(read, 1)
+            assert reader.result() == 1
+            writer.result()
+        
+        assert len(self.db.get_all_users()) == 2
+    
+    def test_checkout_returns_connection_to_pool(self):
+        """Соединение возвращается в пул после блока checkout"""
+        def use_connection(index):
+            with self.db.checkout():
+                self.db.get_all_users()
+        
+        self._run_in_threads(use_connection, 2)
+        info = self.db.pool_info()
+        assert info['size'] == 4
+        assert info['idle'] == info['open'] - 1
+    
+    def test_pool_exhausted(self):
+        """При исчерпании пула поток получает ошибку после ожидания"""
+        release = threading.Event()
+        acquired = threading.Barrier(4)
+        
+        def hold(index):
+            with self.db.checkout():
+                acquired.wait(2)
+                release.wait(2)
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            holders = [executor.submit(hold, index) for index in range(3)]
+            acquired.wait(2)
+            
+            errors = []
+            thread = threading.Thread(target=lambda: self._checkout_error(errors))
+            thread.start()
+            thread.join()
+            release.set()
+            for holder in holders:
+                holder.result()
+        
+        assert len(errors) == 1
+    
+    def _checkout_error(self, errors):
+        """Попытаться получить соединение и сохранить ошибку"""
+        try:
+            with self.db.checkout():
+                pass
+        except sqlite3.OperationalError as error:
+            errors.append(error)
+    
+    def test_connection_of_finished_thread_reclaimed(self):
+        """Соединение потока, завершившегося без checkout, возвращается в пул"""
+        self.db.close()
+        self.db = DatabaseManager(self.db_path, pool_size=2, pool_timeout=0.5)
+        
+        results = []
+        
+        def read():
+            try:
+                results.append(len(self.db.get_all_users()))
+            except sqlite3.OperationalError as error:
+                results.append(error)
+        
+        # Соединение главного потока занимает одно место, короткие потоки по очереди - второе
+        for _ in range(3):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+        
+        assert results == [1, 1, 1]
+        assert self.db.pool_info()['open'] == 2
+    
+    def _task_in_transaction(self, cached_db, commit):
+        """Изменить задачу в транзакции другого потока и вернуть название, прочитанное во время нее"""
+        task_id = cached_db.add_task(Task(
+            "Original", "Description", 1,
+            datetime.now() + timedelta(days=1), self.project_id, self.user_id
+        ))
+        changed = threading.Event()
+        read_done = threading.Event()
+        
+        def write():
+            with cached_db.checkout():
+                try:
+                    with cached_db.transaction():
+                        cached_db.update_task(task_id, title="uncommitted")
+                        assert cached_db.get_task_by_id(task_id).title == "uncommitted"
+                        changed.set()
+                        read_done.wait(2)
+                        if not commit:
+                            raise RuntimeError("rollback")
+                except RuntimeError:
+                    pass
+        
+        def read():
+            changed.wait(2)
+            with cached_db.checkout():
+                title = cached_db.get_task_by_id(task_id).title
+            read_done.set()
+            return title
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            writer = executor.submit(write)
+            title = executor.submit(read).result()
+            writer.result()
+        return task_id, title
+    
+    def test_cache_not_filled_inside_transaction(self):
+        """Незафиксированные изменения одного потока не попадают в общий кэш"""
+        cached_db = DatabaseManager(self.db_path, cache_size=10, pool_size=3)
+        try:
+            task_id, title = self._task_in_transaction(cached_db, commit=False)
+            assert title == "Original"
+            assert cached_db.get_task_by_id(task_id).title == "Original"
+        finally:
+            cached_db.close()
+    
+    def test_cache_invalidated_after_commit(self):
+        """Строка, закэшированная другим потоком до фиксации, удаляется из кэша при фиксации"""
+        cached_db = DatabaseManager(self.db_path, cache_size=10, pool_size=3)
+        try:
+            task_id, title = self._task_in_transaction(cached_db, commit=True)
+            assert title == "Original"
+            assert cached_db.get_task_by_id(task_id).title == "uncommitted"
+        finally:
+            cached_db.close()
+    
+    def test_memory_database_rejected(self):
+        """Пул с базой в памяти не создается: у каждого соединения была бы своя пустая база"""
+        with pytest.raises(ValueError, match="Пул соединений"):
+            DatabaseManager(':memory:', pool_size=2)
+        
+        # Без пула база в памяти работает как раньше
+        memory_db = DatabaseManager(':memory:')
+        assert memory_db.get_all_users() == []
+        memory_db.close()
+    
+    def test_close_and_reconnect(self):
+        """После close() пул открывает соединения заново"""
+        self.db.close()
+        assert self.db.connection is None
+        assert self.db.pool_info()['open'] == 0
+        
+        self.db.connect()
+        assert len(self.db.get_all_users()) == 1
+
+
+class TestAsyncDatabaseManager:
+    """Тесты асинхронного фасада базы данных"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+    
+    def teardown_method(self):
+        """Очистка после каждого теста"""
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+    
+    def test_methods_run_off_event_loop_thread(self):
+        """Запросы выполняются в потоке базы данных"""
+        async def scenario():
+            async with AsyncDatabaseManager(self.db_path) as db:
+                user_id = await db.add_user(User("asyncuser", "async@example.com", "developer"))
+                user = await db.get_user_by_id(user_id)
+                thread_name = await db.run(lambda: threading.current_thread().name)
+                return user, thread_name
+        
+        user, thread_name = asyncio.run(scenario())
+        assert user.username == "asyncuser"
+        assert thread_name.startswith('db')
+    
+    def test_run_in_transaction_rolls_back(self):
+        """Ошибка внутри run_in_transaction откатывает все изменения"""
+        def add_two_users(db):
+            db.add_user(User("first", "first@example.com", "developer"))
+            db.add_user(User("first", "second@example.com", "developer"))
+        
+        async def scenario():
+            async with AsyncDatabaseManager(self.db_path) as db:
+                with pytest.raises(sqlite3.IntegrityError):
+                    await db.run_in_transaction(add_two_users)
+                return await db.get_all_users()
+        
+        assert asyncio.run(scenario()) == []
+    
+    def test_frozen_time_reaches_worker_thread(self):
+        """frozen_time() действует на запросы, выполняемые в потоке"""
+        moment = datetime(2030, 1, 1)
+        
+        async def scenario():
+            async with AsyncDatabaseManager(self.db_path) as db:
+                with frozen_time(moment):
+                    return await db.run(current_time)
+        
+        assert asyncio.run(scenario()) == moment
+    
+    def test_execute_fetchall(self):
+        """Строки произвольного запроса читаются в потоке базы данных, а не через курсор"""
+        async def scenario():
+            async with AsyncDatabaseManager(self.db_path) as db:
+                await db.add_user(User("rowuser", "row@example.com", "developer"))
+                with pytest.raises(AttributeError):
+                    db.execute_query
+                return await db.execute_fetchall("SELECT username FROM users WHERE role = ?", ("developer",))
+        
+        rows = asyncio.run(scenario())
+        assert [row['username'] for row in rows] == ["rowuser"]
+    
+    def test_memory_database_with_workers_rejected(self):
+        """Несколько потоков не могут работать с одной базой в памяти"""
+        with pytest.raises(ValueError):
+            AsyncDatabaseManager(':memory:', max_workers=2)
+        
+        async def scenario():
+            async with AsyncDatabaseManager(':memory:') as db:
+                await db.add_user(User("memuser", "mem@example.com", "developer"))
+                return await db.get_all_users()
+        
+        assert [user.username for user in asyncio.run(scenario())] == ["memuser"]
+    
+    def test_unsupported_method(self):
+        """Генераторы и контекстные менеджеры недоступны через фасад"""
+        async def scenario():
+            async with AsyncDatabaseManager(self.db_path) as db:
+                with pytest.raises(AttributeError):
+                    db.iter_tasks
+        
+        asyncio.run(scenario())
+
+
 class TestDatabaseStatistics:
     """Тесты статистических операций в базе данных"""
     
@@ -6,6 +6,9 @@ from datetime import datetime, timedelta
 from models.task import Task
 from models.project import Project
 from models.user import User
+from models.task_table import TaskTable, to_epoch
+from models.filter_index import FilterIndex
+from models.clock import current_time, frozen_time
 from database.database_manager import DatabaseManager
 
 
@@ -108,6 +111,21 @@ class TestTaskModel:
         assert result is True
         assert task.status == "completed"
     
+    def test_task_validate_without_date_rule(self):
+        """validate() проверяет поля, но допускает срок в прошлом"""
+        task = Task("Тест", "Описание", 1, datetime.now() + timedelta(days=7), 1, 100)
+        task.due_date = datetime.now() - timedelta(days=7)
+        task.validate()
+        
+        task.status = "unknown"
+        with pytest.raises(ValueError, match="Недопустимый статус"):
+            task.validate()
+        
+        task.status = "pending"
+        task.due_date = "2024-01-01"
+        with pytest.raises(TypeError, match="due_date должен быть объектом datetime"):
+            task.validate()
+    
     def test_task_update_status_invalid(self):
         """Тест обновления статуса с невалидным значением"""
         due_date = datetime.now() + timedelta(days=7)
@@ -170,6 +188,35 @@ class TestTaskModel:
         
         assert task.is_overdue() is False
     
+    def test_task_from_row_skips_validation(self):
+        """Тест создания задачи из строки БД без валидации"""
+        past_date = datetime.now() - timedelta(days=3)
+        row = {
+            'id': 7,
+            'title': "Историческая задача",
+            'description': "Описание",
+            'priority': 2,
+            'status': 'in_progress',
+            'due_date': past_date.isoformat(),
+            'project_id': 1,
+            'assignee_id': 100
+        }
+        
+        task = Task.from_row(row)
+        
+        assert task.id == 7
+        assert task.status == 'in_progress'
+        assert task.due_date == past_date
+        assert task.is_overdue() is True
+    
+    def test_task_slots(self):
+        """Тест компактного представления задачи без __dict__"""
+        task = Task("Тест", "Описание", 1, datetime.now() + timedelta(days=1), 1, 100)
+        
+        assert not hasattr(task, '__dict__')
+        with pytest.raises(AttributeError):
+            task.unknown_field = 1
+    
     def test_task_to_dict(self):
         """Тест преобразования задачи в словарь"""
         due_date = datetime.now() + timedelta(days=7)
@@ -394,6 +441,34 @@ class TestProjectModel:
         
         assert project.is_overdue() is False
     
+    def test_project_from_row_skips_validation(self):
+        """Тест создания проекта из строки БД без валидации"""
+        # Дата начала в будущем отклоняется конструктором, но допустима для сохраненных данных
+        start_date = datetime.now() + timedelta(days=5)
+        end_date = start_date + timedelta(days=30)
+        row = {
+            'id': 3,
+            'name': "Будущий проект",
+            'description': "Описание",
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'status': 'on_hold'
+        }
+        
+        project = Project.from_row(row)
+        
+        assert project.id == 3
+        assert project.status == 'on_hold'
+        assert project.start_date == start_date
+        assert project.end_date == end_date
+    
+    def test_project_slots(self):
+        """Тест компактного представления проекта без __dict__"""
+        start_date = datetime.now() - timedelta(days=1)
+        project = Project("Проект", "Описание", start_date, start_date + timedelta(days=10))
+        
+        assert not hasattr(project, '__dict__')
+    
     def test_project_to_dict(self):
         """Тест преобразования проекта в словарь"""
         start_date = datetime.now() - timedelta(days=10)
@@ -616,6 +691,30 @@ class TestUserModel:
         assert isinstance(days, int)
         assert days == 10
     
+    def test_user_from_row(self):
+        """Тест создания пользователя из строки БД"""
+        registration_date = datetime.now() - timedelta(days=10)
+        row = {
+            'id': 4,
+            'username': "testuser",
+            'email': "test@example.com",
+            'role': "manager",
+            'registration_date': registration_date.isoformat()
+        }
+        
+        user = User.from_row(row)
+        
+        assert user.id == 4
+        assert user.is_manager() is True
+        assert user.registration_date == registration_date
+        assert user.get_days_since_registration() == 10
+    
+    def test_user_slots(self):
+        """Тест компактного представления пользователя без __dict__"""
+        user = User("testuser", "test@example.com", "developer")
+        
+        assert not hasattr(user, '__dict__')
+    
     def test_user_to_dict(self):
         """Тест преобразования пользователя в словарь"""
         user = User.__new__(User)
@@ -665,6 +764,187 @@ class TestUserModel:
         assert "username='testuser'" in repr_str
 
 
+class TestTaskTable:
+    """Тесты колоночной таблицы задач"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.now = datetime(2024, 6, 1, 12, 0)
+        past = to_epoch(self.now - timedelta(days=1))
+        future = to_epoch(self.now + timedelta(days=1))
+        self.table = TaskTable.from_rows([
+            (1, 1, 'pending', past, 10, 100),
+            (2, 2, 'in_progress', future, 10, 100),
+            (3, 3, 'completed', past, 10, 200),
+            (4, 1, 'pending', future, 20, 200),
+            (5, 1, 'in_progress', past, 20, 100),
+        ])
+    
+    def test_columns_are_typed_arrays(self):
+        """Тест хранения колонок в типизированных массивах"""
+        assert len(self.table) == 5
+        assert self.table.ids.typecode == 'i'
+        assert self.table.due_dates.typecode == 'q'
+        assert list(self.table.statuses) == [0, 1, 2, 0, 1]
+    
+    def test_count_by_status_and_overdue(self):
+        """Тест подсчета по статусам и просроченных задач"""
+        assert self.table.count_by_status() == {'pending': 2, 'in_progress': 2, 'completed': 1}
+        
+        # Завершенная задача с прошедшим сроком не считается просроченной
+        assert self.table.count_overdue(self.now) == 2
+        assert self.table.count_overdue(self.now + timedelta(days=2)) == 4
+    
+    def test_filter(self):
+        """Тест фильтрации по колонкам"""
+        project = self.table.filter(project_ids=10)
+        assert list(project.ids) == [1, 2, 3]
+        
+        pending = self.table.filter(status='pending', assignee_ids=200)
+        assert list(pending.ids) == [4]
+        
+        assert len(self.table.filter()) == 5
+        with pytest.raises(ValueError):
+            self.table.filter(unknown=1)
+    
+    def test_group_count(self):
+        """Тест группировки по колонке"""
+        assert self.table.group_count('priorities') == {1: 3, 2: 1, 3: 1}
+        assert self.table.group_count('project_ids') == {10: 3, 20: 2}
+    
+    def test_summary(self):
+        """Тест сводки в формате статистики проекта"""
+        assert self.table.filter(assignee_ids=100).summary(self.now) == {
+            'total_tasks': 3,
+            'completed_tasks': 0,
+            'in_progress_tasks': 2,
+            'pending_tasks': 1,
+            'overdue_tasks': 2
+        }
+        assert TaskTable().summary(self.now)['total_tasks'] == 0
+
+
+class TestFilterIndex:
+    """Тесты индекса для фильтрации загруженных сущностей"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        now = datetime.now()
+        self.tasks = []
+        for task_id, priority, status, days, assignee_id in [
+            (1, 1, 'pending', 3, 100),
+            (2, 2, 'in_progress', 1, 100),
+            (3, 1, 'completed', 2, 200),
+            (4, 1, 'pending', 5, 200),
+            (5, 3, 'pending', 4, 100),
+        ]:
+            self.tasks.append(Task.from_row({
+                'id': task_id, 'title': f"Task {task_id}", 'description': "Description",
+                'priority': priority, 'status': status, 'due_date': (now + timedelta(days=days)).isoformat(),
+                'project_id': 10, 'assignee_id': assignee_id
+            }))
+        
+        self.index = FilterIndex(
+            self.tasks,
+            {'status': lambda task: task.status, 'priority': lambda task: task.priority,
+             'assignee_id': lambda task: task.assignee_id},
+            {'due_date': lambda task: (task.due_date, task.id), 'id_desc': lambda task: -task.id}
+        )
+    
+    def test_without_filters_returns_sorted(self):
+        """Без условий возвращается порядок сортировки"""
+        assert [task.id for task in self.index.filter('due_date')] == [2, 3, 1, 5, 4]
+        assert [task.id for task in self.index.filter('id_desc')] == [5, 4, 3, 2, 1]
+        assert [task.id for task in self.index.filter(status=None)] == [2, 3, 1, 5, 4]
+        assert self.index.count() == 5
+    
+    def test_combined_filters(self):
+        """Несколько условий дают пересечение групп в порядке сортировки"""
+        assert [task.id for task in self.index.filter('due_date', status='pending')] == [1, 5, 4]
+        assert [task.id for task in self.index.filter('due_date', status='pending', priority=1)] == [1, 4]
+        assert [task.id for task in self.index.filter('id_desc', status='pending', assignee_id=100)] == [5, 1]
+        assert self.index.count(status='pending', priority=1, assignee_id=200) == 1
+    
+    def test_missing_value_and_unknown_field(self):
+        """Отсутствующее значение дает пустой результат, неизвестное поле - ошибку"""
+        assert self.index.filter(status='archived') == []
+        with pytest.raises(ValueError):
+            self.index.filter(title="Task 1")
+    
+    def test_update_and_remove(self):
+        """Изменение и удаление сущности обновляют группы и порядок без перестроения"""
+        # Задача 4 становится самой ранней и переходит в другой статус
+        changed = Task.from_row({
+            'id': 4, 'title': "Task 4", 'description': "Description", 'priority': 1,
+            'status': 'completed', 'due_date': datetime.now().isoformat(),
+            'project_id': 10, 'assignee_id': 200
+        })
+        self.index.filter('due_date', status='pending')
+        self.index.update(changed)
+        
+        assert [task.id for task in self.index.filter('due_date')] == [4, 2, 3, 1, 5]
+        assert [task.id for task in self.index.filter('due_date', status='pending')] == [1, 5]
+        assert [task.id for task in self.index.filter('due_date', status='completed')] == [4, 3]
+        assert self.index.filter('due_date')[0] is changed
+        
+        self.index.remove(2)
+        assert [task.id for task in self.index.filter('due_date', assignee_id=100)] == [1, 5]
+        assert len(self.index) == 4
+
+
+class TestReferenceTime:
+    """Тесты вычислений относительно явного или зафиксированного времени"""
+    
+    def test_explicit_now(self):
+        """Тест передачи момента времени в методы моделей"""
+        start_date = datetime.now() - timedelta(days=10)
+        project = Project("Проект", "Описание", start_date, start_date + timedelta(days=20))
+        task = Task("Задача", "Описание", 1, datetime.now() + timedelta(days=1), 1, 100)
+        user = User("testuser", "test@example.com", "developer")
+        
+        later = datetime.now() + timedelta(days=30)
+        assert task.is_overdue(later) is True
+        assert task.is_overdue() is False
+        assert project.is_overdue(later) is True
+        assert project.get_progress(start_date + timedelta(days=5)) == pytest.approx(0.25)
+        assert user.get_days_since_registration(user.registration_date + timedelta(days=3)) == 3
+        assert task.to_dict(later)['is_overdue'] is True
+        assert project.to_dict(later)['progress'] == 1.0
+    
+    def test_frozen_time(self):
+        """Тест фиксации времени на время блока"""
+        moment = datetime(2030, 1, 1, 12, 0)
+        task = Task("Задача", "Описание", 1, datetime.now() + timedelta(days=1), 1, 100)
+        
+        with frozen_time(moment) as now:
+            assert now == moment
+            assert current_time() == moment
+            assert task.is_overdue() is True
+            
+            # Вложенный блок переопределяет время только внутри себя
+            with frozen_time(datetime(2000, 1, 1)):
+                assert task.is_overdue() is False
+            assert current_time() == moment
+        
+        assert current_time() != moment
+        assert task.is_overdue() is False
+    
+    def test_frozen_time_decorator(self):
+        """Тест использования frozen_time как декоратора"""
+        @frozen_time()
+        def snapshot():
+            return current_time(), current_time()
+        
+        first, second = snapshot()
+        assert first == second
+        assert snapshot()[0] >= first
+        
+        # Внутри внешнего блока декорированная функция использует его момент
+        moment = datetime(2000, 1, 1)
+        with frozen_time(moment):
+            assert snapshot() == (moment, moment)
+
+
 class TestIntegrationModels:
     """Интеграционные тесты моделей с базой данных"""
     
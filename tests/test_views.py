@@ -0,0 +1,406 @@
+import importlib.util
+import os
+import threading
+import time
+import tkinter.ttk
+import types
+from unittest import mock
+
+from views.background_loader import BackgroundLoader
+from views.debouncer import Debouncer
+
+
+class FakeWidget:
+    """Замена виджета Tk: after() ставит вызов в очередь, run() выполняет очередь"""
+    
+    def __init__(self):
+        self.pending = []
+        self.counter = 0
+    
+    def after(self, delay, callback, *args):
+        self.counter += 1
+        after_id = f"after#{self.counter}"
+        self.pending.append((after_id, callback, args))
+        return after_id
+    
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+    
+    def after_cancel(self, after_id):
+        self.pending = [item for item in self.pending if item[0] != after_id]
+    
+    def run(self, until=lambda: False, timeout=2.0):
+        """Выполнять запланированные вызовы, пока очередь не опустеет или не выполнится условие"""
+        deadline = time.monotonic() + timeout
+        while self.pending and not until() and time.monotonic() < deadline:
+            _, callback, args = self.pending.pop(0)
+            callback(*args)
+            time.sleep(0.001)
+
+
+class TestBackgroundLoader:
+    """Тесты фоновой загрузки с передачей результатов через after()"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.widget = FakeWidget()
+        self.progress = []
+        self.results = []
+        self.errors = []
+    
+    def _loader(self, max_workers=0):
+        return BackgroundLoader(self.widget, max_workers=max_workers, on_progress=self.progress.append)
+    
+    def test_result_delivered_through_after(self):
+        """Результат передается в on_done только при опросе очереди"""
+        loader = self._loader()
+        loader.submit('tasks', lambda: [1, 2, 3], self.results.append, self.errors.append, description="задачи")
+        
+        assert self.results == []
+        assert self.progress == [["задачи"]]
+        
+        self.widget.run()
+        assert self.results == [[1, 2, 3]]
+        assert self.errors == []
+        assert self.progress[-1] == []
+    
+    def test_superseded_result_discarded(self):
+        """Результат загрузки, замененной более новой с тем же ключом, отбрасывается"""
+        loader = self._loader(max_workers=2)
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow_load():
+            started.set()
+            release.wait(2)
+            return "old"
+        
+        first = loader.submit('tasks', slow_load, self.results.append, self.errors.append)
+        started.wait(2)
+        second = loader.submit('tasks', lambda: "new", self.results.append, self.errors.append)
+        release.set()
+        
+        assert not loader.is_current('tasks', first)
+        self.widget.run(until=lambda: bool(self.results))
+        time.sleep(0.05)
+        self.widget.run()
+        
+        assert self.results == ["new"]
+        assert not loader.is_current('tasks', second)
+        loader.shutdown()
+    
+    def test_cancel(self):
+        """Отмененная загрузка не вызывает обработчиков и не считается активной"""
+        loader = self._loader()
+        idle = []
+        loader.submit('tasks', lambda: "result", self.results.append, self.errors.append)
+        loader.notify_when_idle(lambda: idle.append(True))
+        
+        loader.cancel('tasks')
+        assert idle == [True]
+        
+        self.widget.run()
+        assert self.results == []
+        assert self.errors == []
+    
+    def test_notify_when_idle(self):
+        """Уведомление приходит после завершения всех загрузок"""
+        loader = self._loader()
+        idle = []
+        
+        # Без загрузок уведомление приходит сразу
+        loader.notify_when_idle(lambda: idle.append("now"))
+        assert idle == ["now"]
+        
+        loader.submit('tasks', lambda: 1, self.results.append, self.errors.append)
+        loader.submit('users', lambda: 2, self.results.append, self.errors.append)
+        loader.notify_when_idle(lambda: idle.append(len(self.results)))
+        assert idle == ["now"]
+        
+        self.widget.run()
+        assert idle == ["now", 2]
+    
+    def test_errors_passed_to_on_error(self):
+        """Ошибки загрузки и обработчика результата передаются в on_error"""
+        loader = self._loader()
+        
+        def failing_load():
+            raise ValueError("load")
+        
+        def failing_handler(result):
+            raise ValueError("handler")
+        
+        loader.submit('tasks', failing_load, self.results.append, self.errors.append)
+        loader.submit('users', lambda: 1, failing_handler, self.errors.append)
+        self.widget.run()
+        
+        assert sorted(str(error) for error in self.errors) == ["handler", "load"]
+        assert self.progress[-1] == []
+    
+    def test_stream_batches(self):
+        """Пачки потоковой загрузки передаются по одной, в конце вызывается on_done"""
+        for max_workers in (0, 1):
+            self.results = []
+            done = []
+            loader = self._loader(max_workers)
+            loader.submit_stream('search', lambda: iter([[1], [2, 3]]), self.results.append,
+                                 self.errors.append, on_done=lambda: done.append(True))
+            self.widget.run(until=lambda: bool(done))
+            
+            assert self.results == [[1], [2, 3]]
+            assert done == [True]
+            loader.shutdown()
+    
+    def test_superseded_stream_stops(self):
+        """Замененная потоковая загрузка прекращает чтение пачек"""
+        loader = self._loader()
+        closed = []
+        
+        def batches(name):
+            try:
+                for number in range(50):
+                    yield [f"{name}{number}"]
+            finally:
+                closed.append(name)
+        
+        done = []
+        loader.submit_stream('search', lambda: batches("a"), self.results.append, self.errors.append,
+                             on_done=lambda: done.append("a"))
+        self.widget.run(until=lambda: len(self.results) >= 2)
+        loader.submit_stream('search', lambda: batches("b"), self.results.append, self.errors.append,
+                             on_done=lambda: done.append("b"))
+        self.widget.run()
+        
+        assert done == ["b"]
+        assert closed == ["a", "b"]
+        assert len([batch for batch in self.results if batch[0].startswith("a")]) < 50
+        assert self.results[-1] == ["b49"]
+
+
+class FakeTreeview:
+    """Замена ttk.Treeview: элементы, их порядок и выделение хранятся в обычных списках"""
+    
+    def __init__(self, master=None, **options):
+        self.options = options
+        self.values = {}
+        self.order = []
+        self.selected = []
+        self.focused = ''
+        self.inserted = 0
+    
+    def cget(self, name):
+        return self.options[name]
+    
+    def bind(self, sequence, callback):
+        pass
+    
+    def configure(self, cnf=None, **options):
+        self.options.update(options)
+    
+    def get_children(self, item=''):
+        return tuple(self.order)
+    
+    def insert(self, parent, index, iid, values):
+        self.inserted += 1
+        self.order.insert(index, iid)
+        self.values[iid] = tuple(values)
+        return iid
+    
+    def delete(self, *items):
+        for iid in items:
+            self.order.remove(iid)
+            del self.values[iid]
+        self.selected = [iid for iid in self.selected if iid not in items]
+    
+    def item(self, iid, values=None):
+        if values is not None:
+            self.values[iid] = tuple(values)
+        return {'values': list(self.values[iid])}
+    
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+    
+    def selection(self):
+        return tuple(self.selected)
+    
+    def selection_set(self, items):
+        self.selected = list(items)
+    
+    def focus(self, iid=None):
+        if iid is None:
+            return self.focused
+        self.focused = iid
+    
+    def yview_moveto(self, fraction):
+        pass
+
+
+def load_virtual_treeview():
+    """Загрузить VirtualTreeview, унаследованный от FakeTreeview вместо ttk.Treeview"""
+    path = os.path.join(os.path.dirname(__file__), '..', 'views', 'virtual_treeview.py')
+    spec = importlib.util.spec_from_file_location('stub_virtual_treeview', path)
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.object(tkinter, 'ttk', types.SimpleNamespace(Treeview=FakeTreeview)):
+        spec.loader.exec_module(module)
+    return module.VirtualTreeview
+
+
+class TestVirtualTreeview:
+    """Тесты виртуального списка на заглушке Treeview"""
+    
+    VirtualTreeview = load_virtual_treeview()
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.tree = self.VirtualTreeview(None, columns=('id', 'name'), height=5)
+        self.rows = [types.SimpleNamespace(id=number, name=f"row{number}") for number in range(100)]
+        self.formatted = []
+    
+    def format_row(self, row):
+        self.formatted.append(row.id)
+        return (row.id, row.name)
+    
+    def test_elements_only_for_window(self):
+        """Элементы создаются только для видимых строк и запаса, строки форматируются при показе"""
+        self.tree.set_rows(self.rows, self.format_row)
+        
+        assert self.tree.get_children() == tuple(str(number) for number in range(10))
+        assert sorted(self.formatted) == list(range(10))
+        assert self.tree.row_count() == 100
+        
+        self.tree.yview('scroll', 20, 'units')
+        assert self.tree.get_children() == tuple(str(number) for number in range(20, 30))
+        assert self.tree.item('25')['values'] == [25, "row25"]
+        assert self.tree.yview() == (0.2, 0.25)
+        
+        # Прокрутка за конец списка останавливается на последнем полном окне
+        self.tree.yview_moveto(1.0)
+        assert self.tree.get_children()[-1] == '99'
+    
+    def test_apply_window_changes_only_differing_rows(self):
+        """Повторный показ тех же строк не пересоздает элементы, измененная строка обновляется"""
+        rows = [(number, f"row{number}") for number in range(20)]
+        self.tree.set_rows(rows)
+        inserted = self.tree.inserted
+        
+        rows = list(rows)
+        rows[3] = (3, "changed")
+        self.tree.set_rows(rows)
+        
+        assert self.tree.inserted == inserted
+        assert self.tree.item('3')['values'] == [3, "changed"]
+        
+        # Перестановка строк перемещает элементы, а не создает новые
+        self.tree.set_rows(list(reversed(rows[:10])))
+        assert self.tree.get_children() == tuple(str(number) for number in range(9, -1, -1))
+        assert self.tree.inserted == inserted
+    
+    def test_page_source(self):
+        """Страницы подгружаются по мере прокрутки, пока источник их возвращает"""
+        requested = []
+        
+        def fetch_page(cursor):
+            requested.append(cursor)
+            start = cursor or 0
+            rows = self.rows[start:min(start + 10, 35)]
+            return rows, (start + 10 if start + 10 < 35 else None)
+        
+        self.tree.set_page_source(fetch_page, self.format_row)
+        # Окно с запасом занимает 10 строк, поэтому загружены две страницы
+        assert requested == [None, 10]
+        assert self.tree.row_count() == 20
+        
+        self.tree.yview('scroll', 20, 'units')
+        assert requested == [None, 10, 20, 30]
+        assert self.tree.row_count() == 35
+        assert self.tree.get_children() == tuple(str(number) for number in range(20, 30))
+        
+        self.tree.yview_moveto(1.0)
+        assert requested == [None, 10, 20, 30]
+        assert self.tree.get_children()[-1] == '34'
+    
+    def test_update_and_remove_row(self):
+        """update_row и remove_row меняют одну строку по id без повторной передачи списка"""
+        self.tree.set_rows(list(self.rows), self.format_row)
+        self.tree.update_row(types.SimpleNamespace(id=4, name="renamed"))
+        assert self.tree.item('4')['values'] == [4, "renamed"]
+        assert self.tree.row_values(4) == (4, "renamed")
+        
+        self.tree.remove_row(4)
+        assert '4' not in self.tree.get_children()
+        assert self.tree.row_values(4) is None
+        assert self.tree.row_count() == 99
+        
+        # Удаление строки выше окна не сдвигает видимые строки
+        self.tree.yview('scroll', 30, 'units')
+        top = self.tree.get_children()[0]
+        self.tree.remove_row(0)
+        assert self.tree.get_children()[0] == top
+    
+    def test_set_rows_keeps_anchor(self):
+        """Вставка строк выше окна не сдвигает верхнюю видимую строку"""
+        self.tree.set_rows(list(self.rows), self.format_row)
+        self.tree.yview('scroll', 40, 'units')
+        assert self.tree.get_children()[0] == '40'
+        
+        extra = [types.SimpleNamespace(id=number, name="new") for number in range(100, 103)]
+        self.tree.set_rows(extra + self.rows, self.format_row)
+        assert self.tree.get_children()[0] == '40'
+    
+    def test_selection_kept_off_screen(self):
+        """Выделение хранится по id и переживает прокрутку; щелчок по другой строке его заменяет"""
+        self.tree.set_rows(self.rows, self.format_row)
+        self.tree.selection_set(['2'])
+        
+        self.tree.yview('scroll', 50, 'units')
+        assert self.tree.selection() == ()
+        assert self.tree.selected_ids() == ['2']
+        assert self.tree.row_values(self.tree.selected_ids()[0]) == (2, "row2")
+        
+        self.tree.yview_moveto(0)
+        assert self.tree.selection() == ('2',)
+        
+        self.tree.yview('scroll', 50, 'units')
+        self.tree.selection_set(['55'])
+        assert self.tree.selected_ids() == ['55']
+    
+    def test_select_id_scrolls_to_row(self):
+        """select_id прокручивает к строке за пределами экрана и выделяет ее"""
+        self.tree.set_rows(self.rows, self.format_row)
+        self.tree.select_id(70)
+        
+        assert '70' in self.tree.get_children()
+        assert self.tree.selection() == ('70',)
+
+
+class TestDebouncer:
+    """Тесты отложенного вызова"""
+    
+    def setup_method(self):
+        """Настройка перед каждым тестом"""
+        self.widget = FakeWidget()
+        self.calls = []
+        self.debouncer = Debouncer(self.widget, 200, lambda: self.calls.append(len(self.calls)))
+    
+    def test_repeated_trigger_calls_once(self):
+        """Несколько trigger() подряд приводят к одному вызову"""
+        for _ in range(3):
+            self.debouncer.trigger("событие", "Tk")
+        
+        assert len(self.widget.pending) == 1
+        assert self.calls == []
+        self.widget.run()
+        assert self.calls == [0]
+    
+    def test_flush_and_cancel(self):
+        """flush() вызывает сразу и снимает отложенный вызов, cancel() только снимает"""
+        self.debouncer.trigger()
+        self.debouncer.flush()
+        assert self.calls == [0]
+        assert self.widget.pending == []
+        
+        self.debouncer.trigger()
+        self.debouncer.cancel()
+        self.widget.run()
+        assert self.calls == [0]
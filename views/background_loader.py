@@ -0,0 +1,227 @@
+import contextvars
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class BackgroundLoader:
+    """Загрузка данных в рабочих потоках с передачей результатов в поток Tk через after()"""
+    
+    # Период опроса очереди результатов: около 60 кадров в секунду
+    POLL_INTERVAL = 16
+    
+    def __init__(self, widget, max_workers: int = 1,
+                 on_progress: Optional[Callable[[List[str]], None]] = None) -> None:
+        self.widget = widget
+        # max_workers=0 - загрузка выполняется в потоке Tk (соединение SQLite без пула)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='loader') if max_workers else None
+        self.on_progress = on_progress
+        # Элементы очереди: (ключ, номер загрузки, вид, значение); вид - 'result', 'batch', 'end' или 'error'
+        self._results: "queue.Queue[Tuple[str, int, str, Any]]" = queue.Queue()
+        # Номер последней загрузки по ключу: результаты более старых загрузок отбрасываются
+        self._generations: Dict[str, int] = {}
+        self._futures: Dict[str, Future] = {}
+        self._handlers: Dict[str, Tuple[Callable[[Any], None], Callable[[Exception], None],
+                                        Optional[Callable[[], None]]]] = {}
+        # Незавершенные загрузки: ключ -> описание для строки состояния
+        self._active: Dict[str, str] = {}
+        self._idle_callbacks: List[Callable[[], None]] = []
+        self._polling = False
+    
+    def submit(self, key: str, load: Callable[[], Any], on_done: Callable[[Any], None],
+               on_error: Callable[[Exception], None], description: str = "") -> int:
+        """Запустить загрузку по ключу, отменив предыдущую загрузку с тем же ключом"""
+        generation = self._start(key, (on_done, on_error, None), description)
+        
+        # Контекст копируется, чтобы frozen_time() вызывающего кода действовал в рабочем потоке
+        context = contextvars.copy_context()
+        if self._executor:
+            self._futures[key] = self._executor.submit(context.run, self._run, key, generation, load)
+        else:
+            self._run(key, generation, load)
+        
+        self._start_polling()
+        return generation
+    
+    def submit_stream(self, key: str, load: Callable[[], Iterable[Any]], on_batch: Callable[[Any], None],
+                      on_error: Callable[[Exception], None], on_done: Optional[Callable[[], None]] = None,
+                      description: str = "") -> int:
+        """Запустить загрузку, которая отдает результат пачками: каждая пачка передается в on_batch сразу"""
+        generation = self._start(key, (on_batch, on_error, on_done), description)
+        
+        context = contextvars.copy_context()
+        if self._executor:
+            self._futures[key] = self._executor.submit(context.run, self._run_stream, key, generation, load)
+        else:
+            # Без рабочих потоков пачки читаются по одной между событиями Tk
+            try:
+                batches = iter(context.run(load))
+            except Exception as e:
+                self._results.put((key, generation, 'error', e))
+            else:
+                self.widget.after_idle(self._pull, key, generation, batches, context)
+        
+        self._start_polling()
+        return generation
+    
+    def _start(self, key: str, handlers: Tuple, description: str) -> int:
+        """Сделать устаревшей предыдущую загрузку по ключу и зарегистрировать новую"""
+        self._discard(key)
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._handlers[key] = handlers
+        self._active[key] = description or key
+        self._report_progress()
+        return generation
+    
+    def _run(self, key: str, generation: int, load: Callable[[], Any]) -> None:
+        """Выполнить загрузку и положить результат в очередь (выполняется в рабочем потоке)"""
+        try:
+            self._results.put((key, generation, 'result', load()))
+        except Exception as e:
+            self._results.put((key, generation, 'error', e))
+    
+    def _run_stream(self, key: str, generation: int, load: Callable[[], Iterable[Any]]) -> None:
+        """Класть пачки в очередь по мере получения; устаревшая загрузка прекращает чтение (рабочий поток)"""
+        batches = None
+        try:
+            batches = iter(load())
+            for batch in batches:
+                if not self.is_current(key, generation):
+                    return
+                self._results.put((key, generation, 'batch', batch))
+            self._results.put((key, generation, 'end', None))
+        except Exception as e:
+            self._results.put((key, generation, 'error', e))
+        finally:
+            # Закрытие генератора закрывает и курсор базы данных
+            if hasattr(batches, 'close'):
+                batches.close()
+    
+    def _pull(self, key: str, generation: int, batches, context: contextvars.Context) -> None:
+        """Прочитать следующую пачку в потоке Tk"""
+        if not self.is_current(key, generation):
+            if hasattr(batches, 'close'):
+                batches.close()
+            return
+        
+        try:
+            batch = context.run(next, batches)
+        except StopIteration:
+            self._results.put((key, generation, 'end', None))
+            return
+        except Exception as e:
+            self._results.put((key, generation, 'error', e))
+            return
+        
+        self._results.put((key, generation, 'batch', batch))
+        self.widget.after(1, self._pull, key, generation, batches, context)
+    
+    def is_current(self, key: str, generation: int) -> bool:
+        """Не запущена ли после загрузки generation более новая с тем же ключом"""
+        return self._generations.get(key) == generation and key in self._active
+    
+    def cancel(self, key: str) -> None:
+        """Отменить загрузку: еще не начатая не запустится, результат начатой будет отброшен"""
+        self._discard(key)
+        self._finish(key)
+    
+    def _discard(self, key: str) -> None:
+        """Сделать результат текущей загрузки по ключу устаревшим"""
+        future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+        if key in self._generations:
+            self._generations[key] += 1
+    
+    def cancel_all(self) -> None:
+        """Отменить все загрузки"""
+        for key in list(self._active):
+            self.cancel(key)
+    
+    def notify_when_idle(self, callback: Callable[[], None]) -> None:
+        """Вызвать callback, когда не останется незавершенных загрузок"""
+        if self._active:
+            self._idle_callbacks.append(callback)
+        else:
+            callback()
+    
+    def shutdown(self) -> None:
+        """Отменить загрузки и остановить рабочие потоки"""
+        self.cancel_all()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _start_polling(self) -> None:
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_INTERVAL, self._poll)
+    
+    def _poll(self) -> None:
+        """Обработать готовые результаты в потоке Tk"""
+        deliver = {'result': self._on_result, 'batch': self._on_batch,
+                   'end': self._on_end, 'error': self._on_error}
+        for key, generation, kind, value in self._drain_results():
+            if self.is_current(key, generation):
+                deliver[kind](key, value)
+        
+        if self._active or not self._results.empty():
+            self.widget.after(self.POLL_INTERVAL, self._poll)
+        else:
+            self._polling = False
+    
+    def _drain_results(self) -> Iterator[Tuple[str, int, str, Any]]:
+        """Забрать из очереди все готовые результаты, включая добавленные во время обработки"""
+        while True:
+            try:
+                yield self._results.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _on_result(self, key: str, value: Any) -> None:
+        on_done, on_error, _ = self._handlers[key]
+        self._futures.pop(key, None)
+        try:
+            on_done(value)
+        except Exception as e:
+            self._finish(key)
+            on_error(e)
+            return
+        self._finish(key)
+    
+    def _on_batch(self, key: str, value: Any) -> None:
+        on_done, on_error, _ = self._handlers[key]
+        try:
+            on_done(value)
+        except Exception as e:
+            # Остальные пачки уже не нужны: обработчик не смог принять эту
+            self.cancel(key)
+            on_error(e)
+    
+    def _on_end(self, key: str, value: None) -> None:
+        on_end = self._handlers[key][2]
+        self._futures.pop(key, None)
+        self._finish(key)
+        if on_end:
+            on_end()
+    
+    def _on_error(self, key: str, value: Exception) -> None:
+        on_error = self._handlers[key][1]
+        self._futures.pop(key, None)
+        self._finish(key)
+        on_error(value)
+    
+    def _finish(self, key: str) -> None:
+        """Отметить загрузку завершенной и сообщить о прогрессе"""
+        if self._active.pop(key, None) is None:
+            return
+        
+        self._report_progress()
+        if not self._active:
+            callbacks, self._idle_callbacks = self._idle_callbacks, []
+            for callback in callbacks:
+                callback()
+    
+    def _report_progress(self) -> None:
+        if self.on_progress:
+            self.on_progress(list(self._active.values()))
@@ -0,0 +1,32 @@
+from typing import Callable, Optional
+
+
+class Debouncer:
+    """Отложенный вызов функции: повторный trigger() до истечения задержки переносит вызов"""
+    
+    def __init__(self, widget, delay: int, callback: Callable[[], None]) -> None:
+        self.widget = widget
+        # Задержка в миллисекундах после последнего trigger()
+        self.delay = delay
+        self.callback = callback
+        self._pending: Optional[str] = None
+    
+    def trigger(self, *args) -> None:
+        """Запланировать вызов, отменив ранее запланированный (аргументы событий Tk игнорируются)"""
+        self.cancel()
+        self._pending = self.widget.after(self.delay, self._fire)
+    
+    def flush(self) -> None:
+        """Выполнить вызов немедленно"""
+        self.cancel()
+        self.callback()
+    
+    def cancel(self) -> None:
+        """Отменить запланированный вызов"""
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+    
+    def _fire(self) -> None:
+        self._pending = None
+        self.callback()
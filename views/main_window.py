@@ -11,12 +11,33 @@ from controllers.task_controller import TaskController
 from controllers.project_controller import ProjectController
 from controllers.user_controller import UserController
 from database.database_manager import DatabaseManager
+from models.clock import frozen_time
+from views.background_loader import BackgroundLoader
+from views.debouncer import Debouncer
+from views.virtual_treeview import VirtualTreeview
 
 
 class MainWindow(tk.Tk):
+    # Пауза в наборе (мс), после которой выполняется поиск по мере ввода
+    SEARCH_DELAY = 200
+    # Поиск по мере ввода начинается с двух символов: с них работает префиксный индекс FTS5
+    SEARCH_MIN_LENGTH = 2
+    # Размер пула, если передан менеджер без пула: одно соединение потока Tk и два рабочих потока
+    POOL_SIZE = 3
+    
     def __init__(self, db_manager) -> None:
         super().__init__()
         
+        # Загрузка идет в рабочих потоках, а соединение без пула привязано к создавшему его потоку,
+        # поэтому для такого менеджера окно открывает свой менеджер с пулом к тому же файлу.
+        # База в памяти у каждого соединения своя - она остается с загрузкой в потоке Tk
+        self._owns_db_manager = not db_manager.pool_size and db_manager.db_path != ':memory:'
+        if self._owns_db_manager:
+            # Настройки передаются словарем: пустой словарь не включает профиль пула по умолчанию (WAL),
+            # и режим журнала файла остается тем, что выбрал владелец переданного менеджера
+            db_manager = DatabaseManager(db_manager.db_path, cache_size=db_manager.cache_size,
+                                         pragma_profile=dict(db_manager.pragmas),
+                                         pool_size=self.POOL_SIZE)
         self.db_manager = db_manager
         
         # Инициализация контроллеров
@@ -24,6 +45,11 @@ class MainWindow(tk.Tk):
         self.project_controller = ProjectController(db_manager)
         self.user_controller = UserController(db_manager)
         
+        # Одно соединение пула остается за потоком Tk, остальные - у рабочих потоков
+        workers = max(db_manager.pool_size - 1, 0)
+        self.loader = BackgroundLoader(self, max_workers=workers, on_progress=self._show_load_progress)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        
         self.setup_window()
         self.create_menu()
         self.create_widgets()
@@ -142,9 +168,14 @@ class MainWindow(tk.Tk):
         ttk.Button(search_frame, text="Найти", 
                   command=self.search_tasks).pack(side=tk.LEFT)
         
+        # Поиск по мере ввода: запрос выполняется после паузы в наборе
+        self.task_search = Debouncer(self, self.SEARCH_DELAY, self.live_search_tasks)
+        self.task_search_var.trace_add('write', self.task_search.trigger)
+        self.task_search_entry.bind('<Return>', lambda event: self.search_tasks())
+        
         # Создаем Treeview для отображения задач
         columns = ('id', 'title', 'project', 'assignee', 'priority', 'status', 'due_date')
-        self.task_tree = ttk.Treeview(self.task_frame, columns=columns, show='headings', height=20)
+        self.task_tree = VirtualTreeview(self.task_frame, columns=columns, show='headings', height=20)
         
         # Настройка колонок
         self.task_tree.heading('id', text='ID')
@@ -191,7 +222,7 @@ class MainWindow(tk.Tk):
         
         # Создаем Treeview для отображения проектов
         columns = ('id', 'name', 'status', 'start_date', 'end_date', 'progress', 'tasks')
-        self.project_tree = ttk.Treeview(self.project_frame, columns=columns, show='headings', height=20)
+        self.project_tree = VirtualTreeview(self.project_frame, columns=columns, show='headings', height=20)
         
         # Настройка колонок
         self.project_tree.heading('id', text='ID')
@@ -249,7 +280,7 @@ class MainWindow(tk.Tk):
         
         # Создаем Treeview для отображения пользователей
         columns = ('id', 'username', 'email', 'role', 'reg_date', 'tasks')
-        self.user_tree = ttk.Treeview(self.user_frame, columns=columns, show='headings', height=20)
+        self.user_tree = VirtualTreeview(self.user_frame, columns=columns, show='headings', height=20)
         
         # Настройка колонок
         self.user_tree.heading('id', text='ID')
@@ -281,89 +312,108 @@ class MainWindow(tk.Tk):
     
     def refresh_tasks(self) -> None:
         """Обновить список задач"""
-        # Очищаем дерево
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-        
-        # Получаем все задачи
-        tasks = self.task_controller.get_all_tasks()
-        
-        # Заполняем дерево
-        for task in tasks:
-            # Получаем название проекта
-            project = self.project_controller.get_project(task.project_id)
-            project_name = project.name if project else f"Проект {task.project_id}"
-            
-            # Получаем имя исполнителя
-            user = self.user_controller.get_user(task.assignee_id)
-            assignee_name = user.username if user else f"Пользователь {task.assignee_id}"
-            
-            # Определяем приоритет
-            priority_names = {1: "Высокий", 2: "Средний", 3: "Низкий"}
-            priority = priority_names.get(task.priority, "Неизвестно")
-            
-            # Форматируем дату
-            due_date = task.due_date.strftime('%d.%m.%Y')
-            
-            # Добавляем пометку для просроченных задач
-            status = task.status
-            if task.is_overdue() and status != 'completed':
-                status += " (⚠)"
-            
-            self.task_tree.insert('', tk.END, values=(
-                task.id,
-                task.title,
-                project_name,
-                assignee_name,
-                priority,
-                status,
-                due_date
-            ))
-        
-        self.update_status(f"Загружено {len(tasks)} задач")
+        self.loader.submit('tasks', self._load_task_rows,
+                           lambda rows: self._show_rows(self.task_tree, rows, "задач"),
+                           lambda error: self._show_load_error("задач", error),
+                           description="задачи")
+    
+    @frozen_time()
+    def _load_task_rows(self) -> list:
+        """Подготовить строки дерева задач (выполняется в рабочем потоке)"""
+        # Получаем все задачи вместе с названиями проектов и именами исполнителей
+        rows = self.task_controller.get_all_tasks_with_names()
+        return [self._task_row(task, project_name, assignee_name) for task, project_name, assignee_name in rows]
+    
+    def _task_row(self, task, project_name, assignee_name) -> tuple:
+        """Значения колонок дерева задач"""
+        if project_name is None:
+            project_name = f"Проект {task.project_id}"
+        if assignee_name is None:
+            assignee_name = f"Пользователь {task.assignee_id}"
+        
+        # Определяем приоритет
+        priority_names = {1: "Высокий", 2: "Средний", 3: "Низкий"}
+        priority = priority_names.get(task.priority, "Неизвестно")
+        
+        # Форматируем дату
+        due_date = task.due_date.strftime('%d.%m.%Y')
+        
+        # Добавляем пометку для просроченных задач
+        status = task.status
+        if task.is_overdue() and status != 'completed':
+            status += " (⚠)"
+        
+        return (
+            task.id,
+            task.title,
+            project_name,
+            assignee_name,
+            priority,
+            status,
+            due_date
+        )
+    
+    def _cancel_task_loads(self) -> None:
+        """Прекратить загрузку и поиск, которые иначе заменили бы выбранный пользователем список задач"""
+        self.task_search.cancel()
+        self.loader.cancel('tasks')
     
     def search_tasks(self) -> None:
-        """Поиск задач"""
+        """Поиск задач по кнопке или Enter: выполняется сразу, без ожидания паузы в наборе"""
         query = self.task_search_var.get().strip()
         if not query:
             messagebox.showwarning("Предупреждение", "Введите текст для поиска")
             return
         
-        # Очищаем дерево
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-        
-        # Выполняем поиск
-        tasks = self.task_controller.search_tasks(query)
-        
-        # Заполняем дерево
-        for task in tasks:
-            project = self.project_controller.get_project(task.project_id)
-            project_name = project.name if project else f"Проект {task.project_id}"
-            
-            user = self.user_controller.get_user(task.assignee_id)
-            assignee_name = user.username if user else f"Пользователь {task.assignee_id}"
-            
-            priority_names = {1: "Высокий", 2: "Средний", 3: "Низкий"}
-            priority = priority_names.get(task.priority, "Неизвестно")
-            
-            due_date = task.due_date.strftime('%d.%m.%Y')
-            
-            status = task.status
-            if task.is_overdue() and status != 'completed':
-                status += " (⚠)"
-            
-            self.task_tree.insert('', tk.END, values=(
-                task.id,
-                task.title,
-                project_name,
-                assignee_name,
-                priority,
-                status,
-                due_date
-            ))
-        
-        self.update_status(f"Найдено {len(tasks)} задач по запросу '{query}'")
+        self.task_search.cancel()
+        self._start_task_search(query)
+    
+    def live_search_tasks(self) -> None:
+        """Поиск по мере ввода; пустой запрос возвращает полный список задач"""
+        query = self.task_search_var.get().strip()
+        if not query:
+            self.refresh_tasks()
+        elif len(query) >= self.SEARCH_MIN_LENGTH:
+            self._start_task_search(query)
+    
+    def _start_task_search(self, query: str) -> None:
+        """Запустить поиск; строки появляются в дереве по мере получения из базы"""
+        tree_rows = []
+        
+        def show_batch(rows: list) -> None:
+            if not tree_rows:
+                self.task_tree.yview_moveto(0)
+            tree_rows.extend(rows)
+            self.task_tree.set_rows(tree_rows)
+            self.update_status(f"Найдено {len(tree_rows)} задач по запросу '{query}'...")
+        
+        def show_done() -> None:
+            self.task_tree.set_rows(tree_rows)
+            self.update_status(f"Найдено {len(tree_rows)} задач по запросу '{query}'")
+        
+        # Тот же ключ, что у refresh_tasks: новый запрос или обновление списка прекращают прежний поиск
+        with frozen_time():
+            self.loader.submit_stream('tasks', lambda: self._search_task_rows(query), show_batch,
+                                      lambda error: self._show_load_error("задач", error),
+                                      on_done=show_done, description="поиск")
+    
+    def _search_task_rows(self, query: str):
+        """Строки дерева для результатов поиска пачками (выполняется в рабочем потоке)"""
+        project_names = {}
+        user_names = {}
+        for tasks in self.task_controller.iter_search_batches(query):
+            rows = []
+            for task in tasks:
+                # Названия запрашиваются один раз на проект и исполнителя
+                if task.project_id not in project_names:
+                    project = self.project_controller.get_project(task.project_id)
+                    project_names[task.project_id] = project.name if project else None
+                if task.assignee_id not in user_names:
+                    user = self.user_controller.get_user(task.assignee_id)
+                    user_names[task.assignee_id] = user.username if user else None
+                
+                rows.append(self._task_row(task, project_names[task.project_id], user_names[task.assignee_id]))
+            yield rows
     
     def show_add_task_dialog(self) -> None:
         """Показать диалог добавления задачи"""
@@ -375,36 +425,50 @@ class MainWindow(tk.Tk):
     
     def edit_task(self, event) -> None:
         """Редактировать выбранную задачу"""
-        selection = self.task_tree.selection()
+        selection = self.task_tree.selected_ids()
         if not selection:
             return
         
-        item = self.task_tree.item(selection[0])
-        task_id = item['values'][0]
+        values = self.task_tree.row_values(selection[0])
+        task_id = values[0]
         
         task = self.task_controller.get_task(task_id)
         if task:
+            due_date = task.due_date
             dialog = EditTaskDialog(self, self.task_controller, 
                                    self.project_controller, self.user_controller, task)
             self.wait_window(dialog)
             if dialog.result:
-                self.refresh_tasks()
+                self._replace_task_row(task_id, due_date)
+    
+    def _replace_task_row(self, task_id: int, old_due_date: datetime) -> None:
+        """Обновить строку измененной задачи; список упорядочен по сроку, поэтому его смена требует перезагрузки"""
+        task = self.task_controller.get_task(task_id)
+        if task is None or task.due_date != old_due_date:
+            self.refresh_tasks()
+            return
+        
+        project = self.project_controller.get_project(task.project_id)
+        user = self.user_controller.get_user(task.assignee_id)
+        with frozen_time():
+            row = self._task_row(task, project.name if project else None, user.username if user else None)
+        self.task_tree.update_row(row)
     
     def delete_selected_task(self) -> None:
         """Удалить выбранную задачу"""
-        selection = self.task_tree.selection()
+        selection = self.task_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите задачу для удаления")
             return
         
-        item = self.task_tree.item(selection[0])
-        task_id = item['values'][0]
-        task_title = item['values'][1]
+        values = self.task_tree.row_values(selection[0])
+        task_id = values[0]
+        task_title = values[1]
         
         if messagebox.askyesno("Подтверждение", f"Удалить задачу '{task_title}'?"):
             success = self.task_controller.delete_task(task_id)
             if success:
-                self.refresh_tasks()
+                self.task_tree.remove_row(task_id)
                 self.update_status(f"Задача '{task_title}' удалена")
             else:
                 messagebox.showerror("Ошибка", "Не удалось удалить задачу")
@@ -413,15 +477,13 @@ class MainWindow(tk.Tk):
         """Показать просроченные задачи"""
         # Переключаемся на вкладку задач
         self.notebook.select(self.task_frame)
-        
-        # Очищаем дерево
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
+        self._cancel_task_loads()
         
         # Получаем просроченные задачи
         overdue_tasks = self.task_controller.get_overdue_tasks()
         
         # Заполняем дерево
+        tree_rows = []
         for task in overdue_tasks:
             project = self.project_controller.get_project(task.project_id)
             project_name = project.name if project else f"Проект {task.project_id}"
@@ -434,7 +496,7 @@ class MainWindow(tk.Tk):
             
             due_date = task.due_date.strftime('%d.%m.%Y')
             
-            self.task_tree.insert('', tk.END, values=(
+            tree_rows.append((
                 task.id,
                 task.title,
                 project_name,
@@ -444,6 +506,8 @@ class MainWindow(tk.Tk):
                 due_date
             ))
         
+        self.task_tree.set_rows(tree_rows)
+        
         self.update_status(f"Найдено {len(overdue_tasks)} просроченных задач")
     
     def show_task_statistics(self) -> None:
@@ -474,19 +538,21 @@ class MainWindow(tk.Tk):
     
     def refresh_projects(self) -> None:
         """Обновить список проектов"""
-        # Очищаем дерево
-        for item in self.project_tree.get_children():
-            self.project_tree.delete(item)
-        
-        # Получаем все проекты
+        self.loader.submit('projects', self._load_project_rows,
+                           lambda rows: self._show_rows(self.project_tree, rows, "проектов"),
+                           lambda error: self._show_load_error("проектов", error),
+                           description="проекты")
+    
+    @frozen_time()
+    def _load_project_rows(self) -> list:
+        """Подготовить строки дерева проектов (выполняется в рабочем потоке)"""
+        # Получаем все проекты и количество задач по ним одним запросом
         projects = self.project_controller.get_all_projects()
+        task_counts = self.project_controller.get_project_task_counts()
         
-        # Заполняем дерево
+        values = []
         for project in projects:
-            # Получаем задачи проекта
-            tasks = self.task_controller.get_tasks_by_project(project.id)
-            total_tasks = len(tasks)
-            completed_tasks = sum(1 for task in tasks if task.status == 'completed')
+            total_tasks, completed_tasks = task_counts.get(project.id, (0, 0, 0, 0, 0))[:2]
             
             # Форматируем даты
             start_date = project.start_date.strftime('%d.%m.%Y')
@@ -503,7 +569,7 @@ class MainWindow(tk.Tk):
             if hasattr(project, 'is_overdue') and project.is_overdue() and project.status != 'completed':
                 status += " (⚠)"
             
-            self.project_tree.insert('', tk.END, values=(
+            values.append((
                 project.id,
                 project.name,
                 status,
@@ -513,7 +579,7 @@ class MainWindow(tk.Tk):
                 f"{completed_tasks}/{total_tasks}"
             ))
         
-        self.update_status(f"Загружено {len(projects)} проектов")
+        return values
     
     def show_add_project_dialog(self) -> None:
         """Показать диалог добавления проекта"""
@@ -524,12 +590,12 @@ class MainWindow(tk.Tk):
     
     def edit_project(self, event) -> None:
         """Редактировать выбранный проект"""
-        selection = self.project_tree.selection()
+        selection = self.project_tree.selected_ids()
         if not selection:
             return
         
-        item = self.project_tree.item(selection[0])
-        project_id = item['values'][0]
+        values = self.project_tree.row_values(selection[0])
+        project_id = values[0]
         
         project = self.project_controller.get_project(project_id)
         if project:
@@ -540,14 +606,14 @@ class MainWindow(tk.Tk):
     
     def delete_selected_project(self) -> None:
         """Удалить выбранный проект"""
-        selection = self.project_tree.selection()
+        selection = self.project_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите проект для удаления")
             return
         
-        item = self.project_tree.item(selection[0])
-        project_id = item['values'][0]
-        project_name = item['values'][1]
+        values = self.project_tree.row_values(selection[0])
+        project_id = values[0]
+        project_name = values[1]
         
         if messagebox.askyesno("Подтверждение", f"Удалить проект '{project_name}'?\nВсе задачи проекта также будут удалены."):
             success = self.project_controller.delete_project(project_id)
@@ -558,28 +624,27 @@ class MainWindow(tk.Tk):
             else:
                 messagebox.showerror("Ошибка", "Не удалось удалить проект")
     
+    @frozen_time()
     def show_project_tasks(self) -> None:
         """Показать задачи выбранного проекта"""
-        selection = self.project_tree.selection()
+        selection = self.project_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите проект")
             return
         
-        item = self.project_tree.item(selection[0])
-        project_id = item['values'][0]
-        project_name = item['values'][1]
+        values = self.project_tree.row_values(selection[0])
+        project_id = values[0]
+        project_name = values[1]
         
         # Переключаемся на вкладку задач
         self.notebook.select(self.task_frame)
-        
-        # Очищаем дерево
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
+        self._cancel_task_loads()
         
         # Получаем задачи проекта
         tasks = self.task_controller.get_tasks_by_project(project_id)
         
         # Заполняем дерево
+        tree_rows = []
         for task in tasks:
             user = self.user_controller.get_user(task.assignee_id)
             assignee_name = user.username if user else f"Пользователь {task.assignee_id}"
@@ -593,7 +658,7 @@ class MainWindow(tk.Tk):
             if task.is_overdue() and status != 'completed':
                 status += " (⚠)"
             
-            self.task_tree.insert('', tk.END, values=(
+            tree_rows.append((
                 task.id,
                 task.title,
                 project_name,
@@ -603,25 +668,26 @@ class MainWindow(tk.Tk):
                 due_date
             ))
         
+        self.task_tree.set_rows(tree_rows)
+        
         self.update_status(f"Найдено {len(tasks)} задач в проекте '{project_name}'")
     
+    @frozen_time()
     def show_active_projects(self) -> None:
         """Показать активные проекты"""
         # Переключаемся на вкладку проектов
         self.notebook.select(self.project_frame)
-        
-        # Очищаем дерево
-        for item in self.project_tree.get_children():
-            self.project_tree.delete(item)
+        # Незавершенная загрузка полного списка иначе заменила бы выборку
+        self.loader.cancel('projects')
         
         # Получаем активные проекты
         active_projects = self.project_controller.get_active_projects()
+        task_counts = self.project_controller.get_project_task_counts()
         
         # Заполняем дерево
+        tree_rows = []
         for project in active_projects:
-            tasks = self.task_controller.get_tasks_by_project(project.id)
-            total_tasks = len(tasks)
-            completed_tasks = sum(1 for task in tasks if task.status == 'completed')
+            total_tasks, completed_tasks = task_counts.get(project.id, (0, 0, 0, 0, 0))[:2]
             
             start_date = project.start_date.strftime('%d.%m.%Y')
             end_date = project.end_date.strftime('%d.%m.%Y')
@@ -631,7 +697,7 @@ class MainWindow(tk.Tk):
             if hasattr(project, 'is_overdue') and project.is_overdue():
                 status += " (⚠)"
             
-            self.project_tree.insert('', tk.END, values=(
+            tree_rows.append((
                 project.id,
                 project.name,
                 status,
@@ -641,25 +707,25 @@ class MainWindow(tk.Tk):
                 f"{completed_tasks}/{total_tasks}"
             ))
         
+        self.project_tree.set_rows(tree_rows)
+        
         self.update_status(f"Найдено {len(active_projects)} активных проектов")
     
+    @frozen_time()
     def show_overdue_projects(self) -> None:
         """Показать просроченные проекты"""
         # Переключаемся на вкладку проектов
         self.notebook.select(self.project_frame)
-        
-        # Очищаем дерево
-        for item in self.project_tree.get_children():
-            self.project_tree.delete(item)
+        self.loader.cancel('projects')
         
         # Получаем просроченные проекты
         overdue_projects = self.project_controller.get_overdue_projects()
+        task_counts = self.project_controller.get_project_task_counts()
         
         # Заполняем дерево
+        tree_rows = []
         for project in overdue_projects:
-            tasks = self.task_controller.get_tasks_by_project(project.id)
-            total_tasks = len(tasks)
-            completed_tasks = sum(1 for task in tasks if task.status == 'completed')
+            total_tasks, completed_tasks = task_counts.get(project.id, (0, 0, 0, 0, 0))[:2]
             
             start_date = project.start_date.strftime('%d.%m.%Y')
             end_date = project.end_date.strftime('%d.%m.%Y')
@@ -668,7 +734,7 @@ class MainWindow(tk.Tk):
             status_names = {'active': 'Активный', 'completed': 'Завершен', 'on_hold': 'Приостановлен'}
             status = status_names.get(project.status, project.status) + " (⚠)"
             
-            self.project_tree.insert('', tk.END, values=(
+            tree_rows.append((
                 project.id,
                 project.name,
                 status,
@@ -678,8 +744,11 @@ class MainWindow(tk.Tk):
                 f"{completed_tasks}/{total_tasks}"
             ))
         
+        self.project_tree.set_rows(tree_rows)
+        
         self.update_status(f"Найдено {len(overdue_projects)} просроченных проектов")
     
+    @frozen_time()
     def show_project_statistics(self) -> None:
         """Показать статистику проектов"""
         projects = self.project_controller.get_all_projects()
@@ -720,23 +789,28 @@ class MainWindow(tk.Tk):
     
     def refresh_users(self) -> None:
         """Обновить список пользователей"""
-        # Очищаем дерево
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
-        
+        # Переменные Tk читаются только в потоке Tk
+        role_filter = self.role_filter_var.get()
+        self.loader.submit('users', lambda: self._load_user_rows(role_filter),
+                           lambda rows: self._show_rows(self.user_tree, rows, "пользователей"),
+                           lambda error: self._show_load_error("пользователей", error),
+                           description="пользователи")
+    
+    def _load_user_rows(self, role_filter: str) -> list:
+        """Подготовить строки дерева пользователей (выполняется в рабочем потоке)"""
         # Получаем всех пользователей
         users = self.user_controller.get_all_users()
         
         # Фильтруем по роли если нужно
-        role_filter = self.role_filter_var.get()
         if role_filter != "Все":
             users = [user for user in users if user.role == role_filter]
         
-        # Заполняем дерево
+        # Количество задач считается одним запросом для всех пользователей
+        task_counts = self.user_controller.get_user_task_counts()
+        
+        values = []
         for user in users:
-            # Получаем задачи пользователя
-            tasks = self.user_controller.get_user_tasks(user.id)
-            total_tasks = len(tasks)
+            total_tasks = task_counts.get(user.id, 0)
             
             # Форматируем дату
             reg_date = user.registration_date.strftime('%d.%m.%Y')
@@ -745,7 +819,7 @@ class MainWindow(tk.Tk):
             role_names = {'admin': 'Администратор', 'manager': 'Менеджер', 'developer': 'Разработчик'}
             role = role_names.get(user.role, user.role)
             
-            self.user_tree.insert('', tk.END, values=(
+            values.append((
                 user.id,
                 user.username,
                 user.email,
@@ -754,7 +828,7 @@ class MainWindow(tk.Tk):
                 total_tasks
             ))
         
-        self.update_status(f"Загружено {len(users)} пользователей")
+        return values
     
     def filter_users_by_role(self, event=None) -> None:
         """Фильтровать пользователей по роли"""
@@ -769,12 +843,12 @@ class MainWindow(tk.Tk):
     
     def edit_user(self, event) -> None:
         """Редактировать выбранного пользователя"""
-        selection = self.user_tree.selection()
+        selection = self.user_tree.selected_ids()
         if not selection:
             return
         
-        item = self.user_tree.item(selection[0])
-        user_id = item['values'][0]
+        values = self.user_tree.row_values(selection[0])
+        user_id = values[0]
         
         user = self.user_controller.get_user(user_id)
         if user:
@@ -785,14 +859,14 @@ class MainWindow(tk.Tk):
     
     def delete_selected_user(self) -> None:
         """Удалить выбранного пользователя"""
-        selection = self.user_tree.selection()
+        selection = self.user_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите пользователя для удаления")
             return
         
-        item = self.user_tree.item(selection[0])
-        user_id = item['values'][0]
-        username = item['values'][1]
+        values = self.user_tree.row_values(selection[0])
+        user_id = values[0]
+        username = values[1]
         
         if messagebox.askyesno("Подтверждение", f"Удалить пользователя '{username}'?"):
             success = self.user_controller.delete_user(user_id)
@@ -803,28 +877,27 @@ class MainWindow(tk.Tk):
             else:
                 messagebox.showerror("Ошибка", "Не удалось удалить пользователя. Возможно у него есть задачи.")
     
+    @frozen_time()
     def show_user_tasks(self) -> None:
         """Показать задачи выбранного пользователя"""
-        selection = self.user_tree.selection()
+        selection = self.user_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите пользователя")
             return
         
-        item = self.user_tree.item(selection[0])
-        user_id = item['values'][0]
-        username = item['values'][1]
+        values = self.user_tree.row_values(selection[0])
+        user_id = values[0]
+        username = values[1]
         
         # Переключаемся на вкладку задач
         self.notebook.select(self.task_frame)
-        
-        # Очищаем дерево
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
+        self._cancel_task_loads()
         
         # Получаем задачи пользователя
         tasks = self.user_controller.get_user_tasks(user_id)
         
         # Заполняем дерево
+        tree_rows = []
         for task in tasks:
             project = self.project_controller.get_project(task.project_id)
             project_name = project.name if project else f"Проект {task.project_id}"
@@ -838,7 +911,7 @@ class MainWindow(tk.Tk):
             if task.is_overdue() and status != 'completed':
                 status += " (⚠)"
             
-            self.task_tree.insert('', tk.END, values=(
+            tree_rows.append((
                 task.id,
                 task.title,
                 project_name,
@@ -848,6 +921,8 @@ class MainWindow(tk.Tk):
                 due_date
             ))
         
+        self.task_tree.set_rows(tree_rows)
+        
         self.update_status(f"Найдено {len(tasks)} задач пользователя '{username}'")
     
     def show_developers(self) -> None:
@@ -868,6 +943,7 @@ class MainWindow(tk.Tk):
         self.role_filter_var.set("manager")
         self.refresh_users()
     
+    @frozen_time()
     def show_user_statistics(self) -> None:
         """Показать статистику пользователей"""
         users = self.user_controller.get_all_users()
@@ -911,13 +987,34 @@ class MainWindow(tk.Tk):
         self.refresh_tasks()
         self.refresh_projects()
         self.refresh_users()
-        self.update_status("Все данные обновлены")
+        self.loader.notify_when_idle(lambda: self.update_status("Все данные обновлены"))
+    
+    def _show_rows(self, tree: VirtualTreeview, rows: list, label: str) -> None:
+        """Показать загруженные строки; элементы создаются только для видимой части"""
+        tree.set_rows(rows)
+        self.update_status(f"Загружено {len(rows)} {label}")
+    
+    def _show_load_progress(self, active: list) -> None:
+        """Показать в статус баре незавершенные загрузки"""
+        if active:
+            self.update_status(f"Загрузка: {', '.join(active)}...")
+    
+    def _show_load_error(self, label: str, error: Exception) -> None:
+        """Сообщить об ошибке фоновой загрузки"""
+        self.update_status(f"Ошибка загрузки {label}: {error}")
     
     def update_status(self, message: str) -> None:
         """Обновить статус бар"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         self.status_bar.config(text=f"[{timestamp}] {message}")
     
+    def close(self) -> None:
+        """Остановить фоновые загрузки и закрыть окно"""
+        self.loader.shutdown()
+        if self._owns_db_manager:
+            self.db_manager.close()
+        self.destroy()
+    
     def show_about(self) -> None:
         """Показать информацию о программе"""
         messagebox.showinfo("О программе", 
@@ -2,6 +2,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
+from models.clock import current_time, frozen_time
+from views.virtual_treeview import VirtualTreeview
+
 
 class ProjectView(ttk.Frame):
     def __init__(self, parent, project_controller, task_controller=None) -> None:
@@ -54,7 +57,7 @@ class ProjectView(ttk.Frame):
         
         # Таблица проектов
         columns = ('id', 'name', 'status', 'start_date', 'end_date', 'progress', 'tasks', 'days_left')
-        self.project_tree = ttk.Treeview(self, columns=columns, show='headings', height=20)
+        self.project_tree = VirtualTreeview(self, columns=columns, show='headings', height=20)
         
         # Настройка колонок
         self.project_tree.heading('id', text='ID')
@@ -154,27 +157,22 @@ class ProjectView(ttk.Frame):
         ttk.Button(self.detail_frame, text="Закрыть", 
                   command=self.hide_details).grid(row=7, column=0, columnspan=2, pady=(10, 0))
     
+    @frozen_time()
     def refresh_projects(self) -> None:
         """Обновить список проектов"""
-        # Очищаем дерево
-        for item in self.project_tree.get_children():
-            self.project_tree.delete(item)
-        
         # Получаем все проекты
         self.all_projects = self.project_controller.get_all_projects()
         
         # Применяем фильтры
         filtered_projects = self.apply_filters(self.all_projects)
         
+        # Получаем количество задач по всем проектам одним запросом
+        task_counts = self.project_controller.get_project_task_counts()
+        
         # Заполняем дерево
+        tree_rows = []
         for project in filtered_projects:
-            # Получаем задачи проекта
-            tasks = []
-            if self.task_controller:
-                tasks = self.task_controller.get_tasks_by_project(project.id)
-            
-            total_tasks = len(tasks)
-            completed_tasks = sum(1 for task in tasks if task.status == 'completed')
+            total_tasks, completed_tasks = task_counts.get(project.id, (0, 0, 0, 0, 0))[:2]
             
             # Форматируем даты
             start_date = project.start_date.strftime('%d.%m.%Y')
@@ -188,7 +186,7 @@ class ProjectView(ttk.Frame):
             status = status_names.get(project.status, project.status)
             
             # Рассчитываем дни до окончания
-            now = datetime.now()
+            now = current_time()
             if hasattr(project, 'get_days_remaining'):
                 days_left = project.get_days_remaining()
             else:
@@ -210,7 +208,7 @@ class ProjectView(ttk.Frame):
                 status += " (⚠)"
                 days_str += " (⚠)"
             
-            self.project_tree.insert('', tk.END, values=(
+            tree_rows.append((
                 project.id,
                 project.name,
                 status,
@@ -220,6 +218,8 @@ class ProjectView(ttk.Frame):
                 f"{completed_tasks}/{total_tasks}",
                 days_str
             ))
+        
+        self.project_tree.set_rows(tree_rows)
     
     def apply_filters(self, projects):
         """Применить фильтры к списку проектов"""
@@ -236,34 +236,23 @@ class ProjectView(ttk.Frame):
         """Фильтровать проекты"""
         self.refresh_projects()
     
+    @frozen_time()
     def show_overdue_projects(self) -> None:
         """Показать просроченные проекты"""
         # Устанавливаем фильтр статуса на "Все" чтобы видеть все просроченные
         self.status_filter_var.set("Все")
         
-        # Очищаем дерево
-        for item in self.project_tree.get_children():
-            self.project_tree.delete(item)
-        
-        # Получаем все проекты и фильтруем просроченные
-        all_projects = self.project_controller.get_all_projects()
-        
-        overdue_projects = []
-        for project in all_projects:
-            if hasattr(project, 'is_overdue') and project.is_overdue() and project.status != 'completed':
-                overdue_projects.append(project)
+        # Получаем просроченные проекты запросом к базе данных
+        overdue_projects = self.project_controller.get_overdue_projects()
         
         # Применяем другие фильтры
         filtered_projects = self.apply_filters(overdue_projects)
+        task_counts = self.project_controller.get_project_task_counts()
         
         # Заполняем дерево
+        tree_rows = []
         for project in filtered_projects:
-            tasks = []
-            if self.task_controller:
-                tasks = self.task_controller.get_tasks_by_project(project.id)
-            
-            total_tasks = len(tasks)
-            completed_tasks = sum(1 for task in tasks if task.status == 'completed')
+            total_tasks, completed_tasks = task_counts.get(project.id, (0, 0, 0, 0, 0))[:2]
             
             start_date = project.start_date.strftime('%d.%m.%Y')
             end_date = project.end_date.strftime('%d.%m.%Y')
@@ -273,7 +262,7 @@ class ProjectView(ttk.Frame):
             status = status_names.get(project.status, project.status) + " (⚠)"
             
             # Рассчитываем дни до окончания
-            now = datetime.now()
+            now = current_time()
             if hasattr(project, 'get_days_remaining'):
                 days_left = project.get_days_remaining()
             else:
@@ -281,7 +270,7 @@ class ProjectView(ttk.Frame):
             
             days_str = f"-{abs(days_left)} (⚠)"
             
-            self.project_tree.insert('', tk.END, values=(
+            tree_rows.append((
                 project.id,
                 project.name,
                 status,
@@ -291,6 +280,8 @@ class ProjectView(ttk.Frame):
                 f"{completed_tasks}/{total_tasks}",
                 days_str
             ))
+        
+        self.project_tree.set_rows(tree_rows)
     
     def add_project(self) -> None:
         """Добавить новый проект"""
@@ -301,12 +292,12 @@ class ProjectView(ttk.Frame):
     
     def edit_project(self, event) -> None:
         """Редактировать выбранный проект"""
-        selection = self.project_tree.selection()
+        selection = self.project_tree.selected_ids()
         if not selection:
             return
         
-        item = self.project_tree.item(selection[0])
-        project_id = item['values'][0]
+        values = self.project_tree.row_values(selection[0])
+        project_id = values[0]
         
         project = self.project_controller.get_project(project_id)
         if project:
@@ -317,14 +308,14 @@ class ProjectView(ttk.Frame):
     
     def delete_selected(self) -> None:
         """Удалить выбранный проект"""
-        selection = self.project_tree.selection()
+        selection = self.project_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите проект для удаления")
             return
         
-        item = self.project_tree.item(selection[0])
-        project_id = item['values'][0]
-        project_name = item['values'][1]
+        values = self.project_tree.row_values(selection[0])
+        project_id = values[0]
+        project_name = values[1]
         
         if messagebox.askyesno("Подтверждение", 
                               f"Удалить проект '{project_name}'?\nВсе задачи проекта также будут удалены."):
@@ -338,14 +329,14 @@ class ProjectView(ttk.Frame):
     
     def show_project_tasks(self) -> None:
         """Показать задачи выбранного проекта"""
-        selection = self.project_tree.selection()
+        selection = self.project_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите проект")
             return
         
-        item = self.project_tree.item(selection[0])
-        project_id = item['values'][0]
-        project_name = item['values'][1]
+        values = self.project_tree.row_values(selection[0])
+        project_id = values[0]
+        project_name = values[1]
         
         if not self.task_controller:
             messagebox.showinfo("Информация", 
@@ -363,22 +354,20 @@ class ProjectView(ttk.Frame):
         # Показываем детальную информацию о проекте
         self.show_project_details(project_id)
     
+    @frozen_time()
     def show_project_details(self, project_id):
         """Показать детальную информацию о проекте"""
         project = self.project_controller.get_project(project_id)
         if not project:
             return
         
-        # Получаем задачи проекта
-        tasks = []
-        if self.task_controller:
-            tasks = self.task_controller.get_tasks_by_project(project_id)
-        
-        total_tasks = len(tasks)
-        completed_tasks = sum(1 for task in tasks if task.status == 'completed')
-        in_progress_tasks = sum(1 for task in tasks if task.status == 'in_progress')
-        pending_tasks = sum(1 for task in tasks if task.status == 'pending')
-        overdue_tasks = sum(1 for task in tasks if task.is_overdue())
+        # Количество задач считается только по задачам этого проекта
+        stats = self.project_controller.get_project_statistics(project_id)
+        total_tasks = stats.get('total_tasks', 0)
+        completed_tasks = stats.get('completed_tasks', 0)
+        in_progress_tasks = stats.get('in_progress_tasks', 0)
+        pending_tasks = stats.get('pending_tasks', 0)
+        overdue_tasks = stats.get('overdue_tasks', 0)
         
         # Обновляем детальную информацию
         self.detail_name.config(text=project.name)
@@ -413,7 +402,7 @@ class ProjectView(ttk.Frame):
         self.detail_tasks.config(text=tasks_text)
         
         # Дни до окончания
-        now = datetime.now()
+        now = current_time()
         if hasattr(project, 'get_days_remaining'):
             days_left = project.get_days_remaining()
         else:
@@ -440,13 +429,13 @@ class ProjectView(ttk.Frame):
     
     def on_project_selected(self, event):
         """Обработчик выбора проекта в дереве"""
-        selection = self.project_tree.selection()
+        selection = self.project_tree.selected_ids()
         if not selection:
             self.hide_details()
             return
         
-        item = self.project_tree.item(selection[0])
-        project_id = item['values'][0]
+        values = self.project_tree.row_values(selection[0])
+        project_id = values[0]
         
         self.show_project_details(project_id)
 
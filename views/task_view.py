@@ -2,8 +2,31 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
+from models.clock import current_time, frozen_time
+from models.filter_index import FilterIndex
+from views.background_loader import BackgroundLoader
+from views.debouncer import Debouncer
+from views.virtual_treeview import VirtualTreeview
+
 
 class TaskView(ttk.Frame):
+    # Поля индекса загруженных задач: фильтры меняются без запроса к базе данных
+    INDEX_FIELDS = {
+        'status': lambda task: task.status,
+        'priority': lambda task: task.priority,
+        'project_id': lambda task: task.project_id,
+        'assignee_id': lambda task: task.assignee_id,
+        'overdue': lambda task: task.is_overdue() and task.status != 'completed',
+    }
+    # Порядок списка задач; каждый ключ сортировки индекс поддерживает при каждом изменении
+    SORT_KEYS = {
+        'due_date': lambda task: (task.due_date, task.id),
+    }
+    # Пауза в наборе (мс), после которой выполняется поиск по мере ввода
+    SEARCH_DELAY = 200
+    # Поиск по мере ввода начинается с двух символов: с них работает префиксный индекс FTS5
+    SEARCH_MIN_LENGTH = 2
+    
     def __init__(self, parent, task_controller, project_controller, user_controller) -> None:
         super().__init__(parent)
         
@@ -11,9 +34,18 @@ class TaskView(ttk.Frame):
         self.project_controller = project_controller
         self.user_controller = user_controller
         
+        # Поиск выполняется в рабочем потоке только с пулом соединений, иначе по пачкам в потоке Tk
+        workers = max(getattr(task_controller.db, 'pool_size', 0) - 1, 0)
+        self.loader = BackgroundLoader(self, max_workers=workers)
+        
         self.setup_view()
         self.create_widgets()
     
+    def destroy(self) -> None:
+        """Остановить поиск и уничтожить виджет"""
+        self.loader.shutdown()
+        super().destroy()
+    
     def setup_view(self) -> None:
         """Настройка представления"""
         self.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -46,6 +78,11 @@ class TaskView(ttk.Frame):
         ttk.Button(filter_frame, text="Найти", 
                   command=self.search_tasks).pack(side=tk.LEFT, padx=2)
         
+        # Поиск по мере ввода: запрос выполняется после паузы в наборе
+        self.search = Debouncer(self, self.SEARCH_DELAY, self.live_search_tasks)
+        self.search_var.trace_add('write', self.search.trigger)
+        search_entry.bind('<Return>', lambda event: self.search_tasks())
+        
         # Фильтр по статусу
         ttk.Label(filter_frame, text="Статус:").pack(side=tk.LEFT, padx=(10, 2))
         self.status_filter_var = tk.StringVar(value="Все")
@@ -66,7 +103,7 @@ class TaskView(ttk.Frame):
         
         # Таблица задач
         columns = ('id', 'title', 'project', 'assignee', 'priority', 'status', 'due_date')
-        self.task_tree = ttk.Treeview(self, columns=columns, show='headings', height=20)
+        self.task_tree = VirtualTreeview(self, columns=columns, show='headings', height=20)
         
         # Настройка колонок
         self.task_tree.heading('id', text='ID')
@@ -105,133 +142,174 @@ class TaskView(ttk.Frame):
         
         # Инициализация данных
         self.all_tasks = []
+        self.task_names = {}
+        self.task_index = FilterIndex([], self.INDEX_FIELDS, self.SORT_KEYS)
+        # Результаты текущего поиска (None - поиск не задан) и те из них, что проходят фильтры
+        self.search_results = None
+        self.search_shown = []
+        # Момент последнего обновления: по нему строки помечаются как просроченные
+        self.now = current_time()
+        # Показан ли список просроченных задач из базы данных, а не задачи индекса
+        self.overdue_shown = False
         self.refresh_tasks()
     
+    @frozen_time()
     def refresh_tasks(self) -> None:
         """Обновить список задач"""
-        # Очищаем дерево
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
+        self.now = current_time()
         
-        # Получаем все задачи
-        self.all_tasks = self.task_controller.get_all_tasks()
+        # Получаем все задачи вместе с названиями проектов и именами исполнителей
+        rows = self.task_controller.get_all_tasks_with_names()
+        self.all_tasks = [task for task, _, _ in rows]
+        self.task_names = {task.id: (project_name, assignee_name) for task, project_name, assignee_name in rows}
+        self.task_index = FilterIndex(self.all_tasks, self.INDEX_FIELDS, self.SORT_KEYS)
         
-        # Применяем фильтры
-        filtered_tasks = self.apply_filters(self.all_tasks)
+        # Активный поиск выполняется заново по обновленным данным
+        if self.search_results is None:
+            self.show_filtered_tasks()
+        else:
+            self._start_search(self.search_var.get().strip())
+    
+    def show_filtered_tasks(self) -> None:
+        """Показать загруженные задачи или результаты поиска с текущими фильтрами"""
+        self.overdue_shown = False
+        if self.search_results is None:
+            filtered_tasks = self.apply_filters(self.all_tasks)
+            overdue_tasks = self.task_index.count(overdue=True, **self.get_filter_criteria())
+        else:
+            filtered_tasks = self.search_shown = self.apply_filters(self.search_results)
+            overdue_tasks = None
         
-        # Заполняем дерево
-        for task in filtered_tasks:
-            # Получаем название проекта
-            project = self.project_controller.get_project(task.project_id)
-            project_name = project.name if project else f"Проект {task.project_id}"
-            
-            # Получаем имя исполнителя
-            user = self.user_controller.get_user(task.assignee_id)
-            assignee_name = user.username if user else f"Пользователь {task.assignee_id}"
-            
-            # Определяем приоритет
-            priority_names = {1: "Высокий", 2: "Средний", 3: "Низкий"}
-            priority = priority_names.get(task.priority, "Неизвестно")
-            
-            # Форматируем дату
-            due_date = task.due_date.strftime('%d.%m.%Y')
-            
-            # Добавляем пометку для просроченных задач
-            status = task.status
-            if task.is_overdue() and status != 'completed':
-                status += " (⚠)"
-            
-            self.task_tree.insert('', tk.END, values=(
-                task.id,
-                task.title,
-                project_name,
-                assignee_name,
-                priority,
-                status,
-                due_date
-            ))
+        # Строки форматируются только для видимой части списка
+        self.task_tree.set_rows(filtered_tasks, self.format_task_row)
         
         # Обновляем статистику
-        self.update_stats(filtered_tasks)
+        self.update_stats(filtered_tasks, overdue_tasks)
+    
+    def format_task_row(self, task) -> tuple:
+        """Значения колонок таблицы для задачи"""
+        project_name, assignee_name = self.task_names.get(task.id, (None, None))
+        if project_name is None:
+            project_name = f"Проект {task.project_id}"
+        if assignee_name is None:
+            assignee_name = f"Пользователь {task.assignee_id}"
+        
+        # Определяем приоритет
+        priority_names = {1: "Высокий", 2: "Средний", 3: "Низкий"}
+        priority = priority_names.get(task.priority, "Неизвестно")
+        
+        # Форматируем дату
+        due_date = task.due_date.strftime('%d.%m.%Y')
+        
+        # Добавляем пометку для просроченных задач
+        status = task.status
+        if task.is_overdue(self.now) and status != 'completed':
+            status += " (⚠)"
+        
+        return (
+            task.id,
+            task.title,
+            project_name,
+            assignee_name,
+            priority,
+            status,
+            due_date
+        )
+    
+    def get_filter_criteria(self) -> dict:
+        """Значения фильтров для индекса; None - фильтр не задан"""
+        status_filter = self.status_filter_var.get()
+        priority_filter = self.priority_filter_var.get()
+        priority_map = {"Высокий": 1, "Средний": 2, "Низкий": 3}
+        return {
+            'status': status_filter if status_filter != "Все" else None,
+            'priority': priority_map.get(priority_filter),
+        }
     
     def apply_filters(self, tasks):
         """Применить фильтры к списку задач"""
-        filtered_tasks = tasks
-        
-        # Фильтр по статусу
-        status_filter = self.status_filter_var.get()
-        if status_filter != "Все":
-            filtered_tasks = [t for t in filtered_tasks if t.status == status_filter]
+        criteria = self.get_filter_criteria()
         
-        # Фильтр по приоритету
-        priority_filter = self.priority_filter_var.get()
-        if priority_filter != "Все":
-            priority_map = {"Высокий": 1, "Средний": 2, "Низкий": 3}
-            priority_value = priority_map.get(priority_filter)
-            if priority_value:
-                filtered_tasks = [t for t in filtered_tasks if t.priority == priority_value]
+        # Загруженные задачи фильтруются пересечением групп индекса без перебора списка
+        if tasks is self.all_tasks:
+            return self.task_index.filter('due_date', **criteria)
         
-        return filtered_tasks
+        return [t for t in tasks
+                if all(value is None or getattr(t, name) == value for name, value in criteria.items())]
     
-    def update_stats(self, tasks):
+    def update_stats(self, tasks, overdue_tasks=None):
         """Обновить статистику"""
-        total_tasks = len(tasks)
-        overdue_tasks = sum(1 for t in tasks if t.is_overdue() and t.status != 'completed')
-        
+        if overdue_tasks is None:
+            overdue_tasks = sum(1 for t in tasks if t.is_overdue(self.now) and t.status != 'completed')
+        self._show_stats(len(tasks), overdue_tasks)
+    
+    def _show_stats(self, total_tasks: int, overdue_tasks: int) -> None:
         self.stats_label.config(
             text=f"Всего задач: {total_tasks} | Просрочено: {overdue_tasks}"
         )
     
+    def _refresh_stats(self) -> None:
+        """Обновить статистику по показанным строкам без повторной фильтрации"""
+        if self.search_results is None:
+            overdue_tasks = self.task_index.count(overdue=True, **self.get_filter_criteria())
+            self._show_stats(self.task_tree.row_count(), overdue_tasks)
+        else:
+            self.update_stats(self.search_shown)
+    
     def search_tasks(self) -> None:
-        """Поиск задач"""
+        """Поиск задач по кнопке или Enter: выполняется сразу, без ожидания паузы в наборе"""
         query = self.search_var.get().strip()
         if not query:
             messagebox.showwarning("Предупреждение", "Введите текст для поиска")
             return
         
-        # Очищаем дерево
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-        
-        # Выполняем поиск
-        tasks = self.task_controller.search_tasks(query)
-        
-        # Применяем фильтры к результатам поиска
-        filtered_tasks = self.apply_filters(tasks)
-        
-        # Заполняем дерево
-        for task in filtered_tasks:
-            project = self.project_controller.get_project(task.project_id)
-            project_name = project.name if project else f"Проект {task.project_id}"
-            
-            user = self.user_controller.get_user(task.assignee_id)
-            assignee_name = user.username if user else f"Пользователь {task.assignee_id}"
-            
-            priority_names = {1: "Высокий", 2: "Средний", 3: "Низкий"}
-            priority = priority_names.get(task.priority, "Неизвестно")
-            
-            due_date = task.due_date.strftime('%d.%m.%Y')
-            
-            status = task.status
-            if task.is_overdue() and status != 'completed':
-                status += " (⚠)"
-            
-            self.task_tree.insert('', tk.END, values=(
-                task.id,
-                task.title,
-                project_name,
-                assignee_name,
-                priority,
-                status,
-                due_date
-            ))
-        
-        self.update_stats(filtered_tasks)
-        messagebox.showinfo("Поиск", f"Найдено {len(filtered_tasks)} задач")
+        self.search.cancel()
+        self._start_search(query)
+    
+    def live_search_tasks(self) -> None:
+        """Поиск по мере ввода; пустой запрос возвращает все загруженные задачи"""
+        query = self.search_var.get().strip()
+        if not query:
+            self.loader.cancel('search')
+            self.search_results = None
+            self.show_filtered_tasks()
+        elif len(query) >= self.SEARCH_MIN_LENGTH:
+            self._start_search(query)
+    
+    def _start_search(self, query: str) -> None:
+        """Запустить поиск, прекратив предыдущий; результаты появляются в списке по мере чтения из базы"""
+        self.overdue_shown = False
+        self.search_results = []
+        self.search_shown = []
+        
+        # Пометки просрочки во всех пачках считаются по моменту self.now
+        self.loader.submit_stream('search', lambda: self.task_controller.iter_search_batches(query),
+                                  lambda tasks: self._show_search_batch(query, tasks),
+                                  self._show_search_error,
+                                  on_done=self._finish_search, description="поиск")
+    
+    def _show_search_batch(self, query: str, tasks) -> None:
+        """Добавить пачку результатов поиска в список"""
+        if not self.search_results:
+            self.task_tree.yview_moveto(0)
+        self.search_results.extend(tasks)
+        # Фильтры применяются только к новой пачке, уже показанные строки не пересчитываются
+        self.search_shown.extend(self.apply_filters(tasks))
+        self.task_tree.set_rows(self.search_shown, self.format_task_row)
+        self.stats_label.config(text=f"Поиск '{query}': найдено {len(self.search_shown)}...")
+    
+    def _finish_search(self) -> None:
+        """Показать итог поиска"""
+        self.task_tree.set_rows(self.search_shown, self.format_task_row)
+        self.update_stats(self.search_shown)
+    
+    def _show_search_error(self, error: Exception) -> None:
+        messagebox.showerror("Ошибка", f"Не удалось выполнить поиск: {error}")
     
     def filter_tasks(self, event=None) -> None:
         """Фильтровать задачи"""
-        self.refresh_tasks()
+        # Фильтры применяются к уже загруженным задачам
+        self.show_filtered_tasks()
     
     def add_task(self) -> None:
         """Добавить новую задачу"""
@@ -243,12 +321,12 @@ class TaskView(ttk.Frame):
     
     def edit_task(self, event) -> None:
         """Редактировать выбранную задачу"""
-        selection = self.task_tree.selection()
+        selection = self.task_tree.selected_ids()
         if not selection:
             return
         
-        item = self.task_tree.item(selection[0])
-        task_id = item['values'][0]
+        values = self.task_tree.row_values(selection[0])
+        task_id = values[0]
         
         task = self.task_controller.get_task(task_id)
         if task:
@@ -256,65 +334,92 @@ class TaskView(ttk.Frame):
                                self.project_controller, self.user_controller, task)
             self.wait_window(dialog)
             if dialog.result:
-                self.refresh_tasks()
+                self._replace_task(task_id)
+    
+    def _replace_task(self, task_id: int) -> None:
+        """Показать изменения одной задачи без перезагрузки списка и перестроения индекса"""
+        task = self.task_controller.get_task(task_id)
+        old = self.task_index.items.get(task_id)
+        if task is None or old is None:
+            self.refresh_tasks()
+            return
+        
+        project = self.project_controller.get_project(task.project_id)
+        user = self.user_controller.get_user(task.assignee_id)
+        self.task_names[task.id] = (project.name if project else None, user.username if user else None)
+        self.all_tasks[self.all_tasks.index(old)] = task
+        # Просрочка в индексе считается по моменту последнего обновления, как у остальных задач
+        with frozen_time(self.now):
+            self.task_index.update(task)
+        
+        # Список просроченных задач и результаты поиска не упорядочены индексом и показываются заново
+        if self.overdue_shown:
+            self.show_overdue_tasks()
+            return
+        if self.search_results is not None:
+            self.search_results = [task if t.id == task_id else t for t in self.search_results]
+            self.show_filtered_tasks()
+            return
+        
+        # Строка остается на месте, если задача проходит фильтры и ключ сортировки не изменился
+        sort_key = self.SORT_KEYS['due_date']
+        if self.apply_filters([old]) and self.apply_filters([task]) and sort_key(old) == sort_key(task):
+            self.task_tree.update_row(task)
+            self._refresh_stats()
+        else:
+            self.show_filtered_tasks()
+    
+    def _remove_task(self, task_id: int) -> None:
+        """Убрать удаленную задачу из списка без перезагрузки"""
+        old = self.task_index.items.get(task_id)
+        if old is not None:
+            self.task_index.remove(task_id)
+            self.all_tasks.remove(old)
+        self.task_names.pop(task_id, None)
+        
+        if self.search_results is not None:
+            self.search_results = [t for t in self.search_results if t.id != task_id]
+            self.search_shown = [t for t in self.search_shown if t.id != task_id]
+        
+        self.task_tree.remove_row(task_id)
+        self._refresh_stats()
     
     def delete_selected(self) -> None:
         """Удалить выбранную задачу"""
-        selection = self.task_tree.selection()
+        selection = self.task_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите задачу для удаления")
             return
         
-        item = self.task_tree.item(selection[0])
-        task_id = item['values'][0]
-        task_title = item['values'][1]
+        values = self.task_tree.row_values(selection[0])
+        task_id = values[0]
+        task_title = values[1]
         
         if messagebox.askyesno("Подтверждение", f"Удалить задачу '{task_title}'?"):
             success = self.task_controller.delete_task(task_id)
             if success:
-                self.refresh_tasks()
+                self._remove_task(task_id)
                 messagebox.showinfo("Успех", f"Задача '{task_title}' удалена")
             else:
                 messagebox.showerror("Ошибка", "Не удалось удалить задачу")
     
+    @frozen_time()
     def show_overdue_tasks(self) -> None:
         """Показать только просроченные задачи"""
+        self.now = current_time()
+        
         # Устанавливаем фильтр статуса на "Все" чтобы видеть все просроченные
         self.status_filter_var.set("Все")
         
-        # Очищаем дерево
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-        
-        # Получаем все задачи и фильтруем просроченные
-        all_tasks = self.task_controller.get_all_tasks()
-        overdue_tasks = [t for t in all_tasks if t.is_overdue() and t.status != 'completed']
+        # Получаем просроченные задачи запросом к базе данных
+        overdue_tasks = self.task_controller.get_overdue_tasks()
         
         # Применяем другие фильтры
         filtered_tasks = self.apply_filters(overdue_tasks)
         
-        # Заполняем дерево
-        for task in filtered_tasks:
-            project = self.project_controller.get_project(task.project_id)
-            project_name = project.name if project else f"Проект {task.project_id}"
-            
-            user = self.user_controller.get_user(task.assignee_id)
-            assignee_name = user.username if user else f"Пользователь {task.assignee_id}"
-            
-            priority_names = {1: "Высокий", 2: "Средний", 3: "Низкий"}
-            priority = priority_names.get(task.priority, "Неизвестно")
-            
-            due_date = task.due_date.strftime('%d.%m.%Y')
-            
-            self.task_tree.insert('', tk.END, values=(
-                task.id,
-                task.title,
-                project_name,
-                assignee_name,
-                priority,
-                task.status + " (⚠)",
-                due_date
-            ))
+        # Заполняем дерево: строки форматируются только для видимой части списка
+        self.task_tree.set_rows(filtered_tasks, self.format_task_row)
+        self.overdue_shown = True
         
         self.update_stats(filtered_tasks)
 
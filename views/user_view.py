@@ -1,9 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
+
+from models.clock import current_time, frozen_time
+from models.filter_index import FilterIndex
+from views.virtual_treeview import VirtualTreeview
 
 
 class UserView(ttk.Frame):
+    # Поля индекса загруженных пользователей: смена роли в фильтре не обращается к базе данных
+    INDEX_FIELDS = {
+        'role': lambda user: user.role,
+    }
+    # Порядок списка пользователей
+    SORT_KEYS = {
+        'username': lambda user: (user.username, user.id),
+    }
+    
     def __init__(self, parent, user_controller, task_controller=None) -> None:
         super().__init__(parent)
         
@@ -50,7 +62,7 @@ class UserView(ttk.Frame):
         
         # Таблица пользователей
         columns = ('id', 'username', 'email', 'role', 'reg_date', 'days_reg', 'tasks')
-        self.user_tree = ttk.Treeview(self, columns=columns, show='headings', height=20)
+        self.user_tree = VirtualTreeview(self, columns=columns, show='headings', height=20)
         
         # Настройка колонок
         self.user_tree.heading('id', text='ID')
@@ -92,6 +104,8 @@ class UserView(ttk.Frame):
         
         # Инициализация данных
         self.all_users = []
+        self.user_index = None
+        self.task_counts = {}
         self.refresh_users()
     
     def create_detail_widgets(self):
@@ -153,79 +167,94 @@ class UserView(ttk.Frame):
     
     def refresh_users(self) -> None:
         """Обновить список пользователей"""
-        # Очищаем дерево
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
+        # Загруженные пользователи устарели: индекс будет построен заново при следующем фильтре
+        self.all_users = []
+        self.user_index = None
+        # Количество задач загружается одним запросом на обновление, а не при отрисовке каждой строки
+        self.task_counts = self.user_controller.get_user_task_counts() if self.task_controller else {}
+        self.show_filtered_users()
+    
+    def show_filtered_users(self) -> None:
+        """Показать пользователей с текущим фильтром"""
+        # Один момент на обновление: по нему считаются дни с регистрации во всех строках
+        self.now = current_time()
+        
+        # Без фильтра и без загруженных пользователей страницы подгружаются из базы по мере прокрутки
+        if self.role_filter_var.get() == "Все" and self.user_index is None:
+            self.user_tree.set_page_source(self.user_controller.get_users_page, self.format_user_row)
+            return
         
-        # Получаем всех пользователей
-        self.all_users = self.user_controller.get_all_users()
+        # Получаем всех пользователей один раз, дальше фильтры работают по индексу
+        if self.user_index is None:
+            self.all_users = self.user_controller.get_all_users()
+            self.user_index = FilterIndex(self.all_users, self.INDEX_FIELDS, self.SORT_KEYS)
         
         # Применяем фильтры
         filtered_users = self.apply_filters(self.all_users)
         
-        # Заполняем дерево
-        for user in filtered_users:
-            # Получаем задачи пользователя
-            tasks = []
-            if self.task_controller:
-                tasks = self.user_controller.get_user_tasks(user.id)
-            
-            total_tasks = len(tasks)
-            
-            # Форматируем дату
-            reg_date = user.registration_date.strftime('%d.%m.%Y')
-            
-            # Определяем роль
-            role_names = {'admin': 'Администратор', 'manager': 'Менеджер', 'developer': 'Разработчик'}
-            role = role_names.get(user.role, user.role)
-            
-            # Рассчитываем дни с регистрации
-            days_registered = 0
-            if hasattr(user, 'get_days_since_registration'):
-                days_registered = user.get_days_since_registration()
-            else:
-                now = datetime.now()
-                days_registered = (now - user.registration_date).days
-            
-            self.user_tree.insert('', tk.END, values=(
-                user.id,
-                user.username,
-                user.email,
-                role,
-                reg_date,
-                days_registered,
-                total_tasks
-            ))
+        # Строки форматируются только для видимой части списка
+        self.user_tree.set_rows(filtered_users, self.format_user_row)
+    
+    def format_user_row(self, user) -> tuple:
+        """Значения колонок таблицы для пользователя"""
+        total_tasks = self.task_counts.get(user.id, 0)
+        
+        # Форматируем дату
+        reg_date = user.registration_date.strftime('%d.%m.%Y')
+        
+        # Определяем роль
+        role_names = {'admin': 'Администратор', 'manager': 'Менеджер', 'developer': 'Разработчик'}
+        role = role_names.get(user.role, user.role)
+        
+        # Рассчитываем дни с регистрации
+        days_registered = 0
+        if hasattr(user, 'get_days_since_registration'):
+            days_registered = user.get_days_since_registration(self.now)
+        else:
+            days_registered = (self.now - user.registration_date).days
+        
+        return (
+            user.id,
+            user.username,
+            user.email,
+            role,
+            reg_date,
+            days_registered,
+            total_tasks
+        )
     
     def apply_filters(self, users):
         """Применить фильтры к списку пользователей"""
-        filtered_users = users
-        
-        # Фильтр по роли
         role_filter = self.role_filter_var.get()
-        if role_filter != "Все":
-            filtered_users = [u for u in filtered_users if u.role == role_filter]
+        role = role_filter if role_filter != "Все" else None
         
-        return filtered_users
+        # Загруженные пользователи фильтруются по группам индекса без перебора списка
+        if users is self.all_users and self.user_index is not None:
+            return self.user_index.filter('username', role=role)
+        
+        # Фильтр по роли
+        if role is None:
+            return users
+        return [u for u in users if u.role == role]
     
     def filter_users(self, event=None) -> None:
         """Фильтровать пользователей"""
-        self.refresh_users()
+        self.show_filtered_users()
     
     def show_developers(self) -> None:
         """Показать только разработчиков"""
         self.role_filter_var.set("developer")
-        self.refresh_users()
+        self.show_filtered_users()
     
     def show_managers(self) -> None:
         """Показать только менеджеров"""
         self.role_filter_var.set("manager")
-        self.refresh_users()
+        self.show_filtered_users()
     
     def show_admins(self) -> None:
         """Показать только администраторов"""
         self.role_filter_var.set("admin")
-        self.refresh_users()
+        self.show_filtered_users()
     
     def add_user(self) -> None:
         """Добавить нового пользователя"""
@@ -236,12 +265,12 @@ class UserView(ttk.Frame):
     
     def edit_user(self, event) -> None:
         """Редактировать выбранного пользователя"""
-        selection = self.user_tree.selection()
+        selection = self.user_tree.selected_ids()
         if not selection:
             return
         
-        item = self.user_tree.item(selection[0])
-        user_id = item['values'][0]
+        values = self.user_tree.row_values(selection[0])
+        user_id = values[0]
         
         user = self.user_controller.get_user(user_id)
         if user:
@@ -252,14 +281,14 @@ class UserView(ttk.Frame):
     
     def delete_selected(self) -> None:
         """Удалить выбранного пользователя"""
-        selection = self.user_tree.selection()
+        selection = self.user_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите пользователя для удаления")
             return
         
-        item = self.user_tree.item(selection[0])
-        user_id = item['values'][0]
-        username = item['values'][1]
+        values = self.user_tree.row_values(selection[0])
+        user_id = values[0]
+        username = values[1]
         
         if messagebox.askyesno("Подтверждение", f"Удалить пользователя '{username}'?"):
             success = self.user_controller.delete_user(user_id)
@@ -273,14 +302,14 @@ class UserView(ttk.Frame):
     
     def show_user_tasks(self) -> None:
         """Показать задачи выбранного пользователя"""
-        selection = self.user_tree.selection()
+        selection = self.user_tree.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите пользователя")
             return
         
-        item = self.user_tree.item(selection[0])
-        user_id = item['values'][0]
-        username = item['values'][1]
+        values = self.user_tree.row_values(selection[0])
+        user_id = values[0]
+        username = values[1]
         
         if not self.task_controller:
             messagebox.showinfo("Информация", 
@@ -298,6 +327,7 @@ class UserView(ttk.Frame):
         # Показываем детальную информацию о пользователе
         self.show_user_details(user_id)
     
+    @frozen_time()
     def show_user_details(self, user_id):
         """Показать детальную информацию о пользователе"""
         user = self.user_controller.get_user(user_id)
@@ -333,7 +363,7 @@ class UserView(ttk.Frame):
         if hasattr(user, 'get_days_since_registration'):
             days_in_system = user.get_days_since_registration()
         else:
-            now = datetime.now()
+            now = current_time()
             days_in_system = (now - user.registration_date).days
         
         self.detail_days_in_system.config(text=f"{days_in_system} дней")
@@ -354,13 +384,13 @@ class UserView(ttk.Frame):
     
     def on_user_selected(self, event):
         """Обработчик выбора пользователя в дереве"""
-        selection = self.user_tree.selection()
+        selection = self.user_tree.selected_ids()
         if not selection:
             self.hide_details()
             return
         
-        item = self.user_tree.item(selection[0])
-        user_id = item['values'][0]
+        values = self.user_tree.row_values(selection[0])
+        user_id = values[0]
         
         self.show_user_details(user_id)
 
@@ -0,0 +1,278 @@
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview, который создает элементы только для видимых строк и небольшого запаса"""
+    
+    # Строки сверх видимых, которые создаются заранее (частично видимая строка, изменение размера)
+    BUFFER = 5
+    # Высота строки и заголовка по умолчанию, если стиль их не задает
+    DEFAULT_ROW_HEIGHT = 20
+    HEADING_HEIGHT = 25
+    
+    def __init__(self, master=None, **kwargs) -> None:
+        # Прокрутка управляется вручную, поэтому yscrollcommand не передается в Tk
+        self._yscrollcommand = kwargs.pop('yscrollcommand', None)
+        super().__init__(master, **kwargs)
+        
+        self._rows: List[Any] = []
+        self._format_row: Optional[Callable[[Any], Sequence]] = None
+        # Источник страниц: fetch_page(cursor) -> (строки, курсор следующей страницы или None)
+        self._fetch_page: Optional[Callable[[Any], Tuple[List[Any], Any]]] = None
+        self._next_cursor: Any = None
+        self._has_more = False
+        self._first = 0
+        self._visible_rows = int(self.cget('height'))
+        # Выделение хранится по id, а не по элементам, которые пересоздаются при прокрутке
+        self._selected_ids: Set[str] = set()
+        # Выделение элементов после отрисовки: отличие от него означает щелчок пользователя
+        self._rendered_selection: Set[str] = set()
+        # Значения созданных элементов: при обновлении меняются только отличающиеся строки
+        self._shown: Dict[str, tuple] = {}
+        # Индекс строки по id; строится при первом поиске и сбрасывается при сдвиге строк
+        self._positions: Optional[Dict[str, int]] = None
+        
+        self.bind('<Configure>', self._on_configure)
+        self.bind('<MouseWheel>', self._on_mouse_wheel)
+        self.bind('<Button-4>', lambda event: self._scroll_units(-3))
+        self.bind('<Button-5>', lambda event: self._scroll_units(3))
+        self.bind('<Up>', lambda event: self._move_focus(-1))
+        self.bind('<Down>', lambda event: self._move_focus(1))
+        self.bind('<Prior>', lambda event: self._move_focus(-self._visible_rows))
+        self.bind('<Next>', lambda event: self._move_focus(self._visible_rows))
+        self.bind('<Home>', lambda event: self._move_focus(-len(self._rows)))
+        self.bind('<End>', lambda event: self._move_focus(len(self._rows)))
+    
+    def configure(self, cnf=None, **kwargs):
+        if 'yscrollcommand' in kwargs:
+            self._yscrollcommand = kwargs.pop('yscrollcommand')
+            self._update_scrollbar()
+        return super().configure(cnf, **kwargs)
+    
+    config = configure
+    
+    def set_rows(self, rows: List[Any], format_row: Optional[Callable[[Any], Sequence]] = None) -> None:
+        """Показать строки; format_row переводит строку в значения колонок только при ее появлении на экране"""
+        # Позиция прокрутки привязывается к верхней строке, чтобы вставки и удаления выше не сдвигали список
+        anchor = self._row_id(self._rows[self._first]) if 0 < self._first < len(self._rows) else None
+        
+        self._fetch_page = None
+        self._has_more = False
+        self._rows = rows
+        self._format_row = format_row
+        self._positions = None
+        
+        if anchor is not None:
+            index = self._find_row(anchor)
+            if index is not None:
+                self._first = index
+        self._render()
+    
+    def update_row(self, row: Any) -> None:
+        """Заменить строку с тем же id; перерисовывается только она"""
+        index = self._find_row(self._row_id(row))
+        if index is not None:
+            self._rows[index] = row
+            self._render()
+    
+    def remove_row(self, row_id: Any) -> None:
+        """Удалить строку по id"""
+        index = self._find_row(str(row_id))
+        if index is not None:
+            del self._rows[index]
+            self._positions = None
+            if index < self._first:
+                self._first -= 1
+            self._render()
+    
+    def set_page_source(self, fetch_page: Callable[[Any], Tuple[List[Any], Any]],
+                        format_row: Optional[Callable[[Any], Sequence]] = None) -> None:
+        """Показывать строки, подгружая страницы по мере прокрутки"""
+        self._fetch_page = fetch_page
+        self._format_row = format_row
+        self._rows = []
+        self._positions = None
+        self._next_cursor = None
+        self._has_more = True
+        self._first = 0
+        self._load_next_page()
+        self._render()
+    
+    def row_count(self) -> int:
+        """Количество загруженных строк"""
+        return len(self._rows)
+    
+    def selected_ids(self) -> List[str]:
+        """ID выделенных строк в порядке списка, включая ушедшие за пределы экрана"""
+        self._remember_selection()
+        positions = {row_id: self._find_row(row_id) for row_id in self._selected_ids}
+        found = [row_id for row_id, index in positions.items() if index is not None]
+        return sorted(found, key=positions.get)
+    
+    def row_values(self, row_id: Any) -> Optional[tuple]:
+        """Значения колонок строки по id, даже если для нее сейчас нет элемента"""
+        index = self._find_row(str(row_id))
+        if index is None:
+            return None
+        row = self._rows[index]
+        return tuple(self._format_row(row) if self._format_row else row)
+    
+    def select_id(self, row_id: Any) -> None:
+        """Выделить строку по id и прокрутить к ней"""
+        row_id = str(row_id)
+        self._selected_ids = {row_id}
+        index = self._find_row(row_id)
+        if index is not None:
+            self._scroll_into_view(index)
+        self._render(remember_selection=False)
+    
+    def yview(self, *args):
+        """Прокрутка по индексам строк, а не по созданным элементам"""
+        if not args:
+            return self._fractions()
+        
+        if args[0] == 'moveto':
+            self._first = int(float(args[1]) * len(self._rows))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self._visible_rows
+            self._first += step
+        self._render()
+    
+    def yview_moveto(self, fraction: float) -> None:
+        self.yview('moveto', fraction)
+    
+    def yview_scroll(self, number: int, what: str) -> None:
+        self.yview('scroll', number, what)
+    
+    def _find_row(self, row_id: str) -> Optional[int]:
+        """Индекс строки по id или None"""
+        if self._positions is None:
+            self._positions = {self._row_id(row): index for index, row in enumerate(self._rows)}
+        return self._positions.get(row_id)
+    
+    def _row_id(self, row: Any) -> str:
+        """Идентификатор строки: id модели или первая колонка"""
+        return str(row.id if self._format_row else row[0])
+    
+    def _fractions(self) -> Tuple[float, float]:
+        total = len(self._rows)
+        if not total:
+            return 0.0, 1.0
+        return self._first / total, min(self._first + self._visible_rows, total) / total
+    
+    def _update_scrollbar(self) -> None:
+        if self._yscrollcommand:
+            self._yscrollcommand(*self._fractions())
+    
+    def _load_next_page(self) -> None:
+        """Загрузить следующую страницу из источника"""
+        rows, self._next_cursor = self._fetch_page(self._next_cursor)
+        if self._positions is not None:
+            for index, row in enumerate(rows, len(self._rows)):
+                self._positions[self._row_id(row)] = index
+        self._rows.extend(rows)
+        self._has_more = self._next_cursor is not None
+    
+    def _remember_selection(self) -> None:
+        """Перенести выделение созданных элементов в множество выделенных id"""
+        selection = set(self.selection())
+        # Щелчок по строке заменяет выделение, в том числе строк, ушедших за пределы экрана
+        if selection != self._rendered_selection:
+            self._selected_ids = selection
+            self._rendered_selection = selection
+    
+    def _render(self, remember_selection: bool = True) -> None:
+        """Показать видимое окно строк, изменив только отличающиеся элементы"""
+        if remember_selection:
+            self._remember_selection()
+        
+        # Подгружаем страницы, пока окно с запасом не заполнено
+        while self._has_more and self._first + self._visible_rows + self.BUFFER >= len(self._rows):
+            self._load_next_page()
+        
+        total = len(self._rows)
+        self._first = max(0, min(self._first, total - self._visible_rows))
+        end = min(self._first + self._visible_rows + self.BUFFER, total)
+        
+        window = [(self._row_id(row), tuple(self._format_row(row) if self._format_row else row))
+                  for row in self._rows[self._first:end]]
+        self._apply_window(window)
+        
+        selected = [row_id for row_id, _ in window if row_id in self._selected_ids]
+        if set(selected) != set(self.selection()):
+            self.selection_set(selected)
+        self._rendered_selection = set(selected)
+        super().yview_moveto(0)
+        self._update_scrollbar()
+    
+    def _apply_window(self, window: List[Tuple[str, tuple]]) -> None:
+        """Привести созданные элементы к окну строк: удалить лишние, обновить измененные, добавить новые"""
+        self._remove_stale({row_id for row_id, _ in window})
+        
+        order = list(self.get_children())
+        for index, (row_id, values) in enumerate(window):
+            if row_id in self._shown:
+                self._place_row(order, index, row_id, values)
+            else:
+                self.insert('', index, iid=row_id, values=values)
+                order.insert(index, row_id)
+                self._shown[row_id] = values
+    
+    def _remove_stale(self, window_ids: set) -> None:
+        """Удалить элементы строк, вышедших из окна"""
+        stale = [row_id for row_id in self.get_children() if row_id not in window_ids]
+        if stale:
+            self.delete(*stale)
+            for row_id in stale:
+                self._shown.pop(row_id, None)
+    
+    def _place_row(self, order: List[str], index: int, row_id: str, values: tuple) -> None:
+        """Обновить значения созданного элемента и переместить его на позицию index"""
+        if self._shown[row_id] != values:
+            self.item(row_id, values=values)
+            self._shown[row_id] = values
+        if order[index] != row_id:
+            self.move(row_id, '', index)
+            order.remove(row_id)
+            order.insert(index, row_id)
+    
+    def _scroll_into_view(self, index: int) -> None:
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + self._visible_rows:
+            self._first = index - self._visible_rows + 1
+    
+    def _scroll_units(self, units: int) -> str:
+        self.yview('scroll', units, 'units')
+        return "break"
+    
+    def _on_mouse_wheel(self, event) -> str:
+        return self._scroll_units(-3 if event.delta > 0 else 3)
+    
+    def _move_focus(self, delta: int) -> str:
+        """Переместить фокус и выделение с прокруткой за пределы созданных элементов"""
+        if not self._rows:
+            return "break"
+        
+        children = self.get_children()
+        focus = self.focus()
+        current = self._first + children.index(focus) if focus in children else self._first
+        index = max(0, min(current + delta, len(self._rows) - 1))
+        
+        self._scroll_into_view(index)
+        row_id = self._row_id(self._rows[index])
+        self._selected_ids = {row_id}
+        self._render(remember_selection=False)
+        self.focus(row_id)
+        return "break"
+    
+    def _on_configure(self, event) -> None:
+        """Пересчитать число видимых строк при изменении размера"""
+        row_height = ttk.Style().lookup('Treeview', 'rowheight') or self.DEFAULT_ROW_HEIGHT
+        visible_rows = max(1, (event.height - self.HEADING_HEIGHT) // int(row_height))
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self._render()